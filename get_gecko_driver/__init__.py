@@ -1,3 +1,16 @@
 __version__ = "1.5.1"
 
-from .get_driver import GetGeckoDriver
+
+def __getattr__(name: str):
+    # Imported on first use, so importing the package (and starting the CLI) stays cheap,
+    # and aiohttp is only needed by the async API
+    if name == "GetGeckoDriver":
+        from .get_driver import GetGeckoDriver
+
+        return GetGeckoDriver
+    elif name == "AsyncGetGeckoDriver":
+        from .async_get_driver import AsyncGetGeckoDriver
+
+        return AsyncGetGeckoDriver
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,82 @@
+import time
+
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from get_gecko_driver.observer import Observer
+from get_gecko_driver.observer import emit
+
+
+class ObservedRetry(Retry):
+    """
+    Retry that emits a retry event every time a request is retried.
+    """
+
+    observer: Observer = None
+
+    def new(self, **kwargs):
+        retry = super().new(**kwargs)
+        retry.observer = self.observer
+        return retry
+
+    def increment(self, method=None, url=None, response=None, error=None, **kwargs):
+        retry = super().increment(
+            method=method, url=url, response=response, error=error, **kwargs
+        )
+        pool = kwargs.get("_pool")
+        if pool is not None and url and url.startswith("/"):
+            url = f"{pool.scheme}://{pool.host}:{pool.port}{url}"
+        emit(
+            self.observer,
+            "retry",
+            method=method,
+            url=url,
+            status=response.status if response is not None else None,
+            error=str(error) if error else None,
+            attempt=len(retry.history),
+        )
+        return retry
+
+
+class ObservedAdapter(HTTPAdapter):
+    def __init__(self, observer: Observer, **kwargs):
+        """
+        HTTPAdapter that emits request_start and request_end events for every request,
+        including every redirect hop.
+
+        :param observer: Observer of the events.
+        """
+
+        self.observer = observer
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        emit(self.observer, "request_start", method=request.method, url=request.url)
+        start = time.perf_counter()
+        try:
+            response = super().send(request, **kwargs)
+        except Exception as err:
+            emit(
+                self.observer,
+                "request_end",
+                method=request.method,
+                url=request.url,
+                status=None,
+                bytes=None,
+                seconds=time.perf_counter() - start,
+                error=str(err),
+            )
+            raise
+
+        length = response.headers.get("Content-Length")
+        emit(
+            self.observer,
+            "request_end",
+            method=request.method,
+            url=request.url,
+            status=response.status_code,
+            bytes=int(length) if length and length.isdigit() else None,
+            seconds=time.perf_counter() - start,
+            error=None,
+        )
+        return response
@@ -1,19 +1,36 @@
+import functools
+
 import typer
 
 from get_gecko_driver import __version__
+from get_gecko_driver import constants
 from get_gecko_driver.enums import OsPlatform
 from get_gecko_driver.exceptions import GetGeckoDriverError
-from get_gecko_driver.get_driver import GetGeckoDriver
 
 app = typer.Typer(name="Get GeckoDriver", add_completion=False)
-get_driver = GetGeckoDriver()
 
 
-@app.command()
+@functools.cache
+def get_driver():
+    """
+    Return the GetGeckoDriver of the current platform.
+    It is created on first use, so commands that do not need it start fast.
+    """
+
+    from get_gecko_driver.get_driver import GetGeckoDriver
+
+    return GetGeckoDriver()
+
+
+@app.callback(invoke_without_command=True)
 def main(
+    ctx: typer.Context,
     latest_version: bool = typer.Option(
         default=False, help="Print the latest version", show_default=False
     ),
+    all_versions: bool = typer.Option(
+        default=False, help="Print all versions, newest first", show_default=False
+    ),
     latest_urls: bool = typer.Option(
         default=False,
         help="Print latest version urls for all platforms",
@@ -33,14 +50,35 @@ def main(
         show_default=False,
     ),
     download_version: str = typer.Option(
-        default=None, help="Download a specific version", show_default=False
+        default=None,
+        help="Download a specific version or the newest version in a range",
+        show_default=False,
+    ),
+    resolve: str = typer.Option(
+        default=None,
+        help='Print the newest version in a range, e.g. ">=0.33,<0.35" or "~=0.34"',
+        show_default=False,
     ),
     extract: bool = typer.Option(
         default=False, help="Extract the compressed driver file", show_default=False
     ),
+    connections: int = typer.Option(
+        default=1, help="Number of parallel connections for a download"
+    ),
+    progress: bool = typer.Option(
+        default=False, help="Show a progress bar for a download", show_default=False
+    ),
+    rate_limit: str = typer.Option(
+        default=None,
+        help="Maximum download bytes per second, e.g. 500K or 2M",
+        show_default=False,
+    ),
     driver_filename: bool = typer.Option(
         default=False, help="Driver filename", show_default=False
     ),
+    refresh: bool = typer.Option(
+        default=False, help="Bypass the metadata cache", show_default=False
+    ),
     version: bool = typer.Option(
         default=False, help="Application version", show_default=False
     ),
@@ -49,125 +87,442 @@ def main(
     Main.
     """
 
+    if ctx.invoked_subcommand:
+        return
+
     if latest_urls:
-        __print_latest_urls()
+        __print_latest_urls(refresh=refresh)
 
     elif version_url:
-        __print_version_url(version=version_url)
+        __print_version_url(version=version_url, refresh=refresh)
 
     elif download_latest:
-        __download_latest_version(extract=extract)
+        __download_latest_version(
+            extract=extract,
+            connections=connections,
+            progress=progress,
+            rate_limit=rate_limit,
+        )
 
     elif download_version:
-        __download_version(version=download_version, extract=extract)
+        __download_version(
+            version=download_version,
+            extract=extract,
+            connections=connections,
+            progress=progress,
+            rate_limit=rate_limit,
+        )
 
     elif latest_url:
-        __print_latest_url()
+        __print_latest_url(refresh=refresh)
 
     elif latest_version:
-        __print_latest_version()
+        __print_latest_version(refresh=refresh)
+
+    elif all_versions:
+        __print_versions(refresh=refresh)
+
+    elif resolve:
+        __print_resolved_version(spec=resolve, refresh=refresh)
 
     elif driver_filename:
-        print(get_driver.driver_filename())
+        print(get_driver().driver_filename())
 
     elif version:
         print(f"v{__version__}")
 
 
-def __print_latest_urls():
+@app.command()
+def mirror(
+    versions: list[str] = typer.Option(
+        ..., help="Versions to download, comma separated or repeated"
+    ),
+    platforms: list[str] = typer.Option(
+        default=None,
+        help="Platforms to download, comma separated or repeated "
+        "[default: win64,win32,linux64,linux32,macos,macos-aarch64]",
+        show_default=False,
+    ),
+    output_path: str = typer.Option(
+        default=constants.MIRROR_DIR, help="Mirror directory"
+    ),
+    workers: int = typer.Option(
+        default=constants.MIRROR_WORKERS, help="Maximum concurrent downloads"
+    ),
+):
+    """
+    Download a version x platform matrix and write a manifest.
+    """
+
+    from get_gecko_driver.mirror import mirror as mirror_assets
+
+    result = mirror_assets(
+        versions=__split(versions),
+        platforms=__parse_platforms(platforms),
+        output_path=output_path,
+        workers=workers,
+    )
+
+    for key, error in sorted(result["errors"].items()):
+        print(f"Could not download {key}: {error}")
+    print(
+        f"Downloaded {len(result['downloaded'])}, skipped {len(result['skipped'])}, "
+        f"failed {len(result['errors'])}"
+    )
+
+
+@app.command()
+def urls(
+    versions: list[str] = typer.Option(
+        ..., help="Versions or version specifiers, comma separated or repeated"
+    ),
+    platforms: list[str] = typer.Option(
+        default=None,
+        help="Platforms, comma separated or repeated "
+        "[default: win64,win32,linux64,linux32,macos,macos-aarch64]",
+        show_default=False,
+    ),
+):
+    """
+    Print the download url of every version x platform combination, e.g. for a lockfile.
+    """
+
+    from get_gecko_driver.mirror import DEFAULT_PLATFORMS
+
+    result = get_driver().resolve_many(
+        __split(versions), __parse_platforms(platforms) or DEFAULT_PLATFORMS
+    )
+
+    for key, url in result["urls"].items():
+        print(f"{key} {url}")
+    for key, error in sorted(result["errors"].items()):
+        print(f"Could not resolve {key}: {error}")
+    if result["errors"]:
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def serve(
+    host: str = typer.Option(default=constants.SERVE_HOST, help="Host to listen on"),
+    port: int = typer.Option(default=constants.SERVE_PORT, help="Port to listen on"),
+    root: str = typer.Option(
+        default=constants.MIRROR_DIR, help="Driver store directory"
+    ),
+    upstream: str = typer.Option(
+        default=constants.GITHUB_URL, help="Base url the store is filled from"
+    ),
+):
+    """
+    Serve a driver store over HTTP with the github.com url layout.
+    """
+
+    from get_gecko_driver.cache_server import serve as serve_store
+
+    serve_store(host=host, port=port, root=root, upstream=upstream)
+
+
+@app.command()
+def watch(
+    interval: float = typer.Option(
+        default=constants.REFRESH_INTERVAL, help="Seconds between two polls"
+    ),
+    jitter: float = typer.Option(
+        default=constants.REFRESH_JITTER,
+        help="Fraction of the interval that is randomly added or subtracted",
+    ),
+    once: bool = typer.Option(
+        default=False, help="Poll once and exit", show_default=False
+    ),
+):
+    """
+    Poll for new releases and prefetch the latest driver, so installs find it ready.
+    """
+
+    from get_gecko_driver.refresher import Refresher
+
+    refresher = Refresher(get_driver(), interval=interval, jitter=jitter)
+    try:
+        refresher.run(
+            once=once,
+            callback=lambda v: print(f"Prefetched {v}"),
+            on_error=print,
+        )
+    except KeyboardInterrupt:
+        pass
+
+
+def __split(values: list) -> list:
+    """
+    Return the items of comma separated or repeated option values.
+    """
+
+    return [v.strip() for value in values or [] for v in value.split(",") if v.strip()]
+
+
+def __parse_platforms(values: list) -> list:
+    """
+    Return the platforms of comma separated or repeated option values.
+    Print the error and exit on an unknown platform.
+    """
+
+    from get_gecko_driver.enums import Platform
+
+    try:
+        return [Platform(p) for p in __split(values)]
+    except ValueError as err:
+        print(err)
+        raise typer.Exit(code=1)
+
+
+def __print_latest_urls(refresh: bool):
     """
     Print the latest url version for all platforms.
+    The latest version is fetched once, the platform urls are resolved concurrently.
+
+    :param refresh: Bypass the metadata cache.
     """
 
-    get_driver_win = GetGeckoDriver(OsPlatform.win)
-    get_driver_linux = GetGeckoDriver(OsPlatform.linux)
-    get_driver_mac = GetGeckoDriver(OsPlatform.mac)
+    from concurrent.futures import ThreadPoolExecutor
+
+    from get_gecko_driver.get_driver import GetGeckoDriver
+
+    # All platforms share one connection pool
+    get_driver_win = GetGeckoDriver(OsPlatform.win, session=get_driver().session)
+    get_driver_linux = GetGeckoDriver(OsPlatform.linux, session=get_driver().session)
+    get_driver_mac = GetGeckoDriver(OsPlatform.mac, session=get_driver().session)
     get_drivers = {
         "Windows": get_driver_win,
         "Linux": get_driver_linux,
         "macOS": get_driver_mac,
     }
 
-    result = ""
-    for index, (key, value) in enumerate(get_drivers.items()):
+    try:
+        latest_version = get_driver().latest_version(refresh=refresh)
+    except GetGeckoDriverError:
+        latest_version = None
+
+    def version_url(value: "GetGeckoDriver") -> str:
+        if not latest_version:
+            return ""
         try:
-            result += f"Latest version for {key}:"
-            result += value.latest_version_url()
-            if index < len(get_drivers) - 1:
-                result += "\n"
+            return value.version_url(latest_version, refresh=refresh)
         except GetGeckoDriverError:
-            continue
+            return ""
+
+    with ThreadPoolExecutor(max_workers=len(get_drivers)) as executor:
+        urls = list(executor.map(version_url, get_drivers.values()))
+
+    result = ""
+    for index, (key, url) in enumerate(zip(get_drivers.keys(), urls)):
+        result += f"Latest version for {key}:"
+        result += url
+        if index < len(get_drivers) - 1:
+            result += "\n"
 
     print(result)
 
 
-def __print_latest_version():
+def __print_latest_version(refresh: bool):
     """
     Print the latest version.
+
+    :param refresh: Bypass the metadata cache.
     """
 
     error = ""
 
     try:
-        print(get_driver.latest_version())
+        print(get_driver().latest_version(refresh=refresh))
+    except GetGeckoDriverError:
+        print(error)
+
+
+def __print_versions(refresh: bool):
+    """
+    Print all versions, newest first.
+
+    :param refresh: Fetch new tags even if the version index is not stale.
+    """
+
+    error = "Could not list versions"
+
+    try:
+        print("\n".join(get_driver().versions(refresh=refresh)))
     except GetGeckoDriverError:
         print(error)
 
 
-def __print_latest_url():
+def __print_resolved_version(spec: str, refresh: bool):
+    """
+    Print the newest version that matches a version specifier.
+
+    :param spec: Version specifier.
+    :param refresh: Fetch new tags even if the version index is not stale.
+    """
+
+    try:
+        print(get_driver().resolve(spec, refresh=refresh))
+    except GetGeckoDriverError as err:
+        print(err)
+
+
+def __print_latest_url(refresh: bool):
     """
     Print the url of the latest version.
+
+    :param refresh: Bypass the metadata cache.
     """
 
     error = "Could not find version url"
 
     try:
-        print(get_driver.latest_version_url())
+        print(get_driver().latest_version_url(refresh=refresh))
     except GetGeckoDriverError:
         print(error)
 
 
-def __print_version_url(version: str):
+def __print_version_url(version: str, refresh: bool):
     """
     Print the url for a given version.
 
     :param version: Geckodriver version.
+    :param refresh: Bypass the metadata cache.
     """
 
     error = "Could not find version url"
 
     try:
-        print(get_driver.version_url(version))
+        print(get_driver().version_url(version, refresh=refresh))
     except GetGeckoDriverError:
         print(error)
 
 
-def __download_latest_version(extract: bool):
+def __download_latest_version(
+    extract: bool, connections: int, progress: bool, rate_limit: str
+):
     """
     Download the latest version.
 
     :param extract: Extract the downloaded driver or not.
+    :param connections: Number of parallel connections.
+    :param progress: Show a progress bar.
+    :param rate_limit: Maximum bytes per second.
     """
 
     error = "Could not download latest version"
 
+    progress_bar = __progress_bar() if progress else None
     try:
-        get_driver.download_latest_version(extract=extract)
+        __download_driver(rate_limit).download_latest_version(
+            extract=extract, connections=connections, progress=progress_bar
+        )
     except GetGeckoDriverError:
         print(error)
+    finally:
+        if progress_bar:
+            progress_bar.close()
 
 
-def __download_version(version: str, extract: bool):
+def __download_version(
+    version: str, extract: bool, connections: int, progress: bool, rate_limit: str
+):
     """
     Download driver version.
 
     :param version: Geckodriver version.
     :param extract: Extract the downloaded driver or not.
+    :param connections: Number of parallel connections.
+    :param progress: Show a progress bar.
+    :param rate_limit: Maximum bytes per second.
     """
 
     error = "Could not download latest version"
 
+    progress_bar = __progress_bar() if progress else None
     try:
-        get_driver.download_version(version=version, extract=extract)
+        __download_driver(rate_limit).download_version(
+            version=version,
+            extract=extract,
+            connections=connections,
+            progress=progress_bar,
+        )
     except GetGeckoDriverError:
         print(error)
+    finally:
+        if progress_bar:
+            progress_bar.close()
+
+
+def __download_driver(rate_limit: str):
+    """
+    Return the GetGeckoDriver to download with, limited to rate_limit bytes per second.
+
+    :param rate_limit: Maximum bytes per second, or None.
+    """
+
+    if not rate_limit:
+        return get_driver()
+
+    from get_gecko_driver.get_driver import GetGeckoDriver
+
+    try:
+        return GetGeckoDriver(rate_limit=rate_limit, session=get_driver().session)
+    except ValueError as err:
+        print(err)
+        raise typer.Exit(code=1)
+
+
+class _ProgressBar:
+    # Characters of the bar
+    WIDTH = 30
+
+    def __init__(self, file):
+        """
+        Download progress callback that draws a progress bar on one terminal line.
+
+        :param file: Stream to draw on.
+        """
+
+        self.file = file
+        self.drawn = False
+
+    def __call__(self, done: int, total: int, bytes_per_second: float):
+        speed = f"{self.__size(bytes_per_second)}/s" if bytes_per_second else ""
+        if total:
+            filled = min(self.WIDTH, self.WIDTH * done // total)
+            bar = "#" * filled + " " * (self.WIDTH - filled)
+            line = f"[{bar}] {100 * done // total:3d}% "
+            line += f"{self.__size(done)}/{self.__size(total)} {speed}"
+        else:
+            line = f"{self.__size(done)} {speed}"
+        self.file.write("\r" + line.ljust(79))
+        self.file.flush()
+        self.drawn = True
+
+    def close(self):
+        """
+        End the progress bar line.
+        """
+
+        if self.drawn:
+            self.file.write("\n")
+            self.file.flush()
+
+    @staticmethod
+    def __size(size: float) -> str:
+        for unit in ["B", "KiB", "MiB"]:
+            if size < 1024:
+                return f"{size:.1f} {unit}" if unit != "B" else f"{size:.0f} B"
+            size /= 1024
+
+        return f"{size:.1f} GiB"
+
+
+def __progress_bar() -> _ProgressBar:
+    """
+    Return a progress bar on stderr.
+    """
+
+    import sys
+
+    return _ProgressBar(sys.stderr)
@@ -0,0 +1,707 @@
+import asyncio
+import hashlib
+import os
+import tempfile
+import time
+from urllib.parse import urlparse
+
+import aiohttp
+
+from get_gecko_driver import constants
+from get_gecko_driver import downloader
+from get_gecko_driver import observer as observers
+from get_gecko_driver import store
+from get_gecko_driver.enums import OsPlatform
+from get_gecko_driver.exceptions import ChecksumError
+from get_gecko_driver.exceptions import DownloadError
+from get_gecko_driver.exceptions import GetGeckoDriverError
+from get_gecko_driver.exceptions import LockTimeoutError
+from get_gecko_driver.exceptions import UnknownVersionError
+from get_gecko_driver.exceptions import VersionUrlError
+from get_gecko_driver.get_driver import GetGeckoDriver
+from get_gecko_driver.specifier import VersionSpecifier
+from get_gecko_driver.specifier import version_key
+
+
+class AsyncGetGeckoDriver:
+    def __init__(
+        self,
+        os_platform: OsPlatform = None,
+        cache_dir: str = None,
+        cache_ttl: float = constants.CACHE_TTL,
+        use_cache: bool = True,
+        session: aiohttp.ClientSession = None,
+        pool_size: int = constants.POOL_SIZE,
+        base_url: str = None,
+        lock_timeout: float = constants.LOCK_TIMEOUT,
+        observer: observers.Observer = None,
+        rate_limit=None,
+    ):
+        """
+        Asyncio counterpart of GetGeckoDriver.
+        Requires the async extra: pip install get-gecko-driver[async]
+
+        :param os_platform: OS platform, defaults to the current OS.
+        :param cache_dir: Directory of the metadata cache, defaults to the user cache directory.
+        :param cache_ttl: Seconds before cached metadata is fetched again.
+        :param use_cache: Read and write the metadata cache or not.
+        :param session: Session used for all requests, a pooled session is created if None.
+        :param pool_size: Maximum number of connections per host of the created session.
+        :param base_url: Alternative to https://github.com with the same url layout.
+        :param lock_timeout: Seconds to wait for another process that downloads into the same path.
+        :param observer: Observer of request, retry and cache events.
+            Defaults to the exporter set with GET_GECKO_DRIVER_METRICS.
+        :param rate_limit: Maximum bytes per second of all downloads, e.g. "2M".
+            Defaults to the GET_GECKO_DRIVER_RATE_LIMIT environment variable.
+        """
+
+        # Platform, cache and path logic is shared with the blocking implementation
+        self.__get_driver = GetGeckoDriver(
+            os_platform=os_platform,
+            cache_dir=cache_dir,
+            cache_ttl=cache_ttl,
+            use_cache=use_cache,
+            base_url=base_url,
+            lock_timeout=lock_timeout,
+            observer=observer,
+            rate_limit=rate_limit,
+        )
+        self.__observer = observer or observers.from_env()
+        self.__own_session = session is None
+        self.__session = session
+        self.__pool_size = pool_size
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """
+        The session used for all requests.
+        """
+
+        if self.__session is None or self.__session.closed:
+            connector = aiohttp.TCPConnector(limit_per_host=self.__pool_size)
+            self.__session = aiohttp.ClientSession(connector=connector)
+        return self.__session
+
+    async def close(self):
+        """
+        Close the connection pool, unless the session was passed in.
+        """
+
+        if self.__own_session and self.__session is not None:
+            await self.__session.close()
+        self.__get_driver.close()
+
+    def driver_filename(self) -> str:
+        """
+        Driver filename.
+        """
+
+        return self.__get_driver.driver_filename()
+
+    async def latest_version(self, refresh: bool = False) -> str:
+        """
+        Return the latest version.
+
+        :param refresh: Bypass the metadata cache and fetch the latest version again.
+        """
+
+        key = "latest_version"
+        version = await self.__cache_get(key, refresh)
+        if version:
+            return version
+
+        try:
+            async with await self.__request(
+                "HEAD", self.__get_driver._latest_release_url(), allow_redirects=False
+            ) as response:
+                version = self.__get_driver._parse_latest_release_location(
+                    response.headers.get("Location")
+                )
+        except aiohttp.ClientError:
+            version = None
+
+        if not version:
+            # Fall back to scraping the releases page
+            releases_url = self.__get_driver._releases_url()
+            version = await self.__conditional_get(
+                releases_url, self.__get_driver._parse_latest_version
+            )
+            if not version:
+                raise GetGeckoDriverError(f"Could not fetch from {releases_url}.")
+
+        await self.__cache_set(key, version)
+
+        return version
+
+    async def latest_version_url(self, refresh: bool = False) -> str:
+        """
+        Return the latest version url.
+
+        :param refresh: Bypass the metadata cache.
+        """
+
+        version = await self.latest_version(refresh=refresh)
+        return await self.version_url(version, refresh=refresh)
+
+    async def version_url(self, version: str, refresh: bool = False) -> str:
+        """
+        Return the version download url.
+
+        :param version: Geckodriver version.
+        :param refresh: Bypass the metadata cache and fetch the release assets again.
+        """
+
+        if not self.__get_driver._check_if_version_format_is_valid(version):
+            raise UnknownVersionError("Invalid version format.")
+
+        key = self.__get_driver._version_url_key(version)
+        url = await self.__cache_get(key, refresh)
+        if url:
+            return url
+
+        assets = await self.release_assets(version, refresh=refresh)
+        if assets is None:
+            url = await self.__probe_version_url(version)
+        else:
+            url = self.__get_driver._select_version_url(version, assets)
+        await self.__cache_set(key, url)
+
+        return url
+
+    async def release_assets(self, version: str, refresh: bool = False):
+        """
+        Return the asset names of a release, or None if the assets page is not available
+        or lists no assets.
+
+        :param version: Geckodriver version.
+        :param refresh: Bypass the cached asset table.
+        """
+
+        key = self.__get_driver._release_assets_key(version)
+        assets = await self.__cache_get(key, refresh)
+        if assets is not None:
+            return assets
+
+        try:
+            async with await self.__request(
+                "GET", self.__get_driver._release_assets_url(version)
+            ) as response:
+                if response.status != 200:
+                    return None
+                assets = self.__get_driver._parse_release_assets(
+                    await response.read(), version
+                )
+        except aiohttp.ClientError:
+            return None
+        if not assets:
+            return None
+        await self.__cache_set(key, assets)
+
+        return assets
+
+    async def __probe_version_url(self, version: str) -> str:
+        """
+        Probe the download urls of a version and return the first that exists.
+
+        :param version: Geckodriver version.
+        """
+
+        for url in self.__get_driver._version_url_candidates(version):
+            try:
+                async with await self.__request(
+                    "HEAD", url, allow_redirects=False
+                ) as response:
+                    if response.status == 302 or response.status == 200:
+                        return url
+            except aiohttp.ClientError:
+                # No 64 bit, get 32 bit
+                pass
+
+        raise VersionUrlError(f"Could not find download url for version {version}.")
+
+    async def versions(self, refresh: bool = False) -> list:
+        """
+        Return all GeckoDriver versions, newest first, from the version index in the
+        metadata cache shared with GetGeckoDriver.
+
+        :param refresh: Fetch new tags even if the index is not stale.
+        """
+
+        key = "versions"
+        versions = await self.__cache_get(key, refresh)
+        if versions:
+            return versions
+
+        known = set(await self.__cache_get(key, stale=True) or [])
+        new_versions = await self.__fetch_versions_until(known)
+        versions = sorted(set(new_versions) | known, key=version_key, reverse=True)
+        await self.__cache_set(key, versions)
+
+        return versions
+
+    async def resolve(self, spec: str, refresh: bool = False) -> str:
+        """
+        Return the newest version that matches a version specifier, like
+        GetGeckoDriver.resolve, through the same version index.
+
+        :param spec: Version specifier.
+        :param refresh: Refresh the version index first.
+        """
+
+        specifier = VersionSpecifier(spec)
+        if specifier.latest:
+            return await self.latest_version(refresh=refresh)
+
+        version_index = self.__get_driver._version_index
+        version = version_index(await self.versions(refresh)).select(specifier)
+        if not version and not refresh:
+            version = version_index(await self.versions(refresh=True)).select(specifier)
+        if not version:
+            raise UnknownVersionError(f"No version matches {spec!r}.")
+
+        return version
+
+    async def __fetch_versions_until(self, known: set) -> list:
+        """
+        Walk the tags pages like GetGeckoDriver and return the versions that were not known.
+
+        :param known: Versions in the index.
+        """
+
+        url = self.__get_driver._tags_url()
+        versions = []
+        seen = set()
+        while url:
+            tags = await self.__conditional_get(url, self.__get_driver._parse_tags)
+            if tags is None:
+                raise GetGeckoDriverError(
+                    f"Could not get {self.__get_driver._tags_url()}."
+                )
+            url = self.__get_driver._next_tags_url(tags, known, seen, versions)
+
+        return versions
+
+    async def __conditional_get(self, url: str, parse):
+        """
+        Fetch a metadata page with the validators of the last response and return its
+        parse result, or None if the response is not ok, like GetGeckoDriver.
+
+        :param url: Url of the page.
+        :param parse: Function that parses the page content.
+        """
+
+        key = self.__get_driver._conditional_key(url)
+        entry = await self.__cache_get(key, stale=True)
+        async with await self.__request(
+            "GET", url, headers=self.__get_driver._conditional_headers(entry)
+        ) as response:
+            if response.status == 304 and entry:
+                return entry["value"]
+            if not response.ok:
+                return None
+            value = parse(await response.read())
+            await asyncio.to_thread(
+                self.__get_driver._conditional_set, key, response.headers, value
+            )
+
+        return value
+
+    async def download_latest_version(
+        self, output_path: str = None, extract: bool = False, progress=None
+    ) -> str:
+        """
+        Download the latest geckodriver version.
+
+        :param output_path: Path to download the driver to.
+        :param extract: Extract the downloaded driver or not.
+        :param progress: Called like in download_version.
+        """
+
+        version = await self.latest_version()
+        return await self.download_version(
+            version=version, output_path=output_path, extract=extract, progress=progress
+        )
+
+    async def download_version(
+        self,
+        version: str,
+        output_path: str = None,
+        extract: bool = False,
+        sha256: str = None,
+        progress=None,
+    ) -> str:
+        """
+        Download a geckodriver version.
+        With extract, the archive is buffered in memory and only the driver is written to disk.
+        Concurrent downloads into the same output_path are single-flight, and the SHA-256 of
+        the archive is checked, like in GetGeckoDriver.
+
+        :param version: Geckodriver version, or a version specifier like "~=0.34".
+        :param output_path: Path to download the driver to.
+        :param extract: Extract the downloaded driver or not.
+        :param sha256: Expected SHA-256 of the archive.
+        :param progress: Called after every downloaded chunk with the bytes downloaded so far,
+            the total bytes (None if unknown) and the average bytes per second.
+        """
+
+        output_path, _ = await self.__download_version(
+            version, output_path, extract, sha256, progress
+        )
+
+        return output_path
+
+    async def __download_version(
+        self,
+        version: str,
+        output_path: str,
+        extract: bool,
+        sha256: str,
+        progress=None,
+    ) -> tuple:
+        """
+        Download a geckodriver version like download_version.
+        Return the output path and the SHA-256 digests of the archive and the driver.
+        """
+
+        if not self.__get_driver._check_if_version_format_is_valid(version):
+            version = await self.resolve(version)
+
+        if not output_path:
+            output_path = self.__get_driver._output_path(version)
+
+        url = await self.version_url(version)
+        started = time.time()
+        lock = self.__get_driver._lock(output_path)
+        await self.__acquire(lock)
+        digests = {}
+        try:
+            if not (
+                lock.waited
+                and await asyncio.to_thread(
+                    self.__get_driver._is_downloaded, url, output_path, extract, started
+                )
+            ):
+                key = self.__get_driver._sha256_key(url)
+                digests = await self.__download(
+                    url,
+                    output_path,
+                    extract,
+                    sha256 or await self.__cache_get(key, stale=True),
+                    progress,
+                )
+                await self.__cache_set(key, digests["archive"])
+        finally:
+            lock.release()
+
+        return output_path, digests
+
+    async def __download(
+        self, url: str, output_path: str, extract: bool, sha256: str, progress=None
+    ) -> dict:
+        """
+        Download url into output_path, extracting only the driver with extract.
+        The archive is hashed while it arrives and checked against sha256 before the
+        driver or the archive is moved into place. Writing, hashing and extracting run in
+        worker threads, so the event loop is not blocked by disk I/O.
+        """
+
+        transfer = downloader._Transfer(
+            progress=progress, rate_limiter=self.__get_driver.rate_limiter
+        )
+
+        archive_name = urlparse(url).path.split("/")[-1]
+        archive_sha256 = hashlib.sha256()
+        digests = {}
+
+        if extract:
+            file_path = output_path + "/" + self.driver_filename()
+        else:
+            file_path = output_path + "/" + archive_name
+        part_path = file_path + ".part"
+
+        try:
+            await asyncio.to_thread(os.makedirs, output_path, exist_ok=True)
+            async with await self.__request("GET", url) as response:
+                if response.status != 200:
+                    raise DownloadError("Invalid URL")
+                transfer.start(0, response.content_length)
+
+                if extract:
+                    with tempfile.SpooledTemporaryFile(
+                        max_size=constants.SPOOL_MAX_SIZE
+                    ) as buffer:
+                        await self.__write(response, transfer, buffer, archive_sha256)
+                        self.__check_digest(archive_name, archive_sha256, sha256)
+                        buffer.seek(0)
+                        digests["member"] = await asyncio.to_thread(
+                            downloader.extract_member,
+                            buffer,
+                            archive_name,
+                            self.driver_filename(),
+                            part_path,
+                        )
+                else:
+                    file = await asyncio.to_thread(open, part_path, "wb")
+                    try:
+                        await self.__write(response, transfer, file, archive_sha256)
+                    finally:
+                        await asyncio.to_thread(file.close)
+                    self.__check_digest(archive_name, archive_sha256, sha256)
+            await asyncio.to_thread(os.replace, part_path, file_path)
+        except (OSError, aiohttp.ClientError, asyncio.TimeoutError) as err:
+            raise DownloadError(err)
+        finally:
+            await asyncio.to_thread(self.__remove, part_path)
+
+        digests["archive"] = archive_sha256.hexdigest()
+
+        return digests
+
+    @classmethod
+    async def __write(
+        cls, response: aiohttp.ClientResponse, transfer, file, archive_sha256
+    ):
+        """
+        Write the body of a response to a file and hash it. The chunks are batched and
+        every batch is written and hashed in a worker thread.
+        """
+
+        batch = []
+        size = 0
+        async for chunk in cls.__iter_chunks(response, transfer):
+            batch.append(chunk)
+            size += len(chunk)
+            if size >= constants.WRITE_BATCH_SIZE:
+                await asyncio.to_thread(cls.__write_batch, file, archive_sha256, batch)
+                batch = []
+                size = 0
+        if batch:
+            await asyncio.to_thread(cls.__write_batch, file, archive_sha256, batch)
+
+    @staticmethod
+    def __write_batch(file, archive_sha256, batch: list):
+        """
+        Write and hash a batch of chunks.
+        """
+
+        data = b"".join(batch)
+        file.write(data)
+        archive_sha256.update(data)
+
+    @staticmethod
+    def __remove(path: str):
+        """
+        Remove a file if it exists.
+        """
+
+        if os.path.exists(path):
+            os.remove(path)
+
+    @staticmethod
+    async def __iter_chunks(response: aiohttp.ClientResponse, transfer):
+        """
+        Yield the body of a response in chunks of the current size of the transfer,
+        waiting for its rate limiter without blocking the event loop.
+        """
+
+        while True:
+            chunk = await response.content.read(transfer.chunk_size)
+            if not chunk:
+                return
+            yield chunk
+            delay = transfer.update(len(chunk))
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+    @staticmethod
+    def __check_digest(name: str, archive_sha256, sha256: str):
+        """
+        Raise ChecksumError if an expected SHA-256 is given and does not match.
+        """
+
+        digest = archive_sha256.hexdigest()
+        if sha256 and digest != sha256.lower():
+            raise ChecksumError(f"SHA-256 of {name} is {digest}, expected {sha256}.")
+
+    @staticmethod
+    async def __acquire(lock):
+        """
+        Acquire a file lock without blocking the event loop.
+        """
+
+        deadline = time.time() + lock.timeout
+        while not lock.acquire(blocking=False):
+            if time.time() > deadline:
+                raise LockTimeoutError(f"Timed out waiting for lock {lock.path}.")
+            await asyncio.sleep(constants.LOCK_POLL_INTERVAL)
+
+    async def install(
+        self,
+        output_path: str = None,
+        version: str = None,
+        check_latest: bool = True,
+        sha256: str = None,
+        prepend_path: bool = False,
+        progress=None,
+    ) -> str:
+        """
+        Install the latest GeckoDriver version, or a pinned version, and add its path to PATH.
+        If a valid driver of that version is already installed, nothing is downloaded.
+        The driver is staged and moved into place like in GetGeckoDriver.
+
+        :param output_path: Path to install the driver to.
+        :param version: Geckodriver version or version specifier, e.g. "~=0.34",
+            defaults to the latest version.
+        :param check_latest: Resolve the latest version (through the metadata cache).
+            If False, the newest driver that is already installed (and matches the version
+            specifier) is used when there is one, without any network request.
+        :param sha256: Expected SHA-256 of the release archive.
+        :param prepend_path: Put the driver path at the front of PATH instead of the back.
+        :param progress: Called like in download_version.
+        """
+
+        if version and not self.__get_driver._check_if_version_format_is_valid(version):
+            specifier = VersionSpecifier(version)
+            installed_version = None
+            if not check_latest:
+                installed_version = await asyncio.to_thread(
+                    self.__get_driver._installed_version, output_path, specifier
+                )
+            version = installed_version or await self.resolve(version)
+
+        if not version and not check_latest:
+            version = await asyncio.to_thread(
+                self.__get_driver._installed_version, output_path
+            )
+
+        if not version:
+            version = await self.latest_version()
+
+        if not output_path:
+            output_path = self.__get_driver._output_path(version)
+
+        is_installed = self.__get_driver._is_installed
+        if not await asyncio.to_thread(is_installed, version, output_path, sha256):
+            lock = self.__get_driver._lock(output_path)
+            await self.__acquire(lock)
+            try:
+                if not (
+                    lock.waited
+                    and await asyncio.to_thread(
+                        is_installed, version, output_path, sha256
+                    )
+                ):
+                    await self.__install(version, output_path, sha256, progress)
+            finally:
+                lock.release()
+
+        return self.__get_driver._register(output_path, prepend_path)
+
+    async def __install(
+        self, version: str, output_path: str, sha256: str, progress=None
+    ):
+        """
+        Download a driver into a staging directory and move it into output_path.
+        Recording and moving the driver run in a worker thread.
+        """
+
+        stage_path = await asyncio.to_thread(store.create_stage, output_path)
+        try:
+            _, digests = await self.__download_version(
+                version, stage_path, True, sha256, progress
+            )
+            await asyncio.to_thread(
+                self.__commit_install, stage_path, output_path, version, digests
+            )
+        finally:
+            await asyncio.to_thread(store.remove_stage, stage_path)
+
+    def __commit_install(
+        self, stage_path: str, output_path: str, version: str, digests: dict
+    ):
+        """
+        Record a staged driver and move it into output_path.
+        """
+
+        self.__get_driver._stage_install(stage_path, version, digests)
+        store.commit_install(stage_path, output_path, self.driver_filename())
+
+    async def __cache_get(self, key: str, refresh: bool = False, stale: bool = False):
+        """
+        Read the metadata cache in a worker thread.
+        """
+
+        return await asyncio.to_thread(
+            self.__get_driver._cache_get, key, refresh, stale
+        )
+
+    async def __cache_set(self, key: str, value):
+        """
+        Write the metadata cache in a worker thread.
+        """
+
+        await asyncio.to_thread(self.__get_driver._cache_set, key, value)
+
+    async def __request(self, method: str, url: str, **kwargs):
+        """
+        Send a request, retrying connection errors and retryable status codes
+        like the blocking session does.
+
+        :param method: HTTP method.
+        :param url: Url.
+        """
+
+        retries = 3
+        backoff_factor = 0.1
+        for attempt in range(retries + 1):
+            observers.emit(self.__observer, "request_start", method=method, url=url)
+            start = time.perf_counter()
+            try:
+                response = await self.session.request(method, url, **kwargs)
+            except aiohttp.ClientConnectionError as err:
+                self.__emit_request_end(method, url, start, None, err)
+                if attempt == retries:
+                    raise
+                status, error = None, str(err)
+            else:
+                self.__emit_request_end(method, url, start, response, None)
+                if response.status not in constants.RETRY_STATUS_CODES or (
+                    attempt == retries
+                ):
+                    return response
+                response.release()
+                status, error = response.status, None
+            observers.emit(
+                self.__observer,
+                "retry",
+                method=method,
+                url=url,
+                status=status,
+                error=error,
+                attempt=attempt + 1,
+            )
+            await asyncio.sleep(backoff_factor * (2**attempt))
+
+    def __emit_request_end(
+        self, method: str, url: str, start: float, response, error: Exception
+    ):
+        """
+        Send a request_end event.
+        """
+
+        observers.emit(
+            self.__observer,
+            "request_end",
+            method=method,
+            url=url,
+            status=response.status if response is not None else None,
+            bytes=response.content_length if response is not None else None,
+            seconds=time.perf_counter() - start,
+            error=str(error) if error else None,
+        )
@@ -0,0 +1,150 @@
+import json
+import os
+import platform as pl
+import re
+import tempfile
+import time
+
+from get_gecko_driver import constants
+
+
+def default_cache_dir() -> str:
+    """
+    Return the user cache directory for this application.
+    """
+
+    path = os.getenv(constants.CACHE_DIR_ENV)
+    if path:
+        return path
+
+    if pl.system() == "Windows":
+        base = os.getenv("LOCALAPPDATA") or os.path.expanduser("~/AppData/Local")
+        return os.path.join(base, constants.APP_NAME, "Cache")
+    elif pl.system() == "Darwin":
+        return os.path.join(os.path.expanduser("~/Library/Caches"), constants.APP_NAME)
+
+    base = os.getenv("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, constants.APP_NAME)
+
+
+class MetadataCache:
+    def __init__(self, path: str = None, ttl: float = constants.CACHE_TTL):
+        """
+        Persistent key/value cache for release metadata.
+        Every key is stored in its own JSON file, so concurrent processes never
+        overwrite each other's entries.
+
+        :param path: Cache directory, defaults to the user cache directory.
+        :param ttl: Seconds after which an entry is considered stale.
+        """
+
+        self.__path = os.path.join(path or default_cache_dir(), "metadata")
+        self.__ttl = ttl
+
+    @property
+    def path(self) -> str:
+        return self.__path
+
+    def get(self, key: str, stale: bool = False):
+        """
+        Return the cached value for key, or None if it is missing or stale.
+
+        :param key: Cache key.
+        :param stale: Also return a value that is older than the ttl.
+        """
+
+        entry = self.__read(key)
+        if not entry:
+            return None
+        if not stale and time.time() - entry["timestamp"] > self.__ttl:
+            return None
+
+        return entry["value"]
+
+    def set(self, key: str, value):
+        """
+        Store a value.
+
+        :param key: Cache key.
+        :param value: JSON serializable value.
+        """
+
+        self.__write(key, {"timestamp": time.time(), "value": value})
+
+    def delete(self, key: str):
+        """
+        Remove a key.
+
+        :param key: Cache key.
+        """
+
+        try:
+            os.remove(self.__file_path(key))
+        except OSError:
+            pass
+
+    def clear(self):
+        """
+        Remove all keys.
+        """
+
+        try:
+            file_names = os.listdir(self.__path)
+        except OSError:
+            return
+        for file_name in file_names:
+            if file_name.endswith(".json"):
+                try:
+                    os.remove(os.path.join(self.__path, file_name))
+                except OSError:
+                    pass
+
+    def __read(self, key: str):
+        """
+        Read the raw entry of a key.
+
+        :param key: Cache key.
+        """
+
+        try:
+            with open(self.__file_path(key), "r") as file:
+                entry = json.load(file)
+        except (OSError, ValueError):
+            return None
+
+        if not isinstance(entry, dict) or "timestamp" not in entry:
+            return None
+
+        return entry
+
+    def __write(self, key: str, entry: dict):
+        """
+        Atomically write the raw entry of a key.
+        A cache that can not be written to is silently ignored.
+
+        :param key: Cache key.
+        :param entry: Raw entry.
+        """
+
+        try:
+            os.makedirs(self.__path, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.__path, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w") as file:
+                    json.dump(entry, file)
+                os.replace(tmp_path, self.__file_path(key))
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+        except OSError:
+            pass
+
+    def __file_path(self, key: str) -> str:
+        """
+        Return the file path of a key.
+
+        :param key: Cache key.
+        """
+
+        file_name = re.sub(r"[^A-Za-z0-9._-]", "_", key)
+        return os.path.join(self.__path, file_name + ".json")
@@ -0,0 +1,261 @@
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+
+from get_gecko_driver import constants
+from get_gecko_driver import downloader
+
+ASSET_PATH = re.compile(
+    re.escape(constants.GECKODRIVER_RELEASES_PATH)
+    + r"/download/v(\d+(?:\.\d+)*)"
+    + r"/(geckodriver-v\d+(?:\.\d+)*-[A-Za-z0-9_-]+\.(?:zip|tar\.gz))"
+)
+METADATA_PATH = re.compile(
+    re.escape(constants.GECKODRIVER_REPO_PATH)
+    + r"/(?:releases|tags)(?:[/?][\w./?=&%-]*)?"
+)
+# Response headers of upstream metadata that are passed on
+METADATA_HEADERS = ["Content-Type", "Location", "ETag", "Last-Modified"]
+
+
+class CacheServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        host: str = constants.SERVE_HOST,
+        port: int = constants.SERVE_PORT,
+        root: str = constants.MIRROR_DIR,
+        upstream: str = constants.GITHUB_URL,
+        metadata_ttl: float = constants.SERVE_METADATA_TTL,
+    ):
+        """
+        HTTP server with the github.com url layout of the geckodriver releases.
+        Release assets are served from root (<root>/v<version>/<asset name>, the mirror layout).
+        An asset that is missing is downloaded from upstream once, also when many clients
+        request it at the same time. Release metadata is proxied and kept for metadata_ttl seconds.
+
+        :param host: Host to listen on.
+        :param port: Port to listen on, 0 picks a free port.
+        :param root: Driver store directory.
+        :param upstream: Base url the store is filled from.
+        :param metadata_ttl: Seconds proxied metadata is kept.
+        """
+
+        super().__init__((host, port), CacheRequestHandler)
+        self.root = root
+        self.upstream = upstream.rstrip("/")
+        self.metadata_ttl = metadata_ttl
+        self.session = downloader.create_session()
+        self.__asset_locks = {}
+        self.__metadata = {}
+        self.__lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        if host == "0.0.0.0":
+            host = "127.0.0.1"
+        return f"http://{host}:{port}"
+
+    def server_close(self):
+        super().server_close()
+        self.session.close()
+
+    def asset_file_path(self, version: str, asset: str) -> str:
+        """
+        Return the store path of an asset.
+        """
+
+        return os.path.join(self.root, f"v{version}", asset)
+
+    def fetch_asset(self, path: str, version: str, asset: str):
+        """
+        Return the store path of an asset, downloading it from upstream on a miss.
+        Return None if upstream does not have it.
+        """
+
+        from requests.exceptions import HTTPError
+
+        file_path = self.asset_file_path(version, asset)
+        if os.path.isfile(file_path):
+            return file_path
+
+        with self.__lock:
+            lock = self.__asset_locks.setdefault(file_path, threading.Lock())
+        with lock:
+            # Another request may have filled the store while waiting
+            if os.path.isfile(file_path):
+                return file_path
+            try:
+                downloader.download(
+                    url=self.upstream + path,
+                    output_path=os.path.dirname(file_path),
+                    session=self.session,
+                )
+            except HTTPError:
+                return None
+
+        return file_path
+
+    def head_asset(self, path: str, version: str, asset: str):
+        """
+        Return the size of an asset without downloading it, or None if it does not exist.
+        """
+
+        file_path = self.asset_file_path(version, asset)
+        if os.path.isfile(file_path):
+            return os.path.getsize(file_path)
+
+        res = self.session.head(self.upstream + path, allow_redirects=True)
+        if res.status_code != 200:
+            return None
+
+        return int(res.headers.get("Content-Length") or 0)
+
+    def fetch_metadata(self, path: str) -> tuple:
+        """
+        Return the status, headers and body of an upstream metadata page.
+        The latest release redirect is passed on as a redirect to a path on this server.
+        """
+
+        with self.__lock:
+            cached = self.__metadata.get(path)
+        if cached and time.time() - cached[0] < self.metadata_ttl:
+            return cached[1:]
+
+        res = self.session.get(self.upstream + path, allow_redirects=False)
+        headers = {k: res.headers[k] for k in METADATA_HEADERS if k in res.headers}
+        if "Location" in headers and headers["Location"].startswith(self.upstream):
+            headers["Location"] = headers["Location"][len(self.upstream) :]
+        response = (res.status_code, headers, res.content)
+
+        if res.status_code < 500:
+            with self.__lock:
+                self.__metadata[path] = (time.time(),) + response
+
+        return response
+
+
+class CacheRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: CacheServer
+
+    def do_HEAD(self):
+        self.__respond(head=True)
+
+    def do_GET(self):
+        self.__respond(head=False)
+
+    def log_message(self, format: str, *args):
+        pass
+
+    def __respond(self, head: bool):
+        from requests.exceptions import RequestException
+
+        path = self.path
+        try:
+            match = ASSET_PATH.fullmatch(path)
+            if match and head:
+                size = self.server.head_asset(path, *match.groups())
+                if size is None:
+                    return self.__send(404, b"Not Found", head=head)
+                return self.__send_headers(200, size, {"Accept-Ranges": "bytes"})
+            elif match:
+                file_path = self.server.fetch_asset(path, *match.groups())
+                if file_path is None:
+                    return self.__send(404, b"Not Found")
+                return self.__send_file(file_path)
+
+            if METADATA_PATH.fullmatch(path) and ".." not in path:
+                status, headers, body = self.server.fetch_metadata(path)
+                if status == 200 and self.__not_modified(headers):
+                    return self.__send(304, b"", headers, head)
+                return self.__send(status, body, headers, head)
+        except (OSError, RequestException):
+            return self.__send(502, b"Bad Gateway", head=head)
+
+        self.__send(404, b"Not Found", head=head)
+
+    def __not_modified(self, headers: dict) -> bool:
+        """
+        Check if the request is conditional on the validators of the cached page.
+        """
+
+        etag = self.headers.get("If-None-Match")
+        if etag and headers.get("ETag"):
+            return etag == headers["ETag"]
+
+        modified_since = self.headers.get("If-Modified-Since")
+        return bool(modified_since) and modified_since == headers.get("Last-Modified")
+
+    def __send_file(self, file_path: str):
+        """
+        Send a store file, or the byte range of it that was requested.
+        """
+
+        size = os.path.getsize(file_path)
+        start, end = 0, size - 1
+        status = 200
+        headers = {"Accept-Ranges": "bytes", "Content-Type": "application/octet-stream"}
+
+        match = re.fullmatch(r"bytes=(\d+)-(\d*)", self.headers.get("Range") or "")
+        if match:
+            start = int(match.group(1))
+            if match.group(2):
+                end = min(int(match.group(2)), size - 1)
+            if start >= size:
+                return self.__send(416, b"", {"Content-Range": f"bytes */{size}"})
+            status = 206
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+        self.__send_headers(status, end - start + 1, headers)
+        with open(file_path, "rb") as file:
+            file.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = file.read(min(1048576, remaining))
+                if not chunk:
+                    break
+                self.wfile.write(chunk)
+                remaining -= len(chunk)
+
+    def __send(
+        self, status: int, body: bytes, headers: dict = None, head: bool = False
+    ):
+        self.__send_headers(status, len(body), headers)
+        if not head:
+            self.wfile.write(body)
+
+    def __send_headers(self, status: int, length: int, headers: dict = None):
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(length))
+        self.end_headers()
+
+
+def serve(
+    host: str = constants.SERVE_HOST,
+    port: int = constants.SERVE_PORT,
+    root: str = constants.MIRROR_DIR,
+    upstream: str = constants.GITHUB_URL,
+):
+    """
+    Serve a driver store until interrupted.
+    Point clients at it with GetGeckoDriver(base_url=...) or GET_GECKO_DRIVER_BASE_URL.
+    """
+
+    server = CacheServer(host=host, port=port, root=root, upstream=upstream)
+    print(
+        f"Serving {os.path.abspath(root)} at {server.url}, upstream {server.upstream}"
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -1,6 +1,71 @@
-GECKODRIVER_RELEASES_URL = "https://github.com/mozilla/geckodriver/releases"
-DOWNLOAD_URL = (
-    "https://github.com/mozilla/geckodriver/releases/download/v{}/geckodriver-v{}-{}"
-)
-GITHUB_GECKODRIVER_TAGS_URL = "https://github.com/mozilla/geckodriver/tags"
+GITHUB_URL = "https://github.com"
+GECKODRIVER_REPO_PATH = "/mozilla/geckodriver"
+GECKODRIVER_RELEASES_PATH = GECKODRIVER_REPO_PATH + "/releases"
+DOWNLOAD_PATH = GECKODRIVER_RELEASES_PATH + "/download/v{}/geckodriver-v{}-{}"
+GECKODRIVER_TAGS_PATH = GECKODRIVER_REPO_PATH + "/tags"
+# Fragment listing the assets of one release
+EXPANDED_ASSETS_PATH = GECKODRIVER_RELEASES_PATH + "/expanded_assets/v{}"
+GECKODRIVER_RELEASES_URL = GITHUB_URL + GECKODRIVER_RELEASES_PATH
+DOWNLOAD_URL = GITHUB_URL + DOWNLOAD_PATH
+GITHUB_GECKODRIVER_TAGS_URL = GITHUB_URL + GECKODRIVER_TAGS_PATH
 CSS_SELECTOR_LATEST_VERSION = ".Box-body .Link--primary"
+
+APP_NAME = "get-gecko-driver"
+CACHE_DIR_ENV = "GET_GECKO_DRIVER_CACHE_DIR"
+# Alternative base url with the github.com url layout, e.g. a "get-gecko-driver serve" cache
+BASE_URL_ENV = "GET_GECKO_DRIVER_BASE_URL"
+# Seconds before cached release metadata is fetched again
+CACHE_TTL = 3600
+# Status codes that are retried
+RETRY_STATUS_CODES = [429, 500, 502, 503, 504]
+# Maximum number of pooled keep-alive connections per host
+POOL_SIZE = 10
+# Bytes of a streamed .zip archive buffered in memory before spilling to disk
+SPOOL_MAX_SIZE = 32 * 1048576
+# First, smallest and largest bytes read per download chunk
+CHUNK_SIZE = 64 * 1024
+MIN_CHUNK_SIZE = 16 * 1024
+MAX_CHUNK_SIZE = 8 * 1048576
+# Bytes of downloaded chunks the async API collects before writing them in a worker thread
+WRITE_BATCH_SIZE = 1048576
+# Seconds a download chunk should take at the measured throughput
+CHUNK_SECONDS = 0.1
+# Maximum download bytes per second of the process, e.g. 2M
+RATE_LIMIT_ENV = "GET_GECKO_DRIVER_RATE_LIMIT"
+# Directory of the default <version>/bin driver layout
+STORE_DIR = "geckodriver"
+# File recording the version of an installed driver
+VERSION_FILE_NAME = ".geckodriver-version"
+# Prefix of the directory an install is staged in before it is moved into place
+INSTALL_STAGE_PREFIX = ".geckodriver-install-"
+# Times an interrupted download is resumed with a Range request
+RESUME_ATTEMPTS = 5
+# Minimum bytes per range of a multi-connection download
+MIN_RANGE_SIZE = 256 * 1024
+# Default directory, concurrency and manifest of a mirrored version x platform matrix
+MIRROR_DIR = "geckodriver-mirror"
+MIRROR_WORKERS = 4
+MANIFEST_FILE_NAME = "manifest.json"
+# Default address and directory of the "serve" cache server
+SERVE_HOST = "0.0.0.0"
+SERVE_PORT = 8000
+# Seconds the cache server keeps proxied release metadata
+SERVE_METADATA_TTL = 300
+# Lock file that makes concurrent downloads into one directory single-flight
+LOCK_FILE_NAME = ".geckodriver.lock"
+# Seconds to wait for another process's download before giving up
+LOCK_TIMEOUT = 300
+# Seconds after which a lock file that is no longer touched by its holder is taken over
+LOCK_STALE_AFTER = 60
+LOCK_POLL_INTERVAL = 0.1
+# File recording the size, mtime and SHA-256 of an installed driver
+DRIVER_RECORD_FILE_NAME = ".geckodriver-record.json"
+# File that events are exported to, .prom for Prometheus text, else JSON lines
+METRICS_ENV = "GET_GECKO_DRIVER_METRICS"
+METRICS_PREFIX = "get_gecko_driver_"
+# Maximum number of entries of the process-wide metadata memo
+MEMO_MAX_SIZE = 1024
+# Seconds between two polls of the background refresher, and the random fraction added or
+# subtracted, so many refreshers do not poll at the same moment
+REFRESH_INTERVAL = 1800
+REFRESH_JITTER = 0.1
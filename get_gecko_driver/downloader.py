@@ -1,70 +1,748 @@
+import hashlib
 import os
-import requests
-from urllib3.util.retry import Retry
-from requests.adapters import HTTPAdapter
+import re
+import tempfile
+import threading
+import time
+from typing import TYPE_CHECKING
 from urllib.parse import urlparse
-from requests.exceptions import RequestException
-from requests.exceptions import HTTPError
 
+from get_gecko_driver import constants
+from get_gecko_driver.exceptions import ChecksumError
+from get_gecko_driver.observer import Observer
+from get_gecko_driver.observer import emit
 
-def download(url: str, output_path: str = None, file_name: str = None):
+# requests, tarfile and zipfile are imported on first use to keep startup cheap
+if TYPE_CHECKING:
+    import requests
+
+
+def create_session(
+    pool_size: int = constants.POOL_SIZE, observer: Observer = None
+) -> "requests.Session":
+    """
+    Create a keep-alive session with a retrying connection pool.
+    The session can be shared by any number of requests and threads.
+
+    :param pool_size: Maximum number of connections kept open per host.
+    :param observer: Observer of the request and retry events.
+    """
+
+    return __retry_session(
+        retries=3,
+        backoff_factor=0.1,
+        status_forcelist=constants.RETRY_STATUS_CODES,
+        method_whitelist=["GET", "HEAD"],
+        pool_size=pool_size,
+        observer=observer,
+    )
+
+
+def download(
+    url: str,
+    output_path: str = None,
+    file_name: str = None,
+    session: "requests.Session" = None,
+    connections: int = 1,
+    sha256: str = None,
+    digests: dict = None,
+    observer: Observer = None,
+    progress=None,
+    rate_limiter: "RateLimiter" = None,
+):
     """
     Download a file from url.
+    The SHA-256 of the file is computed while its chunks are written. If sha256 is given and
+    does not match, the file is removed and ChecksumError is raised. If digests is a dict,
+    the SHA-256 is stored in it under "archive".
+    A download event with the size and throughput is sent to observer.
+    progress is called after every chunk with the bytes downloaded so far, the total bytes
+    (None if unknown) and the average bytes per second. The chunk size follows the measured
+    throughput. With a rate_limiter, the download waits as long as its limit requires.
     If output_path is None, the file will be downloaded directly at the current directory.
     If file_name is None, the file name from the url will be used.
+    If session is None, a new session is created and closed afterwards.
+    The file is written to <file_name>.part first. When the connection drops, the download
+    resumes from the end of the .part file with a Range request, also in a later call.
+    With connections > 1 and a server that supports ranges, the file is split in that many
+    ranges that are downloaded in parallel into a preallocated file, which becomes the .part
+    file only when every range is complete.
     """
 
-    session = __retry_session(
-        retries=3,
-        backoff_factor=0.1,
-        status_forcelist=[429, 500, 502, 503, 504],
-        method_whitelist=["GET"],
+    from requests.exceptions import HTTPError
+    from requests.exceptions import RequestException
+
+    if file_name == "" or file_name is None:
+        # Get the file name from the url
+        file_name = __get_file_name_from_url(url)
+
+    if output_path == "" or output_path is None:
+        file_path = file_name
+    else:
+        __makedirs(output_path)
+        file_path = output_path + "/" + file_name
+    part_path = file_path + ".part"
+
+    own_session = session is None
+    if own_session:
+        session = create_session(
+            pool_size=max(connections, constants.POOL_SIZE), observer=observer
+        )
+    start = time.perf_counter()
+    transfer = _Transfer(progress=progress, rate_limiter=rate_limiter)
+    try:
+        if connections > 1 and __download_ranges(
+            session, url, part_path, connections, observer, transfer
+        ):
+            # Ranges arrive out of order, so the assembled file is hashed afterwards
+            digest = file_hash(part_path).hexdigest()
+        else:
+            digest = __download_resumable(session, url, part_path, observer, transfer)
+    except HTTPError:
+        raise
+    except RequestException as err:
+        raise RequestException(err)
+    finally:
+        if own_session:
+            session.close()
+
+    try:
+        __check_digest(file_name, digest, sha256)
+    except ChecksumError:
+        os.remove(part_path)
+        raise
+    if digests is not None:
+        digests["archive"] = digest
+    __emit_download(
+        observer, url, os.path.getsize(part_path), start, connections=connections
+    )
+
+    os.replace(part_path, file_path)
+    return file_path, file_name
+
+
+def __emit_download(
+    observer: Observer, url: str, size: int, start: float, connections: int = 1
+):
+    """
+    Send a download event with the throughput since start.
+    """
+
+    seconds = time.perf_counter() - start
+    emit(
+        observer,
+        "download",
+        url=url,
+        bytes=size,
+        seconds=seconds,
+        bytes_per_second=size / seconds if seconds else None,
+        connections=connections,
+    )
+
+
+def file_hash(file_path: str):
+    """
+    Return the SHA-256 hash object of a file, or of no bytes if it does not exist.
+    """
+
+    sha256 = hashlib.sha256()
+    try:
+        with open(file_path, "rb") as file:
+            for chunk in iter(lambda: file.read(1048576), b""):
+                sha256.update(chunk)
+    except FileNotFoundError:
+        pass
+
+    return sha256
+
+
+def __check_digest(name: str, digest: str, sha256: str):
+    """
+    Raise ChecksumError if an expected SHA-256 is given and does not match.
+    """
+
+    if sha256 and digest != sha256.lower():
+        raise ChecksumError(f"SHA-256 of {name} is {digest}, expected {sha256}.")
+
+
+def __download_resumable(
+    session: "requests.Session",
+    url: str,
+    part_path: str,
+    observer: Observer = None,
+    transfer: "_Transfer" = None,
+) -> str:
+    """
+    Download url into part_path, continuing from the bytes that are already there.
+    Return the SHA-256 of the file, which is updated with every chunk that is written.
+    """
+
+    transfer = transfer or _Transfer()
+
+    from requests.exceptions import ChunkedEncodingError
+    from requests.exceptions import ConnectionError
+    from requests.exceptions import HTTPError
+
+    sha256 = hashlib.sha256()
+    hashed = 0
+    for attempt in range(constants.RESUME_ATTEMPTS + 1):
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        if offset != hashed:
+            # Bytes written by an earlier call are only read once, to continue the hash
+            sha256, hashed = file_hash(part_path), offset
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        try:
+            with session.get(url=url, headers=headers, stream=True) as res:
+                if res.status_code == 416 and offset:
+                    if __content_range_size(res) == offset:
+                        # The .part file is already complete
+                        return sha256.hexdigest()
+                    os.remove(part_path)
+                    sha256, hashed = hashlib.sha256(), 0
+                    continue
+
+                if res.status_code == 206 and offset:
+                    mode = "ab"
+                    transfer.start(offset, __content_range_size(res))
+                elif res.status_code == 200:
+                    # Range not supported, start over
+                    mode = "wb"
+                    sha256, hashed = hashlib.sha256(), 0
+                    transfer.start(0, __content_length(res))
+                else:
+                    raise HTTPError("Invalid URL")
+
+                with open(part_path, mode) as file:
+                    # Download the file in chunks
+                    for chunk in __iter_chunks(res, transfer):
+                        file.write(chunk)
+                        sha256.update(chunk)
+                        hashed += len(chunk)
+                return sha256.hexdigest()
+        except (ConnectionError, ChunkedEncodingError) as err:
+            if attempt == constants.RESUME_ATTEMPTS:
+                raise
+            __emit_resume(observer, url, err, attempt)
+
+
+def __emit_resume(observer: Observer, url: str, error: Exception, attempt: int):
+    """
+    Send a retry event for a download that is resumed.
+    """
+
+    emit(
+        observer,
+        "retry",
+        method="GET",
+        url=url,
+        status=None,
+        error=str(error),
+        attempt=attempt + 1,
     )
+
+
+def __download_ranges(
+    session: "requests.Session",
+    url: str,
+    part_path: str,
+    connections: int,
+    observer: Observer = None,
+    transfer: "_Transfer" = None,
+) -> bool:
+    """
+    Download url in parallel ranges into part_path.
+    The ranges are written to a separate preallocated file that is only moved to part_path
+    when every range is complete, and removed when a range fails, so a resumed download
+    never trusts a file with missing ranges.
+    Return False if the server does not support ranges or the file is too small to split.
+    """
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    from requests.exceptions import ChunkedEncodingError
+    from requests.exceptions import ConnectionError
+    from requests.exceptions import HTTPError
+
+    # Resolve redirects once, so every range goes straight to the file host
+    res = session.head(url=url, allow_redirects=True)
+    size = int(res.headers.get("Content-Length") or 0)
+    if (
+        res.status_code != 200
+        or res.headers.get("Accept-Ranges") != "bytes"
+        or size < connections * constants.MIN_RANGE_SIZE
+    ):
+        return False
+    file_url = res.url
+    transfer = transfer or _Transfer()
+    transfer.start(0, size)
+
+    ranges_path = part_path + ".ranges"
+    with open(ranges_path, "wb") as file:
+        file.truncate(size)
+
+    def download_range(byte_range: tuple):
+        position, end = byte_range
+        for attempt in range(constants.RESUME_ATTEMPTS + 1):
+            try:
+                with session.get(
+                    url=file_url,
+                    headers={"Range": f"bytes={position}-{end}"},
+                    stream=True,
+                ) as range_res:
+                    if range_res.status_code != 206:
+                        raise HTTPError("Range request failed")
+                    with open(ranges_path, "r+b") as range_file:
+                        range_file.seek(position)
+                        for chunk in __iter_chunks(range_res, transfer):
+                            range_file.write(chunk)
+                            position += len(chunk)
+                return
+            except (ConnectionError, ChunkedEncodingError) as err:
+                # Continue the range from the last written byte
+                if attempt == constants.RESUME_ATTEMPTS:
+                    raise
+                __emit_resume(observer, file_url, err, attempt)
+
+    range_size = -(-size // connections)
+    byte_ranges = [
+        (start, min(start + range_size, size) - 1)
+        for start in range(0, size, range_size)
+    ]
+    try:
+        with ThreadPoolExecutor(max_workers=connections) as executor:
+            list(executor.map(download_range, byte_ranges))
+    except BaseException:
+        os.remove(ranges_path)
+        raise
+    os.replace(ranges_path, part_path)
+
+    return True
+
+
+def __iter_chunks(res: "requests.Response", transfer: "_Transfer"):
+    """
+    Yield the body of a streamed response in chunks of the current size of the transfer.
+    The body is read from the one raw stream of the response, so the size can change
+    between chunks, and urllib3 errors are raised as the requests errors iter_content raises.
+    """
+
+    from requests.exceptions import ChunkedEncodingError
+    from requests.exceptions import ConnectionError
+    from requests.exceptions import ContentDecodingError
+    from urllib3.exceptions import DecodeError
+    from urllib3.exceptions import ProtocolError
+    from urllib3.exceptions import ReadTimeoutError
+
+    while True:
+        try:
+            chunk = res.raw.read(transfer.chunk_size, decode_content=True)
+        except ProtocolError as err:
+            raise ChunkedEncodingError(err)
+        except DecodeError as err:
+            raise ContentDecodingError(err)
+        except ReadTimeoutError as err:
+            raise ConnectionError(err)
+        if not chunk:
+            return
+        yield chunk
+        delay = transfer.update(len(chunk))
+        if delay > 0:
+            time.sleep(delay)
+
+
+def __content_length(res: "requests.Response"):
+    """
+    Return the Content-Length of a response as a number, or None.
+    """
+
+    length = res.headers.get("Content-Length")
+    return int(length) if length and length.isdigit() else None
+
+
+def __content_range_size(res: "requests.Response"):
+    """
+    Return the total size from a Content-Range header, or None.
+    """
+
+    content_range = res.headers.get("Content-Range", "")
     try:
-        res = session.get(url=url)
+        return int(content_range.rsplit("/", 1)[1])
+    except (IndexError, ValueError):
+        return None
+
+
+def download_member(
+    url: str,
+    member: str,
+    output_path: str = None,
+    session: "requests.Session" = None,
+    sha256: str = None,
+    digests: dict = None,
+    observer: Observer = None,
+    progress=None,
+    rate_limiter: "RateLimiter" = None,
+):
+    """
+    Download a .tar.gz or .zip archive from url and write only one of its members.
+    A .tar.gz archive is decompressed while the bytes arrive and is never written to disk.
+    A .zip archive needs its central directory at the end of the file, so it is buffered
+    in memory and only spilled to a temporary file when it is larger than SPOOL_MAX_SIZE.
+    If output_path is None, the member will be written directly at the current directory.
+    If session is None, a new session is created and closed afterwards.
+    The SHA-256 of the archive is computed while it arrives and checked against sha256
+    before the member is moved into place. If digests is a dict, the SHA-256 of the archive
+    and of the member are stored in it under "archive" and "member".
+    A download and an extract event are sent to observer. A .tar.gz archive is extracted
+    while it arrives, so its extract time includes the transfer.
+    progress and rate_limiter work like in download.
+    """
+
+    from requests.exceptions import HTTPError
+    from requests.exceptions import RequestException
+
+    own_session = session is None
+    if own_session:
+        session = create_session(observer=observer)
+    start = time.perf_counter()
+    try:
+        res = session.get(url=url, stream=True)
     except RequestException as err:
         raise RequestException(err)
     else:
         if res.status_code != 200:
+            res.close()
             raise HTTPError("Invalid URL")
 
-        if file_name == "" or file_name is None:
-            # Get the file name from the url
-            file_name = __get_file_name_from_url(url)
-
         if output_path == "" or output_path is None:
-            file_path = file_name
+            file_path = member
         else:
             __makedirs(output_path)
-            file_path = output_path + "/" + file_name
-
-        with open(file_path, "wb") as file:
-            # Download the file in chunks
-            for chunk in res.iter_content(chunk_size=1048576):
-                if chunk:
-                    file.write(chunk)
-        return file_path, file_name
+            file_path = output_path + "/" + member
+
+        part_path = file_path + ".part"
+        archive_name = __get_file_name_from_url(url)
+        transfer = _Transfer(progress=progress, rate_limiter=rate_limiter)
+        transfer.start(0, __content_length(res))
+        try:
+            if archive_name.endswith(".zip"):
+                with tempfile.SpooledTemporaryFile(
+                    max_size=constants.SPOOL_MAX_SIZE
+                ) as buffer:
+                    archive_sha256 = hashlib.sha256()
+                    for chunk in __iter_chunks(res, transfer):
+                        buffer.write(chunk)
+                        archive_sha256.update(chunk)
+                    size = buffer.tell()
+                    __emit_download(observer, url, size, start)
+                    __check_digest(archive_name, archive_sha256.hexdigest(), sha256)
+                    buffer.seek(0)
+                    extract_start = time.perf_counter()
+                    member_digest = extract_member(
+                        buffer, archive_name, member, part_path
+                    )
+            else:
+                res.raw.decode_content = True
+                reader = _HashingReader(res.raw, transfer)
+                extract_start = time.perf_counter()
+                member_digest = extract_member(reader, archive_name, member, part_path)
+                # The member may end before the archive does
+                reader.drain()
+                __emit_download(observer, url, reader.size, start)
+                archive_sha256 = reader.sha256
+                __check_digest(archive_name, archive_sha256.hexdigest(), sha256)
+            emit(
+                observer,
+                "extract",
+                archive=archive_name,
+                member=member,
+                seconds=time.perf_counter() - extract_start,
+            )
+        except BaseException:
+            if os.path.exists(part_path):
+                os.remove(part_path)
+            raise
+        finally:
+            res.close()
+
+        if digests is not None:
+            digests["archive"] = archive_sha256.hexdigest()
+            digests["member"] = member_digest
+        os.replace(part_path, file_path)
+        return file_path, member
     finally:
-        session.close()
+        if own_session:
+            session.close()
+
+
+def parse_rate(value) -> float:
+    """
+    Return a rate like 500K, 2M or 1048576 in bytes per second.
+    K, M and G are powers of 1024.
+    """
+
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMG]?)i?B?\s*", str(value), re.I)
+    if not match:
+        raise ValueError(f"Invalid rate {value!r}.")
+
+    exponent = " KMG".index(match.group(2).upper() or " ")
+    return float(match.group(1)) * 1024**exponent
+
+
+class RateLimiter:
+    def __init__(self, bytes_per_second: float):
+        """
+        Thread-safe limit of the bytes per second of any number of downloads that share it.
+
+        :param bytes_per_second: Maximum average throughput.
+        """
+
+        self.bytes_per_second = bytes_per_second
+        self.__due = time.monotonic()
+        self.__lock = threading.Lock()
+
+    def reserve(self, size: int) -> float:
+        """
+        Account for size bytes and return the seconds to wait before the next read.
+        The caller sleeps, so an event loop can wait without blocking.
+
+        :param size: Bytes that were read.
+        """
+
+        with self.__lock:
+            now = time.monotonic()
+            # Idle time is not saved up for a later burst
+            self.__due = max(self.__due, now) + size / self.bytes_per_second
+            return self.__due - now
+
+
+class _Transfer:
+    def __init__(self, progress=None, rate_limiter: RateLimiter = None):
+        """
+        Progress of one download, shared by the threads of a ranged download.
+        Every chunk is reported to progress, the chunk size follows the measured
+        throughput, and the rate limiter decides how long to wait after a chunk.
+        """
+
+        self.progress = progress
+        self.rate_limiter = rate_limiter
+        self.chunk_size = constants.CHUNK_SIZE
+        self.done = 0
+        self.total = None
+        self.__start = time.perf_counter()
+        self.__last = self.__start
+        self.__started_at = 0
+        self.__throughput = None
+        self.__lock = threading.Lock()
+
+    def start(self, done: int, total: int = None):
+        """
+        Start, or restart after a dropped connection, at done of total bytes.
+        """
+
+        with self.__lock:
+            self.done = done
+            self.total = total
+            self.__started_at = done
+            self.__last = time.perf_counter()
+
+    def update(self, size: int) -> float:
+        """
+        Account for a chunk of size bytes. Return the seconds to wait before the next one.
+        """
+
+        with self.__lock:
+            now = time.perf_counter()
+            self.done += size
+            elapsed = now - self.__last
+            self.__last = now
+            if elapsed > 0:
+                throughput = size / elapsed
+                if self.__throughput is None:
+                    self.__throughput = throughput
+                else:
+                    # Smooth single slow or fast chunks out
+                    self.__throughput = 0.7 * self.__throughput + 0.3 * throughput
+                self.chunk_size = self.__chunk_size(self.__throughput)
+            done, total = self.done, self.total
+            seconds = now - self.__start
+            average = (done - self.__started_at) / seconds if seconds > 0 else None
+
+        delay = self.rate_limiter.reserve(size) if self.rate_limiter else 0
+        if self.progress:
+            self.progress(done, total, average)
+
+        return delay
+
+    def __chunk_size(self, throughput: float) -> int:
+        """
+        Return the power of two chunk size that takes about CHUNK_SECONDS at throughput.
+        """
+
+        if self.rate_limiter:
+            throughput = min(throughput, self.rate_limiter.bytes_per_second)
+        size = constants.MIN_CHUNK_SIZE
+        while size < constants.MAX_CHUNK_SIZE and size * 2 <= (
+            throughput * constants.CHUNK_SECONDS
+        ):
+            size *= 2
+
+        return size
+
+
+class _HashingReader:
+    """
+    File object wrapper that hashes the bytes that are read through it.
+    """
+
+    def __init__(self, fileobj, transfer: "_Transfer" = None):
+        self.fileobj = fileobj
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+        self.transfer = transfer
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.fileobj.read(size)
+        self.sha256.update(data)
+        self.size += len(data)
+        if data and self.transfer:
+            delay = self.transfer.update(len(data))
+            if delay > 0:
+                time.sleep(delay)
+        return data
+
+    def drain(self):
+        while self.read(1048576):
+            pass
+
+
+def extract_member(
+    fileobj, archive_name: str, member: str, file_path: str, mode: int = 0o755
+) -> str:
+    """
+    Write one member of a .tar.gz or .zip archive to file_path and return its SHA-256.
+    Only the first regular file named member, at any depth, is read; every other entry is
+    skipped. A matching entry with an absolute path or a ".." component is rejected.
+    The file is created with mode, so it needs no chmod afterwards.
+    A .tar.gz archive is read sequentially, so fileobj may be a non-seekable stream.
+    A .zip archive must be seekable.
+    """
+
+    import tarfile
+    import zipfile
+
+    try:
+        if archive_name.endswith(".zip"):
+            return __extract_zip_member(fileobj, member, file_path, mode)
+        else:
+            return __extract_tar_gz_member(fileobj, member, file_path, mode)
+    except (tarfile.TarError, zipfile.BadZipFile, EOFError) as err:
+        raise OSError(f"Could not extract {member}: {err}")
+
+
+def __extract_tar_gz_member(fileobj, member: str, file_path: str, mode: int) -> str:
+    """
+    Decompress a .tar.gz stream and write one member.
+    """
+
+    import tarfile
+
+    with tarfile.open(fileobj=fileobj, mode="r|gz") as tar_gz_ref:
+        for tar_info in tar_gz_ref:
+            if tar_info.isfile() and __is_member(tar_info.name, member):
+                source = tar_gz_ref.extractfile(tar_info)
+                return __copy_hashed(source, file_path, mode)
+
+    raise FileNotFoundError(f"{member} not found in archive")
+
+
+def __extract_zip_member(fileobj, member: str, file_path: str, mode: int) -> str:
+    """
+    Write one member of a seekable .zip file object.
+    """
+
+    import zipfile
+
+    with zipfile.ZipFile(fileobj, "r") as zip_ref:
+        for zip_info in zip_ref.infolist():
+            if not zip_info.is_dir() and __is_member(zip_info.filename, member):
+                with zip_ref.open(zip_info) as source:
+                    return __copy_hashed(source, file_path, mode)
+
+    raise FileNotFoundError(f"{member} not found in archive")
+
+
+def __is_member(name: str, member: str) -> bool:
+    """
+    Check if an archive entry is the member. Raise OSError if it is, but its path points
+    outside the directory the archive is extracted to.
+    """
+
+    parts = name.replace("\\", "/").split("/")
+    if parts[-1] != member:
+        return False
+    if name.startswith(("/", "\\")) or ".." in parts or ":" in parts[0]:
+        raise OSError(f"Unsafe path {name!r} in archive")
+
+    return True
+
+
+def __copy_hashed(source, file_path: str, mode: int = 0o644) -> str:
+    """
+    Copy a file object to a new file with mode and return the SHA-256 of the copied bytes.
+    """
+
+    sha256 = hashlib.sha256()
+    fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+    with open(fd, "wb") as file:
+        if hasattr(os, "fchmod"):
+            # The mode of os.open is reduced by the umask
+            os.fchmod(fd, mode)
+        for chunk in iter(lambda: source.read(1048576), b""):
+            file.write(chunk)
+            sha256.update(chunk)
+
+    return sha256.hexdigest()
 
 
 def __retry_session(
-    retries: int, backoff_factor: float, status_forcelist: any, method_whitelist: any
+    retries: int,
+    backoff_factor: float,
+    status_forcelist: any,
+    method_whitelist: any,
+    pool_size: int = constants.POOL_SIZE,
+    observer: Observer = None,
 ):
     """
     Retry session.
+    With an observer, every request and retry is reported to it.
     """
 
-    retry = Retry(
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    retry_options = dict(
         total=retries,
         read=retries,
         connect=retries,
         backoff_factor=backoff_factor,
         status_forcelist=status_forcelist,
         allowed_methods=method_whitelist,
+        # Return the last response once the retries are exhausted, so callers check its status
+        raise_on_status=False,
     )
+    adapter_options = dict(pool_connections=pool_size, pool_maxsize=pool_size)
+
+    if observer is None:
+        retry = Retry(**retry_options)
+        adapter = HTTPAdapter(max_retries=retry, **adapter_options)
+    else:
+        from get_gecko_driver.adapters import ObservedAdapter
+        from get_gecko_driver.adapters import ObservedRetry
 
-    adapter = HTTPAdapter(max_retries=retry)
+        retry = ObservedRetry(**retry_options)
+        retry.observer = observer
+        adapter = ObservedAdapter(observer, max_retries=retry, **adapter_options)
     session = requests.Session()
     session.mount("http://", adapter)
     session.mount("https://", adapter)
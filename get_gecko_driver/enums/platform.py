@@ -5,9 +5,12 @@ class Platform(Enum):
     win = "win"
     win32 = "win32"
     win64 = "win64"
+    win_aarch64 = "win-aarch64"
     linux = "linux"
     linux32 = "linux32"
     linux64 = "linux64"
+    linux_aarch64 = "linux-aarch64"
     macos = "macos"
+    macos_aarch64 = "macos-aarch64"
     mac32 = "mac32"
     mac64 = "mac64"
@@ -16,3 +16,15 @@ class UnknownVersionError(GetGeckoDriverError):
 
 class DownloadError(GetGeckoDriverError):
     pass
+
+
+class ChecksumError(DownloadError):
+    pass
+
+
+class LockTimeoutError(GetGeckoDriverError):
+    pass
+
+
+class InvalidSpecifierError(UnknownVersionError):
+    pass
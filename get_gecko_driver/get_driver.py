@@ -1,25 +1,66 @@
 import os
 import platform as pl
+import re
 import struct
-import tarfile
-import zipfile
-
-import requests
-from bs4 import BeautifulSoup
-from requests.exceptions import HTTPError
-from requests.exceptions import RequestException
+import threading
+import time
+from typing import TYPE_CHECKING
+from urllib.parse import urlparse
 
 from get_gecko_driver import constants
 from get_gecko_driver import downloader
+from get_gecko_driver import observer as observers
+from get_gecko_driver import store
+from get_gecko_driver.cache import MetadataCache
 from get_gecko_driver.enums import Platform, OsPlatform
+from get_gecko_driver.lock import FileLock
+from get_gecko_driver.memo import MEMO
+from get_gecko_driver.specifier import VersionIndex
+from get_gecko_driver.specifier import VersionSpecifier
+from get_gecko_driver.specifier import version_key
 from get_gecko_driver.exceptions import DownloadError, VersionUrlError
 from get_gecko_driver.exceptions import GetGeckoDriverError
 from get_gecko_driver.exceptions import UnknownPlatformError
 from get_gecko_driver.exceptions import UnknownVersionError
 
+# requests, bs4, tarfile and zipfile are imported on first use to keep startup cheap
+if TYPE_CHECKING:
+    import requests
+
 
 class GetGeckoDriver:
-    def __init__(self, os_platform: OsPlatform = None):
+    def __init__(
+        self,
+        os_platform: OsPlatform = None,
+        cache_dir: str = None,
+        cache_ttl: float = constants.CACHE_TTL,
+        use_cache: bool = True,
+        session: "requests.Session" = None,
+        pool_size: int = constants.POOL_SIZE,
+        base_url: str = None,
+        lock_timeout: float = constants.LOCK_TIMEOUT,
+        observer: observers.Observer = None,
+        rate_limit=None,
+    ):
+        """
+        :param os_platform: OS platform, defaults to the current OS.
+        :param cache_dir: Directory of the metadata cache, defaults to the user cache directory.
+        :param cache_ttl: Seconds before cached metadata is fetched again.
+        :param use_cache: Read and write the metadata cache or not. Cached metadata is also
+            memoized in memory and shared by every instance in the process with the same
+            cache directory and base url.
+        :param session: Session used for all requests, a pooled session is created if None.
+        :param pool_size: Maximum number of keep-alive connections per host of the created session.
+        :param base_url: Alternative to https://github.com with the same url layout, e.g. a
+            "get-gecko-driver serve" cache. Defaults to the GET_GECKO_DRIVER_BASE_URL environment variable.
+        :param lock_timeout: Seconds to wait for another process that downloads into the same path.
+        :param observer: Observer of request, retry, download, extract and cache events, e.g. a
+            JsonLinesExporter. Defaults to the exporter set with GET_GECKO_DRIVER_METRICS.
+            Request and retry events are only sent for the session that is created.
+        :param rate_limit: Maximum bytes per second of all downloads of this instance, e.g.
+            2097152 or "2M". Defaults to the GET_GECKO_DRIVER_RATE_LIMIT environment variable.
+        """
+
         self.__os_platforms_list = [os_platform for os_platform in OsPlatform]
 
         if not os_platform:
@@ -38,6 +79,68 @@ class GetGeckoDriver:
         self.__arch = struct.calcsize("P") * 8
         self.__zip_ext = ".zip"
         self.__tar_gz_ext = ".tar.gz"
+        self.__cache = MetadataCache(cache_dir, cache_ttl) if use_cache else None
+        self.__cache_ttl = cache_ttl
+        self.__base_url = (
+            base_url or os.getenv(constants.BASE_URL_ENV) or constants.GITHUB_URL
+        ).rstrip("/")
+        self.__own_session = session is None
+        self.__session = session
+        self.__session_lock = threading.Lock()
+        self.__pool_size = pool_size
+        self.__lock_timeout = lock_timeout
+        self.__observer = observer or observers.from_env()
+        rate_limit = rate_limit or os.getenv(constants.RATE_LIMIT_ENV)
+        self.__rate_limiter = (
+            downloader.RateLimiter(downloader.parse_rate(rate_limit))
+            if rate_limit
+            else None
+        )
+        self.__version_index = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @property
+    def base_url(self) -> str:
+        """
+        The base url all release urls are built from.
+        """
+
+        return self.__base_url
+
+    @property
+    def rate_limiter(self):
+        """
+        The downloader.RateLimiter shared by all downloads, or None.
+        """
+
+        return self.__rate_limiter
+
+    @property
+    def session(self) -> "requests.Session":
+        """
+        The session used for all requests, created on first use.
+        """
+
+        with self.__session_lock:
+            if self.__session is None:
+                self.__session = downloader.create_session(
+                    pool_size=self.__pool_size, observer=self.__observer
+                )
+            return self.__session
+
+    def close(self):
+        """
+        Close the connection pool, unless the session was passed in.
+        """
+
+        if self.__own_session and self.__session is not None:
+            self.__session.close()
+            self.__session = None
 
     def driver_filename(self) -> str:
         """
@@ -53,156 +156,729 @@ class GetGeckoDriver:
 
         raise UnknownPlatformError("Unknown OS platform.")
 
-    def latest_version(self) -> str:
+    def latest_version(self, refresh: bool = False) -> str:
         """
         Return the latest version.
+
+        :param refresh: Bypass the metadata cache and fetch the latest version again.
+        """
+
+        return self._coalesce(
+            "latest_version", lambda: self.__latest_version(refresh), refresh
+        )
+
+    def __latest_version(self, refresh: bool = False) -> str:
+        """
+        Return the latest version from the metadata cache or from the releases.
+
+        :param refresh: Bypass the metadata cache.
         """
 
-        result = requests.get(constants.GECKODRIVER_RELEASES_URL)
-        if not result.ok:
-            raise GetGeckoDriverError(
-                f"Could not fetch from {constants.GECKODRIVER_RELEASES_URL}."
+        key = "latest_version"
+        version = self._cache_get(key, refresh)
+        if version:
+            return version
+
+        version = self.__latest_version_from_redirect()
+        if not version:
+            # Fall back to scraping the releases page
+            version = self.__conditional_get(
+                self._releases_url(), self._parse_latest_version
             )
+            if not version:
+                raise GetGeckoDriverError(
+                    f"Could not fetch from {self._releases_url()}."
+                )
+
+        self._cache_set(key, version)
+
+        return version
+
+    def __latest_version_from_redirect(self):
+        """
+        Return the latest version from the redirect of the latest release url, or None.
+        The redirect is a body-less response, so no page is downloaded or parsed.
+        """
+
+        from requests.exceptions import RequestException
+
+        try:
+            result = self.session.head(
+                self._latest_release_url(), allow_redirects=False
+            )
+        except RequestException:
+            return None
+
+        return self._parse_latest_release_location(result.headers.get("Location"))
+
+    def _latest_release_url(self) -> str:
+        """
+        Return the url that redirects to the latest release.
+        """
+
+        return self._releases_url() + "/latest"
+
+    def _releases_url(self) -> str:
+        """
+        Return the releases page url.
+        """
+
+        return self.__base_url + constants.GECKODRIVER_RELEASES_PATH
+
+    def _parse_latest_release_location(self, location: str):
+        """
+        Return the version from a .../releases/tag/v<version> location, or None.
+
+        :param location: Location header.
+        """
+
+        if not location:
+            return None
 
-        soup = BeautifulSoup(result.content, "html.parser")
+        match = re.search(r"/releases/tag/v?([^/?#]+)/?$", location)
+        if match and self._check_if_version_format_is_valid(match.group(1)):
+            return match.group(1)
+
+        return None
+
+    def _parse_latest_version(self, content: bytes) -> str:
+        """
+        Return the latest version from the releases page.
+
+        :param content: Releases page HTML.
+        """
+
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(content, "html.parser")
         anchor = soup.select_one(constants.CSS_SELECTOR_LATEST_VERSION)
-        version = anchor.text.strip()
+        version = anchor.text.strip() if anchor else ""
 
-        if self.__check_if_version_format_is_valid(version):
+        if version and self._check_if_version_format_is_valid(version):
             return version
 
         raise UnknownVersionError("Could not find version.")
 
-    def latest_version_url(self) -> str:
+    def latest_version_url(self, refresh: bool = False) -> str:
         """
         Return the latest version url.
+
+        :param refresh: Bypass the metadata cache.
         """
 
-        return self.version_url(self.latest_version())
+        return self.version_url(self.latest_version(refresh=refresh), refresh=refresh)
 
-    def version_url(self, version: str) -> str:
+    def version_url(self, version: str, refresh: bool = False) -> str:
         """
         Return the version download url.
 
         :param version: Geckodriver version.
+        :param refresh: Bypass the metadata cache and fetch the release assets again.
         """
 
-        if not self.__check_if_version_format_is_valid(version):
+        if not self._check_if_version_format_is_valid(version):
             raise UnknownVersionError("Invalid version format.")
 
-        if self.__os_platform == OsPlatform.win:
-            # 64bit
-            if self.__arch == 64:
-                try:
-                    url = f"{constants.DOWNLOAD_URL.format(version, version, Platform.win64.value)}{self.__zip_ext}"
-                    if self.__check_if_url_is_valid(url):
-                        return url
-                except (Exception,):
-                    # No 64 bit, get 32 bit
-                    pass
-
-            # 32bit
-            url = f"{constants.DOWNLOAD_URL.format(version, version, Platform.win32.value)}{self.__zip_ext}"
-            if self.__check_if_url_is_valid(url):
+        key = self._version_url_key(version)
+        return self._coalesce(
+            key, lambda: self.__version_url(version, refresh), refresh
+        )
+
+    def __version_url(self, version: str, refresh: bool = False) -> str:
+        """
+        Return the version download url from the metadata cache or from the release assets.
+
+        :param version: Geckodriver version.
+        :param refresh: Bypass the metadata cache.
+        """
+
+        key = self._version_url_key(version)
+        url = self._cache_get(key, refresh)
+        if url:
+            return url
+
+        assets = self.release_assets(version, refresh=refresh)
+        if assets is None:
+            url = self.__probe_version_url(version)
+        else:
+            url = self._select_version_url(version, assets)
+        self._cache_set(key, url)
+
+        return url
+
+    def release_assets(self, version: str, refresh: bool = False):
+        """
+        Return the asset names of a release, fetched once per release with one request and
+        kept in memory and in the metadata cache.
+        Return None if the assets page is not available or lists no assets, e.g. for an
+        unknown release, on a mirror that only has the download urls or after a markup
+        change, so the download urls are probed instead.
+
+        :param version: Geckodriver version.
+        :param refresh: Bypass the cached asset table.
+        """
+
+        key = self._release_assets_key(version)
+        return self._coalesce(
+            key, lambda: self.__release_assets(version, refresh), refresh
+        )
+
+    def __release_assets(self, version: str, refresh: bool = False):
+        """
+        Return the asset names of a release from the metadata cache or from its assets page.
+
+        :param version: Geckodriver version.
+        :param refresh: Bypass the metadata cache.
+        """
+
+        from requests.exceptions import RequestException
+
+        key = self._release_assets_key(version)
+        assets = self._cache_get(key, refresh)
+        if assets is not None:
+            return assets
+
+        try:
+            response = self.session.get(self._release_assets_url(version))
+        except RequestException:
+            return None
+        if not response.ok:
+            return None
+        assets = self._parse_release_assets(response.content, version)
+        if not assets:
+            return None
+        self._cache_set(key, assets)
+
+        return assets
+
+    def _release_assets_url(self, version: str) -> str:
+        """
+        Return the url of the assets page of a release.
+
+        :param version: Geckodriver version.
+        """
+
+        return self.__base_url + constants.EXPANDED_ASSETS_PATH.format(version)
+
+    def _release_assets_key(self, version: str) -> str:
+        """
+        Return the metadata cache key of the asset names of a release.
+
+        :param version: Geckodriver version.
+        """
+
+        return f"release_assets-{version}"
+
+    def _parse_release_assets(self, content: bytes, version: str) -> list:
+        """
+        Return the asset names linked on the assets page of a release.
+
+        :param content: Assets page.
+        :param version: Geckodriver version.
+        """
+
+        from bs4 import BeautifulSoup
+
+        prefix = constants.GECKODRIVER_RELEASES_PATH + f"/download/v{version}/"
+        soup = BeautifulSoup(content, "html.parser")
+        assets = []
+        for element in soup.select("a[href]"):
+            path = urlparse(element["href"]).path
+            if path.startswith(prefix):
+                name = path[len(prefix) :]
+                if name and name not in assets:
+                    assets.append(name)
+
+        return assets
+
+    def _select_version_url(self, version: str, assets: list) -> str:
+        """
+        Return the first download url of a version whose asset is in the release.
+
+        :param version: Geckodriver version.
+        :param assets: Asset names of the release.
+        """
+
+        for url in self._version_url_candidates(version):
+            if url.split("/")[-1] in assets:
                 return url
 
+        raise VersionUrlError(f"Could not find download url for version {version}.")
+
+    def __probe_version_url(self, version: str) -> str:
+        """
+        Probe the download urls of a version and return the first that exists.
+
+        :param version: Geckodriver version.
+        """
+
+        from requests.exceptions import RequestException
+
+        urls = self._version_url_candidates(version)
+        for url in urls[:-1]:
+            try:
+                if self.__check_if_url_is_valid(url):
+                    return url
+            except RequestException:
+                # No 64 bit, get 32 bit
+                pass
+
+        if self.__check_if_url_is_valid(urls[-1]):
+            return urls[-1]
+
+        raise VersionUrlError(f"Could not find download url for version {version}.")
+
+    def _version_url_candidates(self, version: str) -> list:
+        """
+        Return the possible download urls of a version, in the order they should be tried.
+
+        :param version: Geckodriver version.
+        """
+
+        if self.__os_platform == OsPlatform.win:
+            platforms = [Platform.win64, Platform.win32]
         elif self.__os_platform == OsPlatform.linux:
-            # 64bit
-            if self.__arch == 64:
-                try:
-                    url = f"{constants.DOWNLOAD_URL.format(version, version, Platform.linux64.value)}{self.__tar_gz_ext}"
-                    if self.__check_if_url_is_valid(url):
-                        return url
-                except (Exception,):
-                    # No 64 bit, get 32 bit
-                    pass
-
-            # 32bit
-            url = f"{constants.DOWNLOAD_URL.format(version, version, Platform.linux32.value)}{self.__tar_gz_ext}"
-            if self.__check_if_url_is_valid(url):
+            platforms = [Platform.linux64, Platform.linux32]
+        elif self.__os_platform == OsPlatform.mac:
+            platforms = [Platform.macos_aarch64, Platform.macos]
+        else:
+            raise UnknownPlatformError("Unknown OS platform.")
+
+        if self.__arch != 64:
+            # No 64 bit
+            platforms = platforms[1:]
+
+        return [self.platform_url(version, platform) for platform in platforms]
+
+    def platform_url(self, version: str, platform: Platform) -> str:
+        """
+        Return the download url of a version for a release asset platform.
+        The url is constructed, not checked.
+
+        :param version: Geckodriver version.
+        :param platform: Release asset platform, e.g. Platform.linux64.
+        """
+
+        if not self._check_if_version_format_is_valid(version):
+            raise UnknownVersionError("Invalid version format.")
+
+        if platform.value.startswith(Platform.win.value):
+            ext = self.__zip_ext
+        else:
+            ext = self.__tar_gz_ext
+
+        download_url = self.__base_url + constants.DOWNLOAD_PATH
+        return f"{download_url.format(version, version, platform.value)}{ext}"
+
+    def resolve_many(
+        self,
+        versions: list,
+        platforms: list,
+        refresh: bool = False,
+        workers: int = None,
+    ) -> dict:
+        """
+        Return the download urls of every version x platform combination.
+        Duplicates are looked up once, the asset names of each release are fetched with one
+        request shared by all platforms, and the requests run concurrently over the session's
+        connection pool. Releases without an assets page fall back to one HEAD request per url.
+        Return the url of every key (<version>/<platform>) that was found, the version each
+        requested version or specifier resolved to, and the error message of every key
+        that failed, instead of raising on the first error.
+
+        :param versions: Geckodriver versions or version specifiers.
+        :param platforms: Release asset platforms, e.g. [Platform.linux64, Platform.win64].
+        :param refresh: Bypass the metadata cache.
+        :param workers: Maximum number of concurrent requests, defaults to the pool size.
+        """
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        result = {"urls": {}, "versions": {}, "errors": {}}
+        platforms = list(dict.fromkeys(platforms))
+
+        for version in dict.fromkeys(versions):
+            try:
+                result["versions"][version] = (
+                    version
+                    if self._check_if_version_format_is_valid(version)
+                    else self.resolve(version, refresh=refresh)
+                )
+            except GetGeckoDriverError as err:
+                for platform in platforms:
+                    result["errors"][f"{version}/{platform.value}"] = str(err)
+
+        with ThreadPoolExecutor(max_workers=workers or self.__pool_size) as executor:
+            releases = list(dict.fromkeys(result["versions"].values()))
+            assets = dict(
+                zip(
+                    releases,
+                    executor.map(
+                        lambda release: self.release_assets(release, refresh), releases
+                    ),
+                )
+            )
+
+            def platform_url(job: tuple):
+                release, platform = job
+                url = self.platform_url(release, platform)
+                if assets[release] is None:
+                    found = self.__check_if_url_is_valid(url)
+                else:
+                    found = url.split("/")[-1] in assets[release]
+                if not found:
+                    raise VersionUrlError(
+                        f"Could not find download url for version {release} "
+                        f"and platform {platform.value}."
+                    )
                 return url
 
-        elif self.__os_platform == OsPlatform.mac:
-            # 64bit
-            if self.__arch == 64:
+            jobs = [
+                (release, platform) for release in releases for platform in platforms
+            ]
+            futures = {job: executor.submit(platform_url, job) for job in jobs}
+
+        from requests.exceptions import RequestException
+
+        for version, release in result["versions"].items():
+            for platform in platforms:
+                key = f"{version}/{platform.value}"
                 try:
-                    url = f"{constants.DOWNLOAD_URL.format(version, version, Platform.macos.value)}-aarch64{self.__tar_gz_ext}"
-                    if self.__check_if_url_is_valid(url):
-                        return url
-                except (Exception,):
-                    # No 64 bit, get 32 bit
-                    pass
-
-            # 32bit
-            url = f"{constants.DOWNLOAD_URL.format(version, version, Platform.macos.value)}{self.__tar_gz_ext}"
-            if self.__check_if_url_is_valid(url):
-                return url
+                    result["urls"][key] = futures[(release, platform)].result()
+                except (GetGeckoDriverError, RequestException) as err:
+                    result["errors"][key] = str(err)
 
-        raise VersionUrlError(f"Could not find download url for version {version}.")
+        return result
+
+    def _sha256_key(self, url: str) -> str:
+        """
+        Return the metadata cache key of the recorded SHA-256 of a release asset.
+
+        :param url: Download url.
+        """
+
+        return "sha256-" + url.split("/")[-1]
+
+    def _version_url_key(self, version: str) -> str:
+        """
+        Return the metadata cache key of a version url.
+
+        :param version: Geckodriver version.
+        """
+
+        return f"version_url-{version}-{self.__os_platform.value}-{self.__arch}"
 
     def download_latest_version(
-        self, output_path: str = None, extract: bool = False
+        self,
+        output_path: str = None,
+        extract: bool = False,
+        stream: bool = False,
+        connections: int = 1,
+        progress=None,
     ) -> str:
         """
         Download the latest geckodriver version.
 
         :param output_path: Path to download the driver to.
         :param extract: Extract the downloaded driver or not.
+        :param stream: Extract the driver while downloading, without writing the archive to disk.
+        :param connections: Number of parallel range requests for the archive download.
+        :param progress: Called like in download_version.
         """
 
         version = self.latest_version()
         output_path = self.download_version(
-            version=version, output_path=output_path, extract=extract
+            version=version,
+            output_path=output_path,
+            extract=extract,
+            stream=stream,
+            connections=connections,
+            progress=progress,
         )
 
         return output_path
 
     def download_version(
-        self, version: str, output_path: str = None, extract: bool = False
+        self,
+        version: str,
+        output_path: str = None,
+        extract: bool = False,
+        stream: bool = False,
+        connections: int = 1,
+        sha256: str = None,
+        progress=None,
     ) -> str:
         """
         Download a geckodriver version.
-
-        :param version: Geckodriver version.
+        An interrupted download is resumed from the bytes that were already written.
+        Concurrent downloads into the same output_path, also from other processes, are
+        single-flight: one downloads, the others wait and reuse its result.
+        The SHA-256 of the archive is computed while it is downloaded and checked before
+        extraction, against sha256 or else against the digest recorded in the metadata cache
+        by an earlier download of the same archive.
+
+        :param version: Geckodriver version, or a version specifier like "~=0.34".
         :param output_path: Path to download the driver to.
         :param extract: Extract the downloaded driver or not.
+        :param stream: Extract the driver while downloading, without writing the archive to disk.
+        :param connections: Number of parallel range requests for the archive download.
+        :param sha256: Expected SHA-256 of the archive.
+        :param progress: Called after every downloaded chunk with the bytes downloaded so far,
+            the total bytes (None if unknown) and the average bytes per second.
         """
 
-        if not self.__check_if_version_format_is_valid(version):
-            raise UnknownVersionError("Invalid version format.")
+        output_path, _ = self.__download_version(
+            version, output_path, extract, stream, connections, sha256, progress
+        )
+
+        return output_path
+
+    def __download_version(
+        self,
+        version: str,
+        output_path: str,
+        extract: bool,
+        stream: bool,
+        connections: int,
+        sha256: str,
+        progress=None,
+    ) -> tuple:
+        """
+        Download a geckodriver version like download_version.
+        Return the output path and the SHA-256 digests of the archive ("archive") and, when
+        streamed, the driver ("member"), which are empty if another process downloaded it.
+        """
+
+        if not self._check_if_version_format_is_valid(version):
+            version = self.resolve(version)
 
         if not output_path:
             # on path is None, the driver will be downloaded at e.g. geckodriver/0.29.0/bin/geckodriver.exe
             output_path = self._output_path(version)
 
+        from requests.exceptions import HTTPError
+        from requests.exceptions import RequestException
+
+        digests = {}
+
         def download(download_url: str):
+            key = self._sha256_key(download_url)
+            expected_sha256 = sha256 or self._cache_get(key, stale=True)
+
+            # Download and extract only the driver
+            if extract and stream:
+                try:
+                    downloader.download_member(
+                        url=download_url,
+                        member=self.driver_filename(),
+                        output_path=output_path,
+                        session=self.session,
+                        sha256=expected_sha256,
+                        digests=digests,
+                        observer=self.__observer,
+                        progress=progress,
+                        rate_limiter=self.__rate_limiter,
+                    )
+                except (OSError, HTTPError, RequestException) as err:
+                    raise DownloadError(err)
+                self._cache_set(key, digests["archive"])
+                return
+
             # Download
             try:
                 output_path_with_file_name, file_name = downloader.download(
-                    url=download_url, output_path=output_path
+                    url=download_url,
+                    output_path=output_path,
+                    session=self.session,
+                    connections=connections,
+                    sha256=expected_sha256,
+                    digests=digests,
+                    observer=self.__observer,
+                    progress=progress,
+                    rate_limiter=self.__rate_limiter,
                 )
             except (OSError, HTTPError, RequestException) as err:
                 raise DownloadError(err)
+            self._cache_set(key, digests["archive"])
 
-            # Extract
+            # Extract only the driver
             if extract:
-                if self.__os_platform == OsPlatform.win:
-                    with zipfile.ZipFile(output_path_with_file_name, "r") as zip_ref:
-                        zip_ref.extractall(path=output_path)
-                else:
-                    with tarfile.open(output_path_with_file_name, "r:gz") as tar_gz_ref:
-                        tar_gz_ref.extractall(path=output_path)
+                extract_start = time.perf_counter()
+                file_path = os.path.join(output_path, self.driver_filename())
+                try:
+                    with open(output_path_with_file_name, "rb") as archive:
+                        digests["member"] = downloader.extract_member(
+                            archive,
+                            file_name,
+                            self.driver_filename(),
+                            file_path + ".part",
+                        )
+                    os.replace(file_path + ".part", file_path)
+                except OSError as err:
+                    if os.path.exists(file_path + ".part"):
+                        os.remove(file_path + ".part")
+                    raise DownloadError(err)
+                observers.emit(
+                    self.__observer,
+                    "extract",
+                    archive=file_name,
+                    member=self.driver_filename(),
+                    seconds=time.perf_counter() - extract_start,
+                )
                 os.remove(output_path_with_file_name)
-                if (
-                    self.__os_platform == OsPlatform.linux
-                    or self.__os_platform == OsPlatform.mac
-                ):
-                    os.chmod(output_path + "/" + "geckodriver", 0o755)
 
         url = self.version_url(version)
-        download(download_url=url)
+        started = time.time()
+        with self._lock(output_path) as lock:
+            if not (
+                lock.waited and self._is_downloaded(url, output_path, extract, started)
+            ):
+                download(download_url=url)
 
-        return output_path
+        return output_path, digests
+
+    def clear_cache(self):
+        """
+        Remove all cached metadata.
+        """
+
+        if self.__cache:
+            self.__cache.clear()
+            MEMO.clear()
+
+    def _cache_get(self, key: str, refresh: bool = False, stale: bool = False):
+        """
+        Return a value from the metadata cache.
+
+        :param key: Cache key.
+        :param refresh: Ignore the cached value.
+        :param stale: Also return a value that is older than the cache ttl.
+        """
+
+        if not self.__cache or refresh:
+            return None
+
+        value = MEMO.get(self.__memo_key(key))
+        if value is None:
+            value = self.__cache.get(self.__cache_key(key), stale=stale)
+        observers.emit(self.__observer, "cache", key=key, hit=value is not None)
+
+        return value
+
+    def _cache_set(self, key: str, value):
+        """
+        Store a value in the metadata cache.
+
+        :param key: Cache key.
+        :param value: Value.
+        """
+
+        if self.__cache:
+            self.__cache.set(self.__cache_key(key), value)
+            MEMO.set(self.__memo_key(key), value, self.__cache_ttl)
+
+    def __conditional_get(self, url: str, parse):
+        """
+        Fetch a metadata page and return its parse result, or None if the response is not ok.
+        The ETag and Last-Modified validators of the last response are sent along, and a
+        304 Not Modified answer reuses the parse result stored with them.
+
+        :param url: Url of the page.
+        :param parse: Function that parses the page content.
+        """
+
+        key = self._conditional_key(url)
+        entry = self._cache_get(key, stale=True)
+        response = self.session.get(url, headers=self._conditional_headers(entry))
+        if response.status_code == 304 and entry:
+            return entry["value"]
+        if not response.ok:
+            return None
+
+        value = parse(response.content)
+        self._conditional_set(key, response.headers, value)
+
+        return value
+
+    def _conditional_key(self, url: str) -> str:
+        """
+        Return the metadata cache key of the validators and parse result of a page.
+
+        :param url: Url of the page.
+        """
+
+        if url.startswith(self.__base_url):
+            url = url[len(self.__base_url) :]
+
+        return "conditional-" + url
+
+    def _conditional_headers(self, entry) -> dict:
+        """
+        Return the request headers that make a request conditional on the stored validators.
+
+        :param entry: Stored validators and parse result, or None.
+        """
+
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+        return headers
+
+    def _conditional_set(self, key: str, headers, value):
+        """
+        Store the validators of a response with the parse result of its content.
+        Nothing is stored if the response has no validators.
+
+        :param key: Metadata cache key.
+        :param headers: Response headers.
+        :param value: Parse result.
+        """
+
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if etag or last_modified:
+            self._cache_set(
+                key, {"etag": etag, "last_modified": last_modified, "value": value}
+            )
+
+    def _coalesce(self, key: str, func, refresh: bool = False):
+        """
+        Call func, unless an identical lookup is already in flight in another thread,
+        then wait for it and return its result.
+
+        :param key: Cache key of the looked up value.
+        :param func: Function without arguments that looks up the value.
+        :param refresh: The lookup bypasses the cache, only join other refreshing lookups.
+        """
+
+        key = self.__memo_key(key) + ("-refresh" if refresh else "")
+        return MEMO.call(key, func)
+
+    def __cache_key(self, key: str) -> str:
+        """
+        Return the cache key of the base url, so metadata of different hosts is kept apart.
+
+        :param key: Cache key.
+        """
+
+        if self.__base_url == constants.GITHUB_URL:
+            return key
+
+        return f"{key}-{self.__base_url}"
+
+    def __memo_key(self, key: str) -> str:
+        """
+        Return the memo key, so instances with another base url, cache directory or cache ttl
+        are kept apart.
+
+        :param key: Cache key.
+        """
+
+        cache_path = self.__cache.path if self.__cache else ""
+        return f"{key}-{self.__base_url}-{cache_path}-{self.__cache_ttl}"
 
     def __check_if_url_is_valid(self, url: str) -> bool:
         """
@@ -211,13 +887,13 @@ class GetGeckoDriver:
         :param url: The driver download url.
         """
 
-        status_code = requests.head(url).status_code
+        status_code = self.session.head(url).status_code
         if status_code == 302 or status_code == 200:
             return True
 
         return False
 
-    def __check_if_version_format_is_valid(self, version: str) -> bool:
+    def _check_if_version_format_is_valid(self, version: str) -> bool:
         """
         Check if version format is valid.
 
@@ -243,19 +919,187 @@ class GetGeckoDriver:
 
         return True
 
-    def install(self, output_path: str = None) -> str:
+    def install(
+        self,
+        output_path: str = None,
+        version: str = None,
+        check_latest: bool = True,
+        sha256: str = None,
+        prepend_path: bool = False,
+        progress=None,
+    ) -> str:
         """
-        Install the latest GeckoDriver version.
+        Install the latest GeckoDriver version, or a pinned version, and add its path to PATH.
+        If a valid driver of that version is already installed, nothing is downloaded.
+        The driver is downloaded into a staging directory and moved into place, so an
+        interrupted install never leaves a partial driver behind.
+
+        :param output_path: Path to install the driver to.
+        :param version: Geckodriver version, or a version specifier like ">=0.33,<0.35",
+            defaults to the latest version.
+        :param check_latest: Resolve the latest version (through the metadata cache).
+            If False, the newest driver that is already installed (and matches the version
+            specifier) is used when there is one, without any network request.
+        :param sha256: Expected SHA-256 of the release archive.
+        :param prepend_path: Put the driver path at the front of PATH instead of the back.
+            The path is only added once, however often install is called.
+        :param progress: Called like in download_version.
         """
 
-        if output_path:
-            self.download_version(
-                self.latest_version(), output_path=output_path, extract=True
+        if version and not self._check_if_version_format_is_valid(version):
+            specifier = VersionSpecifier(version)
+            installed_version = None
+            if not check_latest:
+                installed_version = self._installed_version(output_path, specifier)
+            version = installed_version or self.resolve(version)
+
+        if not version and not check_latest:
+            version = self._installed_version(output_path)
+
+        if not version:
+            version = self.latest_version()
+
+        if not output_path:
+            output_path = self._output_path(version)
+
+        self.__ensure_installed(version, output_path, sha256, progress)
+
+        return self._register(output_path, prepend_path)
+
+    def prefetch(self, version: str = None, refresh: bool = False) -> bool:
+        """
+        Download and extract a version into the default <version>/bin layout, unless it is
+        there already, so a later install() finds it ready. PATH is not changed.
+        Return True if the driver was downloaded.
+
+        :param version: Geckodriver version or version specifier, defaults to the latest version.
+        :param refresh: Bypass the metadata cache to find the latest version.
+        """
+
+        if not version:
+            version = self.latest_version(refresh=refresh)
+        elif not self._check_if_version_format_is_valid(version):
+            version = self.resolve(version, refresh=refresh)
+
+        return self.__ensure_installed(version, self._output_path(version))
+
+    def __ensure_installed(
+        self, version: str, output_path: str, sha256: str = None, progress=None
+    ) -> bool:
+        """
+        Install a version into output_path unless a valid driver of it is there already,
+        also when another process installed it while this one waited for the lock.
+        Return True if the driver was downloaded.
+        """
+
+        if self._is_installed(version, output_path, sha256):
+            return False
+
+        with self._lock(output_path) as lock:
+            if lock.waited and self._is_installed(version, output_path, sha256):
+                return False
+            self.__install(version, output_path, sha256, progress)
+
+        return True
+
+    def __install(self, version: str, output_path: str, sha256: str, progress=None):
+        """
+        Download a driver into a staging directory and move it into output_path.
+
+        :param version: Geckodriver version.
+        :param output_path: Path to install the driver to.
+        :param sha256: Expected SHA-256 of the release archive.
+        :param progress: Download progress callback.
+        """
+
+        stage_path = store.create_stage(output_path)
+        try:
+            _, digests = self.__download_version(
+                version, stage_path, True, True, 1, sha256, progress
             )
+            self._stage_install(stage_path, version, digests)
+            store.commit_install(stage_path, output_path, self.driver_filename())
+        finally:
+            store.remove_stage(stage_path)
+
+    def _stage_install(self, stage_path: str, version: str, digests: dict):
+        """
+        Write the version and record files next to a staged driver.
+
+        :param stage_path: Staging directory with the driver.
+        :param version: Geckodriver version.
+        :param digests: SHA-256 digests of the archive and the driver.
+        """
+
+        store.write_version(stage_path, version)
+        store.write_record(
+            stage_path, self.driver_filename(), digests["member"], digests["archive"]
+        )
+
+    def _lock(self, output_path: str) -> FileLock:
+        """
+        Return the lock that guards downloads into output_path.
+
+        :param output_path: Path of the driver.
+        """
+
+        return FileLock(
+            os.path.join(output_path, constants.LOCK_FILE_NAME),
+            timeout=self.__lock_timeout,
+        )
+
+    def _is_downloaded(
+        self, url: str, output_path: str, extract: bool, since: float
+    ) -> bool:
+        """
+        Check if another process downloaded url into output_path after since.
+
+        :param url: Download url.
+        :param output_path: Path of the driver.
+        :param extract: Check for the extracted driver instead of the archive.
+        :param since: Timestamp the caller started waiting at.
+        """
+
+        if extract:
+            file_path = os.path.join(output_path, self.driver_filename())
+            if not store.is_valid_driver(file_path):
+                return False
         else:
-            output_path = self.download_version(self.latest_version(), extract=True)
+            file_path = os.path.join(output_path, url.split("/")[-1])
+
+        return store.modified_since(file_path, since)
+
+    def _installed_version(
+        self, output_path: str = None, specifier: VersionSpecifier = None
+    ):
+        """
+        Return the newest installed version, or None.
 
-        os.environ["PATH"] += os.pathsep + output_path
+        :param output_path: Path of the driver, defaults to the <version>/bin layout.
+        :param specifier: Only return a version that matches.
+        """
+
+        if output_path:
+            installed_versions = [store.read_version(output_path)]
+        else:
+            installed_versions = store.installed_versions(self.driver_filename())
+
+        for version in installed_versions:
+            if version and (not specifier or specifier.contains(version)):
+                return version
+
+        return None
+
+    def _register(self, output_path: str, prepend: bool = False) -> str:
+        """
+        Add the driver path to PATH, unless it is there already, and return it as an
+        absolute path.
+
+        :param output_path: Path of the driver.
+        :param prepend: Put the driver path at the front of PATH.
+        """
+
+        store.register_path(output_path, prepend)
 
         if not os.path.isabs(output_path):
             output_path = os.path.join(os.path.abspath(os.getcwd()), output_path)
@@ -264,40 +1108,160 @@ class GetGeckoDriver:
 
         return output_path
 
-    def __get_all_geckodriver_versions(self) -> list:
+    def _is_installed(self, version: str, output_path: str, sha256: str = None) -> bool:
         """
-        Return a list with all GeckoDriver versions.
+        Check if a valid, unchanged driver of a version is installed at output_path.
+
+        :param version: Geckodriver version.
+        :param output_path: Path of the driver.
+        :param sha256: Expected SHA-256 of the archive the driver was extracted from.
         """
 
-        def find_versions(param=None):
-            if not param:
-                url = constants.GITHUB_GECKODRIVER_TAGS_URL
-            else:
-                url = constants.GITHUB_GECKODRIVER_TAGS_URL + param
+        if not store.verify_driver(output_path, self.driver_filename()):
+            return False
 
-            response = requests.get(url)
-            if not response.ok:
-                raise GetGeckoDriverError(
-                    f"Could not get {constants.GITHUB_GECKODRIVER_TAGS_URL}."
-                )
-            soup = BeautifulSoup(response.content, "html.parser")
-            box = soup.select_one("div.Box:nth-child(2)")
+        if sha256:
+            record = store.read_record(output_path, self.driver_filename())
+            if not record or record.get("archive_sha256") != sha256.lower():
+                return False
+
+        if output_path == self._output_path(version):
+            return True
 
-            versions = []
-            for element in box.select(".d-flex > h4 > a"):
-                versions.append(element.text.strip())
+        return store.read_version(output_path) == version
 
-            if len(versions) == 10:
-                versions += find_versions("?after=" + versions[-1])
+    def versions(self, refresh: bool = False) -> list:
+        """
+        Return all GeckoDriver versions, newest first.
+        The versions are kept in a persistent index in the metadata cache. When the index is
+        stale, or on refresh, only the tags that are newer than the newest known tag are fetched.
+
+        :param refresh: Fetch new tags even if the index is not stale.
+        """
 
+        key = "versions"
+        versions = self._cache_get(key, refresh)
+        if versions:
             return versions
 
-        all_versions = find_versions()
-        for index, version in enumerate(all_versions):
-            if version[:1] == "v":
-                all_versions[index] = version[1:]
+        known = set(self._cache_get(key, stale=True) or [])
+        new_versions = self.__fetch_versions_until(known)
+        versions = sorted(set(new_versions) | known, key=version_key, reverse=True)
+        self._cache_set(key, versions)
+
+        return versions
+
+    def resolve(self, spec: str, refresh: bool = False) -> str:
+        """
+        Return the newest version that matches a version specifier, e.g. ">=0.33,<0.35",
+        "~=0.34", "==0.32.*", "latest-patch-of 0.34" or "latest".
+        Ranges are looked up in the version index, so a warm index needs no network request.
+        If nothing matches, the index is refreshed once for releases that are not in it yet.
+
+        :param spec: Version specifier.
+        :param refresh: Refresh the version index first.
+        """
+
+        specifier = VersionSpecifier(spec)
+        if specifier.latest:
+            return self.latest_version(refresh=refresh)
+
+        version = self._version_index(self.versions(refresh)).select(specifier)
+        if not version and not refresh:
+            version = self._version_index(self.versions(refresh=True)).select(specifier)
+        if not version:
+            raise UnknownVersionError(f"No version matches {spec!r}.")
+
+        return version
+
+    def _version_index(self, versions: list) -> VersionIndex:
+        """
+        Return the sorted version index of versions, rebuilt only when the versions changed.
+
+        :param versions: All versions, newest first.
+        """
+
+        if not self.__version_index or self.__version_index[0] != versions:
+            self.__version_index = (versions, VersionIndex(versions))
+
+        return self.__version_index[1]
+
+    def __fetch_versions_until(self, known: set) -> list:
+        """
+        Walk the tags pages, newest first, until a known version is reached, a page is
+        empty or a page has no tags that were not seen yet, e.g. on a mirror that
+        ignores ?after=.
+        Return the versions that were not known.
+
+        :param known: Versions in the index.
+        """
+
+        url = self._tags_url()
+        versions = []
+        seen = set()
+        while url:
+            tags = self.__conditional_get(url, self._parse_tags)
+            if tags is None:
+                raise GetGeckoDriverError(f"Could not get {self._tags_url()}.")
+            url = self._next_tags_url(tags, known, seen, versions)
+
+        return versions
+
+    def _tags_url(self) -> str:
+        """
+        Return the url of the first tags page.
+        """
+
+        return self.__base_url + constants.GECKODRIVER_TAGS_PATH
+
+    def _next_tags_url(self, tags: list, known: set, seen: set, versions: list):
+        """
+        Add the versions of a tags page that are not known to versions, and return the
+        url of the next tags page, or None when the walk is done.
+
+        :param tags: Tag names on the page.
+        :param known: Versions in the index.
+        :param seen: Tags on the earlier pages, updated with the tags of this page.
+        :param versions: Versions that were not known, newest first.
+        """
+
+        new_tags = [tag for tag in tags if tag not in seen]
+        if not new_tags:
+            return None
+        seen.update(new_tags)
+
+        for tag in new_tags:
+            version = tag[1:] if tag[:1] == "v" else tag
+            if version in known:
+                return None
+            if self._check_if_version_format_is_valid(version):
+                versions.append(version)
+
+        return self._tags_url() + "?after=" + tags[-1]
+
+    def _parse_tags(self, content: bytes) -> list:
+        """
+        Return the tag names on a tags page, in page order.
+
+        :param content: Tags page.
+        """
+
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(content, "html.parser")
+        prefix = constants.GECKODRIVER_RELEASES_PATH + "/tag/"
+        tags = []
+        for element in soup.select("a[href]"):
+            href = element["href"]
+            if href.startswith(self.__base_url):
+                href = href[len(self.__base_url) :]
+            if href.startswith(prefix):
+                tag = href[len(prefix) :].strip("/")
+                # Every tag is linked more than once
+                if tag and tag not in tags:
+                    tags.append(tag)
 
-        return all_versions
+        return tags
 
     def _output_path(self, version: str) -> str:
         """
@@ -306,4 +1270,4 @@ class GetGeckoDriver:
         :param version: Geckodriver version.
         """
 
-        return f"geckodriver/{version}/bin"
+        return f"{constants.STORE_DIR}/{version}/bin"
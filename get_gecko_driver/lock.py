@@ -0,0 +1,179 @@
+import os
+import socket
+import threading
+import time
+import uuid
+
+from get_gecko_driver import constants
+from get_gecko_driver.exceptions import LockTimeoutError
+
+
+class FileLock:
+    def __init__(
+        self,
+        path: str,
+        timeout: float = constants.LOCK_TIMEOUT,
+        stale_after: float = constants.LOCK_STALE_AFTER,
+        heartbeat: bool = True,
+    ):
+        """
+        Cross-process lock backed by a lock file that is created exclusively.
+        The holder touches the lock file while it holds it (heartbeat), so a lock file that
+        has not been touched for stale_after seconds, or whose process no longer runs on
+        this host, is considered stale and is taken over.
+
+        :param path: Lock file path.
+        :param timeout: Seconds to wait for the lock before LockTimeoutError is raised.
+        :param stale_after: Seconds after which an untouched lock file is stale.
+        :param heartbeat: Touch the lock file from a background thread while it is held.
+        """
+
+        self.__path = path
+        self.__timeout = timeout
+        self.__stale_after = stale_after
+        self.__heartbeat = heartbeat
+        self.__token = None
+        self.__stop = threading.Event()
+        self.__thread = None
+        self.waited = False
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *args):
+        self.release()
+
+    @property
+    def path(self) -> str:
+        return self.__path
+
+    @property
+    def timeout(self) -> float:
+        return self.__timeout
+
+    def acquire(self, blocking: bool = True) -> bool:
+        """
+        Acquire the lock. Set waited if another process held it in the meantime.
+
+        :param blocking: Wait for the lock, else return False at once if it is held.
+        """
+
+        deadline = time.time() + self.__timeout
+        while True:
+            if self.__try_acquire():
+                return True
+            self.waited = True
+            if not blocking:
+                return False
+            if time.time() > deadline:
+                raise LockTimeoutError(f"Timed out waiting for lock {self.__path}.")
+            time.sleep(constants.LOCK_POLL_INTERVAL)
+
+    def release(self):
+        """
+        Release the lock if it is held.
+        """
+
+        if self.__token is None:
+            return
+
+        self.__stop.set()
+        if self.__thread:
+            self.__thread.join()
+            self.__thread = None
+        if self.__read_token() == self.__token:
+            try:
+                os.remove(self.__path)
+            except OSError:
+                pass
+        self.__token = None
+
+    def __try_acquire(self) -> bool:
+        """
+        Create the lock file, taking over a stale one.
+        """
+
+        os.makedirs(os.path.dirname(self.__path) or ".", exist_ok=True)
+        token = f"{socket.gethostname()} {os.getpid()} {uuid.uuid4().hex}"
+        try:
+            fd = os.open(self.__path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            self.__remove_if_stale()
+            return False
+
+        with os.fdopen(fd, "w") as file:
+            file.write(token)
+        self.__token = token
+
+        if self.__heartbeat:
+            self.__stop.clear()
+            self.__thread = threading.Thread(target=self.__touch, daemon=True)
+            self.__thread.start()
+
+        return True
+
+    def __remove_if_stale(self):
+        """
+        Remove the lock file if its holder is gone.
+        """
+
+        token = self.__read_token()
+        try:
+            age = time.time() - os.path.getmtime(self.__path)
+        except OSError:
+            return
+
+        stale = age > self.__stale_after
+        if not stale and token:
+            host, pid = (token.split(" ") + ["", ""])[:2]
+            # Only processes on this host can be checked
+            if host == socket.gethostname() and pid.isdigit():
+                stale = not self.__is_running(int(pid))
+
+        # Make sure the lock file was not replaced by a new holder in the meantime
+        if stale and self.__read_token() == token:
+            try:
+                os.remove(self.__path)
+            except OSError:
+                pass
+
+    def __read_token(self):
+        """
+        Return the token of the current holder.
+        """
+
+        try:
+            with open(self.__path, "r") as file:
+                return file.read()
+        except OSError:
+            return None
+
+    def __touch(self):
+        """
+        Keep the lock file fresh while the lock is held.
+        """
+
+        while not self.__stop.wait(self.__stale_after / 3):
+            try:
+                os.utime(self.__path)
+            except OSError:
+                pass
+
+    @staticmethod
+    def __is_running(pid: int) -> bool:
+        """
+        Check if a process runs. On Windows processes can not be checked without side effects.
+        """
+
+        if os.name != "posix":
+            return True
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except OSError:
+            # Exists, but owned by another user
+            return True
+
+        return True
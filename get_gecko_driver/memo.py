@@ -0,0 +1,144 @@
+import threading
+import time
+from collections import OrderedDict
+
+from get_gecko_driver import constants
+
+
+class _Call:
+    def __init__(self):
+        """
+        A computation in flight, shared by every caller of the same key.
+        """
+
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class Memo:
+    def __init__(self, max_size: int = constants.MEMO_MAX_SIZE):
+        """
+        Thread-safe in-memory memo with a ttl per entry and a bounded size.
+        Concurrent calls for a key that is not memoized yet are coalesced: one caller
+        computes the value, the others wait for it and share the result or the error.
+
+        :param max_size: Maximum number of entries, the least recently used are evicted.
+        """
+
+        self.__max_size = max_size
+        # Key to (value, expiry), least recently used first
+        self.__entries = OrderedDict()
+        self.__calls = {}
+        self.__lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self.__lock:
+            return len(self.__entries)
+
+    def get(self, key: str):
+        """
+        Return the memoized value of a key, or None if it is missing or expired.
+
+        :param key: Memo key.
+        """
+
+        with self.__lock:
+            return self.__get(key)
+
+    def set(self, key: str, value, ttl: float):
+        """
+        Memoize a value.
+
+        :param key: Memo key.
+        :param value: Value, None is not memoized.
+        :param ttl: Seconds the value is kept.
+        """
+
+        with self.__lock:
+            self.__set(key, value, ttl)
+
+    def call(self, key: str, func, ttl: float = 0, refresh: bool = False):
+        """
+        Return the memoized value of a key, or compute it with func.
+        A caller that arrives while the value is computed waits for that computation.
+
+        :param key: Memo key.
+        :param func: Function without arguments that computes the value.
+        :param ttl: Seconds the computed value is kept, 0 to neither read nor keep
+            memoized values and only coalesce the calls.
+        :param refresh: Ignore the memoized value, but still join a computation in flight.
+        """
+
+        with self.__lock:
+            value = None if refresh or ttl <= 0 else self.__get(key)
+            if value is not None:
+                return value
+            call = self.__calls.get(key)
+            owner = call is None
+            if owner:
+                call = self.__calls[key] = _Call()
+
+        if not owner:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = func()
+        except BaseException as err:
+            call.error = err
+            raise
+        finally:
+            with self.__lock:
+                if call.error is None and ttl > 0:
+                    self.__set(key, call.value, ttl)
+                del self.__calls[key]
+            call.done.set()
+
+        return call.value
+
+    def delete(self, key: str):
+        """
+        Forget a key.
+
+        :param key: Memo key.
+        """
+
+        with self.__lock:
+            self.__entries.pop(key, None)
+
+    def clear(self):
+        """
+        Forget all keys.
+        """
+
+        with self.__lock:
+            self.__entries.clear()
+
+    def __get(self, key: str):
+        entry = self.__entries.get(key)
+        if entry is None:
+            return None
+        value, expiry = entry
+        if time.monotonic() >= expiry:
+            del self.__entries[key]
+            return None
+
+        self.__entries.move_to_end(key)
+        return value
+
+    def __set(self, key: str, value, ttl: float):
+        if value is None or ttl <= 0:
+            self.__entries.pop(key, None)
+            return
+
+        self.__entries[key] = (value, time.monotonic() + ttl)
+        self.__entries.move_to_end(key)
+        while len(self.__entries) > self.__max_size:
+            self.__entries.popitem(last=False)
+
+
+# Shared by every GetGeckoDriver in the process
+MEMO = Memo()
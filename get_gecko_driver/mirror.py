@@ -0,0 +1,173 @@
+import json
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from get_gecko_driver import constants
+from get_gecko_driver import downloader
+from get_gecko_driver.enums import Platform
+from get_gecko_driver.exceptions import DownloadError
+from get_gecko_driver.exceptions import GetGeckoDriverError
+from get_gecko_driver.get_driver import GetGeckoDriver
+
+DEFAULT_PLATFORMS = [
+    Platform.win64,
+    Platform.win32,
+    Platform.linux64,
+    Platform.linux32,
+    Platform.macos,
+    Platform.macos_aarch64,
+]
+
+
+def mirror(
+    versions: list,
+    platforms: list = None,
+    output_path: str = constants.MIRROR_DIR,
+    workers: int = constants.MIRROR_WORKERS,
+    get_driver: GetGeckoDriver = None,
+) -> dict:
+    """
+    Download the release assets of every version x platform combination concurrently.
+    The assets are stored at <output_path>/v<version>/<asset name> and recorded in
+    <output_path>/manifest.json with their size, SHA-256 and source url.
+    Entries that are already in the manifest are skipped.
+    Return the keys (<version>/<platform>) that were downloaded and skipped, and the
+    error message of every key that failed.
+
+    :param versions: Geckodriver versions.
+    :param platforms: Release asset platforms, defaults to DEFAULT_PLATFORMS.
+    :param output_path: Mirror directory.
+    :param workers: Maximum number of concurrent downloads.
+    :param get_driver: GetGeckoDriver whose session and urls are used.
+    """
+
+    platforms = platforms or DEFAULT_PLATFORMS
+    own_get_driver = get_driver is None
+    if own_get_driver:
+        get_driver = GetGeckoDriver(pool_size=max(workers, constants.POOL_SIZE))
+
+    manifest = read_manifest(output_path)
+    manifest_lock = threading.Lock()
+    result = {"downloaded": [], "skipped": [], "errors": {}}
+
+    jobs = []
+    for version in dict.fromkeys(versions):
+        for platform in dict.fromkeys(platforms):
+            key = f"{version}/{platform.value}"
+            if __is_mirrored(output_path, manifest["assets"].get(key)):
+                result["skipped"].append(key)
+            else:
+                jobs.append((key, version, platform))
+
+    def mirror_asset(job: tuple):
+        key, version, platform = job
+        try:
+            url = get_driver.platform_url(version, platform)
+            entry = __download_asset(get_driver, output_path, version, platform, url)
+        except GetGeckoDriverError as err:
+            with manifest_lock:
+                result["errors"][key] = str(err)
+            return
+
+        with manifest_lock:
+            manifest["assets"][key] = entry
+            __write_manifest(output_path, manifest)
+            result["downloaded"].append(key)
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(mirror_asset, jobs))
+    finally:
+        if own_get_driver:
+            get_driver.close()
+
+    return result
+
+
+def read_manifest(output_path: str = constants.MIRROR_DIR) -> dict:
+    """
+    Return the manifest of a mirror directory.
+
+    :param output_path: Mirror directory.
+    """
+
+    try:
+        with open(os.path.join(output_path, constants.MANIFEST_FILE_NAME), "r") as file:
+            manifest = json.load(file)
+    except (OSError, ValueError):
+        return {"assets": {}}
+
+    if not isinstance(manifest, dict) or not isinstance(manifest.get("assets"), dict):
+        return {"assets": {}}
+
+    return manifest
+
+
+def __download_asset(
+    get_driver: GetGeckoDriver,
+    output_path: str,
+    version: str,
+    platform: Platform,
+    url: str,
+) -> dict:
+    """
+    Download one asset and return its manifest entry.
+    """
+
+    from requests.exceptions import HTTPError
+    from requests.exceptions import RequestException
+
+    # The SHA-256 is computed while the asset is written
+    digests = {}
+    try:
+        file_path, file_name = downloader.download(
+            url=url,
+            output_path=os.path.join(output_path, f"v{version}"),
+            session=get_driver.session,
+            digests=digests,
+        )
+    except (OSError, HTTPError, RequestException) as err:
+        raise DownloadError(f"{url}: {err}")
+
+    return {
+        "version": version,
+        "platform": platform.value,
+        "path": f"v{version}/{file_name}",
+        "size": os.path.getsize(file_path),
+        "sha256": digests["archive"],
+        "url": url,
+    }
+
+
+def __is_mirrored(output_path: str, entry: dict) -> bool:
+    """
+    Check if a manifest entry exists and its file is complete.
+    """
+
+    if not entry:
+        return False
+
+    try:
+        return (
+            os.path.getsize(os.path.join(output_path, entry["path"])) == entry["size"]
+        )
+    except (OSError, KeyError, TypeError):
+        return False
+
+
+def __write_manifest(output_path: str, manifest: dict):
+    """
+    Atomically write the manifest of a mirror directory.
+    """
+
+    os.makedirs(output_path, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=output_path, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as file:
+            json.dump(manifest, file, indent=2, sort_keys=True)
+        os.replace(tmp_path, os.path.join(output_path, constants.MANIFEST_FILE_NAME))
+    except BaseException:
+        os.remove(tmp_path)
+        raise
@@ -0,0 +1,172 @@
+import json
+import os
+import tempfile
+import threading
+import time
+
+from get_gecko_driver import constants
+
+
+class Observer:
+    """
+    Receives the events of GetGeckoDriver and the downloader. Override on_event.
+    Every event is a dict with "event" (the event name), "timestamp" and event fields:
+
+    request_start: method, url
+    request_end: method, url, status, bytes (Content-Length), seconds (until the
+        response headers arrived), error
+    retry: method, url, status, error, attempt
+    download: url, bytes, seconds, bytes_per_second, connections
+    extract: archive, member, seconds
+    cache: key, hit
+    refresh: version, downloaded, error
+    """
+
+    def on_event(self, event: dict):
+        pass
+
+
+def emit(observer: Observer, name: str, **fields):
+    """
+    Send an event to an observer, if there is one.
+    """
+
+    if observer is not None:
+        observer.on_event({"event": name, "timestamp": time.time(), **fields})
+
+
+def from_env():
+    """
+    Return the exporter configured with the GET_GECKO_DRIVER_METRICS environment variable,
+    or None. A path ending in .prom gets Prometheus text, any other path JSON lines.
+    """
+
+    path = os.getenv(constants.METRICS_ENV)
+    if not path:
+        return None
+    if path.endswith(".prom"):
+        return PrometheusExporter(path)
+
+    return JsonLinesExporter(path)
+
+
+class JsonLinesExporter(Observer):
+    def __init__(self, path: str):
+        """
+        Append every event as one JSON line to a file.
+
+        :param path: File path.
+        """
+
+        self.path = path
+        self.__lock = threading.Lock()
+
+    def on_event(self, event: dict):
+        line = json.dumps(event, sort_keys=True) + "\n"
+        with self.__lock:
+            try:
+                with open(self.path, "a") as file:
+                    file.write(line)
+            except OSError:
+                pass
+
+
+class PrometheusExporter(Observer):
+    # Metric families and their Prometheus types
+    TYPES = {
+        "request_seconds": "summary",
+        "retries_total": "counter",
+        "download_bytes_total": "counter",
+        "download_seconds": "summary",
+        "extract_seconds": "summary",
+        "cache_lookups_total": "counter",
+    }
+
+    def __init__(self, path: str = None):
+        """
+        Aggregate the events into Prometheus counters and summaries.
+        With a path, the metrics are written to it in the text exposition format after
+        every event, e.g. for the node_exporter textfile collector.
+
+        :param path: File path.
+        """
+
+        self.path = path
+        self.__metrics = {}
+        self.__lock = threading.Lock()
+
+    def on_event(self, event: dict):
+        name = event["event"]
+        with self.__lock:
+            if name == "request_end":
+                labels = {"method": event["method"], "status": event["status"] or ""}
+                self.__observe("request_seconds", labels, event["seconds"])
+            elif name == "retry":
+                self.__add("retries_total", {"method": event["method"]}, 1)
+            elif name == "download":
+                self.__add("download_bytes_total", {}, event["bytes"])
+                self.__observe("download_seconds", {}, event["seconds"])
+            elif name == "extract":
+                self.__observe("extract_seconds", {}, event["seconds"])
+            elif name == "cache":
+                result = "hit" if event["hit"] else "miss"
+                self.__add("cache_lookups_total", {"result": result}, 1)
+            else:
+                return
+
+            if self.path:
+                self.__write(self.__render())
+
+    def render(self) -> str:
+        """
+        Return the metrics in the Prometheus text exposition format.
+        """
+
+        with self.__lock:
+            return self.__render()
+
+    def __add(self, family: str, labels: dict, value: float, suffix: str = ""):
+        key = (family, suffix, tuple(sorted((k, str(v)) for k, v in labels.items())))
+        self.__metrics[key] = self.__metrics.get(key, 0) + value
+
+    def __observe(self, family: str, labels: dict, value: float):
+        self.__add(family, labels, value, "_sum")
+        self.__add(family, labels, 1, "_count")
+
+    def __render(self) -> str:
+        lines = []
+        for family, metric_type in sorted(self.TYPES.items()):
+            samples = [key for key in sorted(self.__metrics) if key[0] == family]
+            if not samples:
+                continue
+            name = constants.METRICS_PREFIX + family
+            lines.append(f"# TYPE {name} {metric_type}")
+            for key in samples:
+                _, suffix, labels = key
+                label_text = ",".join(f'{k}="{self.__escape(v)}"' for k, v in labels)
+                label_text = "{" + label_text + "}" if label_text else ""
+                lines.append(f"{name}{suffix}{label_text} {self.__metrics[key]:g}")
+
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def __escape(value: str) -> str:
+        return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    def __write(self, text: str):
+        """
+        Atomically replace the metrics file.
+        """
+
+        directory = os.path.dirname(self.path) or "."
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w") as file:
+                    file.write(text)
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+        except OSError:
+            pass
@@ -0,0 +1,126 @@
+import random
+import threading
+
+from get_gecko_driver import constants
+from get_gecko_driver import observer as observers
+from get_gecko_driver.exceptions import GetGeckoDriverError
+
+
+class Refresher:
+    def __init__(
+        self,
+        get_driver=None,
+        interval: float = constants.REFRESH_INTERVAL,
+        jitter: float = constants.REFRESH_JITTER,
+        observer: observers.Observer = None,
+    ):
+        """
+        Poll for new releases and prefetch the latest driver into the default
+        <version>/bin layout, so install() finds it ready. Run it in a daemon thread with
+        start(), or in the foreground with run().
+
+        :param get_driver: GetGeckoDriver to poll with, one for the current OS if None.
+        :param interval: Seconds between two polls.
+        :param jitter: Fraction of the interval that is randomly added or subtracted.
+        :param observer: Observer of refresh events, defaults to the exporter set with
+            GET_GECKO_DRIVER_METRICS.
+        """
+
+        if get_driver is None:
+            from get_gecko_driver.get_driver import GetGeckoDriver
+
+            get_driver = GetGeckoDriver()
+
+        self.get_driver = get_driver
+        self.interval = interval
+        self.jitter = jitter
+        self.__observer = observer or observers.from_env()
+        self.__stopped = threading.Event()
+        self.__thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def refresh(self):
+        """
+        Look up the latest version, bypassing the metadata cache, and prefetch it.
+        Return the version if it was downloaded, None if it was there already.
+        """
+
+        version = self.get_driver.latest_version(refresh=True)
+        downloaded = self.get_driver.prefetch(version)
+        observers.emit(
+            self.__observer,
+            "refresh",
+            version=version,
+            downloaded=downloaded,
+            error=None,
+        )
+
+        return version if downloaded else None
+
+    def run(self, once: bool = False, callback=None, on_error=None):
+        """
+        Refresh now and then every interval until stop() is called.
+        A failed refresh is retried at the next poll.
+
+        :param once: Refresh only once.
+        :param callback: Called with the version after every download.
+        :param on_error: Called with the error of every failed refresh.
+        """
+
+        while not self.__stopped.is_set():
+            try:
+                version = self.refresh()
+            except (GetGeckoDriverError, OSError) as err:
+                observers.emit(
+                    self.__observer,
+                    "refresh",
+                    version=None,
+                    downloaded=False,
+                    error=str(err),
+                )
+                if on_error:
+                    on_error(err)
+            else:
+                if version and callback:
+                    callback(version)
+            if once:
+                return
+            self.__stopped.wait(self.next_delay())
+
+    def next_delay(self) -> float:
+        """
+        Return the seconds until the next poll, the interval with random jitter.
+        """
+
+        return self.interval * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def start(self) -> "Refresher":
+        """
+        Run in a daemon thread.
+        """
+
+        if self.__thread is None or not self.__thread.is_alive():
+            self.__stopped.clear()
+            self.__thread = threading.Thread(
+                target=self.run, name="get-gecko-driver-refresher", daemon=True
+            )
+            self.__thread.start()
+
+        return self
+
+    def stop(self, timeout: float = None):
+        """
+        Stop polling and wait for a refresh in progress.
+
+        :param timeout: Seconds to wait for the thread.
+        """
+
+        self.__stopped.set()
+        if self.__thread is not None:
+            self.__thread.join(timeout)
+            self.__thread = None
@@ -0,0 +1,178 @@
+import bisect
+import re
+
+from get_gecko_driver.exceptions import InvalidSpecifierError
+
+LATEST = "latest"
+LATEST_PATCH_OF = "latest-patch-of"
+CLAUSE = re.compile(r"(>=|<=|==|!=|~=|>|<)?\s*(\d+(?:\.\d+)*)(\.\*)?")
+
+
+def version_key(version: str) -> tuple:
+    """
+    Return a key to sort and compare versions, 0.34 and 0.34.0 are equal.
+    """
+
+    numbers = [int(number) for number in version.split(".")]
+    return tuple(numbers + [0] * (3 - len(numbers)))
+
+
+def next_key(numbers: tuple) -> tuple:
+    """
+    Return the key of the first version after every version that starts with numbers.
+    """
+
+    return version_key(".".join(str(n) for n in numbers[:-1] + (numbers[-1] + 1,)))
+
+
+class VersionSpecifier:
+    def __init__(self, spec: str):
+        """
+        A version range like ">=0.33,<0.35", "~=0.34", "==0.32.*", "!=0.35.0", "0.34.0",
+        "latest-patch-of 0.34", "latest" or "*".
+        Comma separated clauses must all match.
+
+        :param spec: Version specifier.
+        """
+
+        self.spec = spec.strip()
+        self.latest = False
+        # Lowest and highest key, each with True if it is included
+        self.lower = None
+        self.upper = None
+        self.excluded = []
+
+        if self.spec in (LATEST, "*"):
+            self.latest = self.spec == LATEST
+            return
+
+        if self.spec.startswith(LATEST_PATCH_OF):
+            version = self.spec[len(LATEST_PATCH_OF) :].strip()
+            if not re.fullmatch(r"\d+(?:\.\d+)+", version):
+                raise InvalidSpecifierError(f"Invalid version specifier {spec!r}.")
+            numbers = tuple(int(n) for n in version.split("."))
+            self.__add_lower(version_key(version), True)
+            self.__add_upper(next_key(numbers[:2]), False)
+            return
+
+        for clause in self.spec.split(","):
+            match = CLAUSE.fullmatch(clause.strip())
+            if not match:
+                raise InvalidSpecifierError(f"Invalid version specifier {spec!r}.")
+            self.__add_clause(*match.groups())
+
+    def __repr__(self) -> str:
+        return f"VersionSpecifier({self.spec!r})"
+
+    def contains(self, version: str) -> bool:
+        """
+        Check if a version matches.
+
+        :param version: Geckodriver version.
+        """
+
+        key = version_key(version)
+        if self.lower and (
+            key < self.lower[0] or (key == self.lower[0] and not self.lower[1])
+        ):
+            return False
+        if self.upper and (
+            key > self.upper[0] or (key == self.upper[0] and not self.upper[1])
+        ):
+            return False
+
+        return key not in self.excluded
+
+    def __add_clause(self, operator: str, version: str, wildcard: str):
+        """
+        Narrow the range by one clause.
+        """
+
+        numbers = tuple(int(n) for n in version.split("."))
+        key = version_key(version)
+        operator = operator or "=="
+
+        if wildcard and operator != "==":
+            raise InvalidSpecifierError(f"Invalid version specifier {self.spec!r}.")
+
+        if operator == "==" and wildcard:
+            self.__add_lower(key, True)
+            self.__add_upper(next_key(numbers), False)
+        elif operator == "==":
+            self.__add_lower(key, True)
+            self.__add_upper(key, True)
+        elif operator == "!=":
+            self.excluded.append(key)
+        elif operator == ">=":
+            self.__add_lower(key, True)
+        elif operator == ">":
+            self.__add_lower(key, False)
+        elif operator == "<=":
+            self.__add_upper(key, True)
+        elif operator == "<":
+            self.__add_upper(key, False)
+        elif operator == "~=":
+            # ~=0.34 is >=0.34,==0.*, ~=0.34.1 is >=0.34.1,==0.34.*
+            if len(numbers) < 2:
+                raise InvalidSpecifierError(f"Invalid version specifier {self.spec!r}.")
+            self.__add_lower(key, True)
+            self.__add_upper(next_key(numbers[:-1]), False)
+
+    def __add_lower(self, key: tuple, inclusive: bool):
+        """
+        Raise the lower bound if key is higher.
+        """
+
+        if (
+            not self.lower
+            or key > self.lower[0]
+            or (key == self.lower[0] and not inclusive)
+        ):
+            self.lower = (key, inclusive)
+
+    def __add_upper(self, key: tuple, inclusive: bool):
+        """
+        Lower the upper bound if key is lower.
+        """
+
+        if (
+            not self.upper
+            or key < self.upper[0]
+            or (key == self.upper[0] and not inclusive)
+        ):
+            self.upper = (key, inclusive)
+
+
+class VersionIndex:
+    def __init__(self, versions: list):
+        """
+        Sorted versions with bisect lookup of the newest version in a range.
+
+        :param versions: Geckodriver versions, in any order.
+        """
+
+        self.versions = sorted(set(versions), key=version_key)
+        self.keys = [version_key(version) for version in self.versions]
+
+    def select(self, specifier: VersionSpecifier):
+        """
+        Return the newest version that matches, or None.
+
+        :param specifier: Version specifier.
+        """
+
+        start, end = 0, len(self.keys)
+        if specifier.lower:
+            key, inclusive = specifier.lower
+            bound = bisect.bisect_left if inclusive else bisect.bisect_right
+            start = bound(self.keys, key)
+        if specifier.upper:
+            key, inclusive = specifier.upper
+            bound = bisect.bisect_right if inclusive else bisect.bisect_left
+            end = bound(self.keys, key)
+
+        for index in range(end - 1, start - 1, -1):
+            if self.keys[index] not in specifier.excluded:
+                return self.versions[index]
+
+        return None
@@ -0,0 +1,231 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+
+from get_gecko_driver import constants
+from get_gecko_driver import downloader
+from get_gecko_driver.specifier import version_key
+
+# Guards the read-modify-write of PATH
+_path_lock = threading.Lock()
+
+
+def is_valid_driver(file_path: str) -> bool:
+    """
+    Check if file_path is a non-empty, executable driver binary.
+    """
+
+    try:
+        if not os.path.isfile(file_path) or os.path.getsize(file_path) == 0:
+            return False
+    except OSError:
+        return False
+
+    if os.name == "posix":
+        return os.access(file_path, os.X_OK)
+
+    return True
+
+
+def read_version(output_path: str):
+    """
+    Return the version recorded in output_path, or None.
+    """
+
+    try:
+        with open(os.path.join(output_path, constants.VERSION_FILE_NAME), "r") as file:
+            return file.read().strip() or None
+    except OSError:
+        return None
+
+
+def write_version(output_path: str, version: str):
+    """
+    Record the version of the driver installed in output_path.
+    """
+
+    with open(os.path.join(output_path, constants.VERSION_FILE_NAME), "w") as file:
+        file.write(version)
+
+
+def write_record(
+    output_path: str, file_name: str, sha256: str, archive_sha256: str = None
+):
+    """
+    Record the size, mtime and SHA-256 of a driver in output_path, and the SHA-256 of the
+    archive it was extracted from.
+    """
+
+    stat = os.stat(os.path.join(output_path, file_name))
+    record = {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": sha256,
+        "archive_sha256": archive_sha256,
+    }
+    with open(
+        os.path.join(output_path, constants.DRIVER_RECORD_FILE_NAME), "w"
+    ) as file:
+        json.dump({file_name: record}, file)
+
+
+def read_record(output_path: str, file_name: str):
+    """
+    Return the record of a driver in output_path, or None.
+    """
+
+    try:
+        with open(os.path.join(output_path, constants.DRIVER_RECORD_FILE_NAME)) as file:
+            record = json.load(file)[file_name]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+    return record if isinstance(record, dict) else None
+
+
+def verify_driver(output_path: str, file_name: str) -> bool:
+    """
+    Check if the driver in output_path is valid and unchanged since it was recorded.
+    A driver with the recorded size and mtime is trusted without reading it. Otherwise it
+    is hashed once, and recorded again if it still has the recorded SHA-256.
+    A driver without a record is only checked with is_valid_driver.
+    """
+
+    file_path = os.path.join(output_path, file_name)
+    if not is_valid_driver(file_path):
+        return False
+
+    record = read_record(output_path, file_name)
+    if not record:
+        return True
+
+    stat = os.stat(file_path)
+    if stat.st_size == record.get("size") and stat.st_mtime_ns == record.get(
+        "mtime_ns"
+    ):
+        return True
+
+    sha256 = downloader.file_hash(file_path).hexdigest()
+    if sha256 != record.get("sha256"):
+        return False
+
+    write_record(output_path, file_name, sha256, record.get("archive_sha256"))
+    return True
+
+
+def create_stage(output_path: str) -> str:
+    """
+    Create an empty directory inside output_path to stage an install in, so it can be
+    moved into place with renames on the same file system.
+    Staging directories left behind by an install that was killed are removed first, so
+    call it while holding the lock of output_path.
+    """
+
+    os.makedirs(output_path, exist_ok=True)
+    for name in os.listdir(output_path):
+        if name.startswith(constants.INSTALL_STAGE_PREFIX):
+            remove_stage(os.path.join(output_path, name))
+    return tempfile.mkdtemp(prefix=constants.INSTALL_STAGE_PREFIX, dir=output_path)
+
+
+def remove_stage(stage_path: str):
+    """
+    Remove a staging directory and whatever is left in it.
+    """
+
+    shutil.rmtree(stage_path, ignore_errors=True)
+
+
+def commit_install(stage_path: str, output_path: str, file_name: str):
+    """
+    Move a driver staged with its version and record files into output_path.
+    Every file is replaced with an atomic rename. The version file is removed first and moved
+    last, so an install that is interrupted in between is not taken for a complete one.
+    """
+
+    try:
+        os.remove(os.path.join(output_path, constants.VERSION_FILE_NAME))
+    except FileNotFoundError:
+        pass
+
+    for name in (
+        file_name,
+        constants.DRIVER_RECORD_FILE_NAME,
+        constants.VERSION_FILE_NAME,
+    ):
+        staged_path = os.path.join(stage_path, name)
+        if os.path.exists(staged_path):
+            os.replace(staged_path, os.path.join(output_path, name))
+
+
+def register_path(path: str, prepend: bool = False) -> bool:
+    """
+    Add a directory to PATH once. Entries that point to the same directory are removed.
+    An entry that is already there stays where it is, unless prepend moves it to the front.
+    Return True if PATH was changed.
+    """
+
+    path = os.path.abspath(path)
+
+    def same(entry: str) -> bool:
+        # An empty entry means the working directory to some shells, leave it alone
+        return bool(entry) and (
+            os.path.normcase(os.path.abspath(entry)) == os.path.normcase(path)
+        )
+
+    with _path_lock:
+        current = os.environ.get("PATH", "")
+        entries = current.split(os.pathsep) if current else []
+        others = [entry for entry in entries if not same(entry)]
+        if prepend:
+            entries = [path] + others
+        elif len(others) == len(entries):
+            entries = others + [path]
+        else:
+            first = next(index for index, entry in enumerate(entries) if same(entry))
+            entries = others[:first] + [path] + others[first:]
+
+        value = os.pathsep.join(entries)
+        if value == current:
+            return False
+        os.environ["PATH"] = value
+        return True
+
+
+def installed_versions(file_name: str, root: str = constants.STORE_DIR) -> list:
+    """
+    Return the versions with a valid driver in the default <root>/<version>/bin layout,
+    newest first.
+    """
+
+    try:
+        names = os.listdir(root)
+    except OSError:
+        return []
+
+    versions = []
+    for name in names:
+        try:
+            version_key(name)
+        except ValueError:
+            continue
+        if is_valid_driver(os.path.join(root, name, "bin", file_name)):
+            versions.append(name)
+
+    return sorted(versions, key=version_key, reverse=True)
+
+
+def modified_since(file_path: str, timestamp: float) -> bool:
+    """
+    Check if file_path was written or had its metadata changed at or after timestamp.
+    Extraction may restore an old mtime, so the status change time is taken into account.
+    """
+
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return False
+
+    return max(stat.st_mtime, stat.st_ctime) >= timestamp
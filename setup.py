@@ -29,6 +29,7 @@ setup(
         "console_scripts": [f"{name}=get_gecko_driver.app:app"],
     },
     install_requires=requires,
+    extras_require={"async": ["aiohttp==3.14.5"]},
     license="MIT",
     classifiers=[
         "Development Status :: 5 - Production/Stable",
@@ -0,0 +1,88 @@
+import json
+import os
+import statistics
+import time
+
+import pytest
+
+BASELINES_PATH = os.path.join(os.path.dirname(__file__), "baselines.json")
+# A benchmark fails when its median is this many times slower than its baseline
+REGRESSION_THRESHOLD = 1.5
+# Seconds of slack on top of the threshold, so timer noise does not fail fast benchmarks
+NOISE_FLOOR = 0.005
+ROUNDS = 7
+
+results = {}
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--benchmark") or config.getoption("--benchmark-update"):
+        return
+
+    skip = pytest.mark.skip(reason="benchmarks only run with --benchmark")
+    for item in items:
+        if os.path.dirname(str(item.fspath)) == os.path.dirname(__file__):
+            item.add_marker(skip)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if not results:
+        return
+
+    baselines = read_baselines()
+    terminalreporter.section("benchmarks")
+    terminalreporter.write_line(f"{'name':<40}{'median':>12}{'baseline':>12}")
+    for name, median in sorted(results.items()):
+        baseline = baselines.get(name)
+        baseline = f"{baseline * 1000:.2f}ms" if baseline else "-"
+        terminalreporter.write_line(f"{name:<40}{median * 1000:>10.2f}ms{baseline:>12}")
+
+    if config.getoption("--benchmark-update"):
+        baselines.update({name: round(median, 6) for name, median in results.items()})
+        with open(BASELINES_PATH, "w") as file:
+            json.dump(baselines, file, indent=2, sort_keys=True)
+            file.write("\n")
+        terminalreporter.write_line(f"Baselines written to {BASELINES_PATH}")
+
+
+def read_baselines() -> dict:
+    try:
+        with open(BASELINES_PATH, "r") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+@pytest.fixture
+def benchmark(request):
+    """
+    Time a function and compare the median with its stored baseline.
+    Call it with a name, the function, and optionally a setup function that runs
+    untimed before every round.
+    """
+
+    update = request.config.getoption("--benchmark-update")
+
+    def run(name: str, func, setup=None, rounds: int = ROUNDS):
+        timings = []
+        for _ in range(rounds):
+            if setup:
+                setup()
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+
+        median = statistics.median(timings)
+        results[name] = median
+
+        baseline = read_baselines().get(name)
+        if baseline and not update:
+            limit = baseline * REGRESSION_THRESHOLD + NOISE_FLOOR
+            assert median <= limit, (
+                f"{name} took {median * 1000:.2f}ms, "
+                f"baseline {baseline * 1000:.2f}ms, limit {limit * 1000:.2f}ms"
+            )
+
+        return median
+
+    return run
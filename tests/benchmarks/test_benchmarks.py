@@ -0,0 +1,90 @@
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+from get_gecko_driver import GetGeckoDriver
+from get_gecko_driver.enums import OsPlatform
+
+PLATFORMS = {"linux": OsPlatform.linux, "win": OsPlatform.win}
+
+
+class TestMetadataBenchmarks:
+    def test_latest_version_redirect(self, github, cache_dir, benchmark):
+        get_driver = GetGeckoDriver(OsPlatform.linux, use_cache=False)
+
+        benchmark("latest_version[redirect]", get_driver.latest_version)
+
+    def test_latest_version_scrape(self, github, cache_dir, benchmark):
+        github.redirect_latest = False
+        get_driver = GetGeckoDriver(OsPlatform.linux, use_cache=False)
+
+        benchmark("latest_version[scrape]", get_driver.latest_version)
+
+    def test_latest_version_cached(self, github, cache_dir, benchmark):
+        get_driver = GetGeckoDriver(OsPlatform.linux)
+        get_driver.latest_version()
+
+        benchmark("latest_version[cached]", get_driver.latest_version, rounds=50)
+
+    @pytest.mark.parametrize("platform", PLATFORMS)
+    def test_version_url(self, github, cache_dir, benchmark, platform):
+        get_driver = GetGeckoDriver(PLATFORMS[platform], use_cache=False)
+
+        benchmark(f"version_url[{platform}]", lambda: get_driver.version_url("0.36.0"))
+
+    def test_versions(self, github, cache_dir, benchmark):
+        get_driver = GetGeckoDriver(OsPlatform.linux)
+
+        benchmark(
+            "versions[cold]",
+            lambda: get_driver.versions(),
+            setup=get_driver.clear_cache,
+        )
+
+
+class TestDownloadBenchmarks:
+    @pytest.mark.parametrize("stream", [False, True])
+    @pytest.mark.parametrize("platform", PLATFORMS)
+    def test_download_version_extract(
+        self, github, cache_dir, benchmark, platform, stream
+    ):
+        get_driver = GetGeckoDriver(PLATFORMS[platform])
+        get_driver.version_url("0.36.0")
+
+        benchmark(
+            f"download_version[{platform}-{'stream' if stream else 'archive'}]",
+            lambda: get_driver.download_version(
+                "0.36.0", output_path="out", extract=True, stream=stream
+            ),
+            setup=lambda: shutil.rmtree("out", ignore_errors=True),
+        )
+
+    def test_install_cold(self, github, cache_dir, benchmark):
+        get_driver = GetGeckoDriver(OsPlatform.linux)
+
+        def setup():
+            shutil.rmtree("geckodriver", ignore_errors=True)
+            get_driver.clear_cache()
+
+        benchmark("install[cold]", get_driver.install, setup=setup)
+
+    def test_install_warm(self, github, cache_dir, benchmark):
+        get_driver = GetGeckoDriver(OsPlatform.linux)
+        get_driver.install()
+
+        benchmark("install[warm]", get_driver.install, rounds=50)
+
+
+class TestCliBenchmarks:
+    @pytest.mark.parametrize("option", ["--version", "--driver-filename"])
+    def test_cold_start(self, benchmark, option):
+        code = f"from get_gecko_driver.app import app; app(['{option}'])"
+
+        benchmark(
+            f"cli[{option.lstrip('-')}]",
+            lambda: subprocess.run(
+                [sys.executable, "-c", code], stdout=subprocess.DEVNULL, check=False
+            ),
+        )
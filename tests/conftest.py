@@ -0,0 +1,44 @@
+import os
+
+import pytest
+
+from get_gecko_driver import constants
+from tests.server import FakeGitHub
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--benchmark",
+        action="store_true",
+        help="Run the benchmarks in tests/benchmarks",
+    )
+    parser.addoption(
+        "--benchmark-update",
+        action="store_true",
+        help="Store the benchmark timings as the new baselines",
+    )
+
+
+@pytest.fixture
+def github(monkeypatch):
+    """
+    Start a local stand-in GitHub server and point the library at it.
+    """
+
+    server = FakeGitHub().start()
+    monkeypatch.setenv(constants.BASE_URL_ENV, server.url)
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """
+    Use an empty metadata cache and an empty working directory.
+    """
+
+    monkeypatch.setenv("PATH", os.environ.get("PATH", ""))
+    path = tmp_path / "cache"
+    monkeypatch.setenv(constants.CACHE_DIR_ENV, str(path))
+    monkeypatch.chdir(tmp_path)
+    return str(path)
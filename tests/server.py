@@ -0,0 +1,275 @@
+import functools
+import hashlib
+import io
+import random
+import re
+import socket
+import tarfile
+import threading
+import time
+import zipfile
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+
+REPO_PATH = "/mozilla/geckodriver"
+VERSIONS = ["0.36.0", "0.35.0", "0.34.0", "0.33.0", "0.32.2", "0.32.1", "0.32.0"]
+PLATFORMS = ["win64", "win32", "linux64", "linux32", "macos", "macos-aarch64"]
+# win32 and linux32 builds are missing from the latest release
+MISSING_ASSETS = {("0.36.0", "win32"), ("0.36.0", "linux32")}
+# Incompressible, like a real binary
+DRIVER_CONTENT = b"#!/bin/sh\necho geckodriver\n" + random.Random(0).randbytes(262144)
+
+
+def asset_name(version: str, platform: str) -> str:
+    ext = ".zip" if platform.startswith("win") else ".tar.gz"
+    return f"geckodriver-v{version}-{platform}{ext}"
+
+
+@functools.lru_cache(maxsize=None)
+def build_asset(version: str, platform: str) -> bytes:
+    """
+    Build an in-memory archive that looks like an upstream release asset.
+    """
+
+    buffer = io.BytesIO()
+    content = DRIVER_CONTENT + version.encode()
+    if platform.startswith("win"):
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zip_ref:
+            zip_ref.writestr("geckodriver.exe", content)
+    else:
+        with tarfile.open(fileobj=buffer, mode="w:gz") as tar_gz_ref:
+            info = tarfile.TarInfo("geckodriver")
+            info.size = len(content)
+            info.mode = 0o755
+            tar_gz_ref.addfile(info, io.BytesIO(content))
+    return buffer.getvalue()
+
+
+class FakeGitHub:
+    """
+    Local stand-in for the parts of github.com used by GetGeckoDriver.
+    """
+
+    def __init__(self, versions: list = None, tags_per_page: int = 3):
+        self.versions = list(versions or VERSIONS)
+        self.tags_per_page = tags_per_page
+        self.assets = {}
+        for version in self.versions:
+            for platform in PLATFORMS:
+                if (version, platform) not in MISSING_ASSETS:
+                    self.assets[asset_name(version, platform)] = build_asset(
+                        version, platform
+                    )
+        self.redirect_latest = True
+        # Serve the expanded assets pages of the releases
+        self.expanded_assets = True
+        # Drop the connection after this many bytes of the next asset response
+        self.drop_after = None
+        # Send asset responses with Transfer-Encoding: chunked instead of Content-Length
+        self.chunked = False
+        # Answer this many next requests with 503 Service Unavailable
+        self.fail_next = 0
+        # Seconds to wait before answering any request
+        self.delay = 0
+        # Validators of the releases and tags pages
+        self.etags = True
+        self.last_modified = None
+        self.requests = []
+        self.connections = 0
+        self.__lock = threading.Lock()
+        self.__server = ThreadingHTTPServer(("127.0.0.1", 0), self.__handler())
+        self.__server.daemon_threads = True
+        self.__thread = threading.Thread(
+            target=self.__server.serve_forever, args=(0.05,), daemon=True
+        )
+
+    @property
+    def url(self) -> str:
+        host, port = self.__server.server_address
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.__thread.start()
+        return self
+
+    def stop(self):
+        self.__server.shutdown()
+        self.__server.server_close()
+
+    def log(self, method: str, path: str):
+        with self.__lock:
+            self.requests.append((method, path))
+
+    def connect(self):
+        with self.__lock:
+            self.connections += 1
+
+    def count(self, pattern: str = "", method: str = None) -> int:
+        with self.__lock:
+            return len(
+                [
+                    r
+                    for r in self.requests
+                    if re.search(pattern, r[1]) and method in (None, r[0])
+                ]
+            )
+
+    def reset(self):
+        with self.__lock:
+            self.requests.clear()
+            self.connections = 0
+
+    def releases_html(self) -> bytes:
+        rows = "".join(
+            f'<div class="Box"><div class="Box-body">'
+            f'<a class="Link--primary" href="{REPO_PATH}/releases/tag/v{v}">{v}</a>'
+            f"</div></div>"
+            for v in self.versions
+        )
+        # Pad the page to a realistic size
+        padding = "<!-- " + "x" * 200_000 + " -->"
+        return f"<html><body>{rows}{padding}</body></html>".encode()
+
+    def assets_html(self, version: str) -> bytes:
+        prefix = f"geckodriver-v{version}-"
+        rows = "".join(
+            f'<li class="Box-row"><a href="{REPO_PATH}/releases/download/v{version}/{name}"'
+            f' rel="nofollow">{name}</a></li>'
+            for name in self.assets
+            if name.startswith(prefix)
+        )
+        rows += (
+            f'<li class="Box-row"><a href="{REPO_PATH}/archive/refs/tags/v{version}.zip"'
+            f' rel="nofollow">Source code (zip)</a></li>'
+        )
+        return f'<div><ul class="list-style-none">{rows}</ul></div>'.encode()
+
+    def tags_html(self, after: str = None) -> bytes:
+        tags = [f"v{v}" for v in self.versions]
+        start = tags.index(after) + 1 if after in tags else 0
+        rows = "".join(
+            f'<div class="Box-row"><h2><a href="{REPO_PATH}/releases/tag/{tag}">{tag}</a>'
+            f'</h2><a href="{REPO_PATH}/releases/tag/{tag}">Notes</a></div>'
+            for tag in tags[start : start + self.tags_per_page]
+        )
+        padding = "<!-- " + "x" * 150_000 + " -->"
+        return f"<html><body>{rows}{padding}</body></html>".encode()
+
+    def __handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                fake.connect()
+                # Small responses are written as separate header and body packets
+                self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                super().setup()
+
+            def log_message(self, *args):
+                pass
+
+            def do_HEAD(self):
+                self.__respond(head=True)
+
+            def do_GET(self):
+                self.__respond(head=False)
+
+            def __respond(self, head: bool):
+                fake.log(self.command, self.path)
+                path = self.path.split("?")[0]
+                if fake.delay:
+                    time.sleep(fake.delay)
+
+                if fake.fail_next:
+                    fake.fail_next -= 1
+                    return self.__send(503, b"Service Unavailable", head)
+
+                if path == f"{REPO_PATH}/tags":
+                    match = re.search(r"[?&]after=([^&]+)", self.path)
+                    after = match.group(1) if match else None
+                    return self.__send_page(fake.tags_html(after), head)
+
+                if path == f"{REPO_PATH}/releases":
+                    return self.__send_page(fake.releases_html(), head)
+
+                match = re.fullmatch(
+                    rf"{REPO_PATH}/releases/expanded_assets/v([\d.]+)", path
+                )
+                if match and fake.expanded_assets and match.group(1) in fake.versions:
+                    return self.__send(200, fake.assets_html(match.group(1)), head)
+
+                if path == f"{REPO_PATH}/releases/latest" and fake.redirect_latest:
+                    location = f"{fake.url}{REPO_PATH}/releases/tag/v{fake.versions[0]}"
+                    return self.__send(302, b"", head, {"Location": location})
+
+                match = re.fullmatch(
+                    rf"{REPO_PATH}/releases/download/v([\d.]+)/([^/]+)", path
+                )
+                if match and match.group(2) in fake.assets:
+                    return self.__send(
+                        302, b"", head, {"Location": f"/assets/{match.group(2)}"}
+                    )
+
+                match = re.fullmatch(r"/assets/([^/]+)", path)
+                if match and match.group(1) in fake.assets:
+                    return self.__send_asset(fake.assets[match.group(1)], head)
+
+                self.__send(404, b"Not Found", head)
+
+            def __send_page(self, body: bytes, head: bool):
+                headers = {"ETag": f'W/"{hashlib.md5(body).hexdigest()}"'}
+                if fake.last_modified:
+                    headers["Last-Modified"] = fake.last_modified
+                if fake.etags and self.headers["If-None-Match"] == headers["ETag"]:
+                    return self.__send(304, b"", head, headers)
+                if fake.last_modified and (
+                    self.headers["If-Modified-Since"] == fake.last_modified
+                ):
+                    return self.__send(304, b"", head, headers)
+                if not fake.etags:
+                    del headers["ETag"]
+                self.__send(200, body, head, headers)
+
+            def __send_asset(self, body: bytes, head: bool):
+                headers = {"Accept-Ranges": "bytes"}
+                match = re.fullmatch(r"bytes=(\d+)-(\d*)", self.headers["Range"] or "")
+                if not match:
+                    return self.__send(200, body, head, headers, asset=True)
+
+                start = int(match.group(1))
+                end = int(match.group(2)) if match.group(2) else len(body) - 1
+                if start >= len(body):
+                    headers["Content-Range"] = f"bytes */{len(body)}"
+                    return self.__send(416, b"", head, headers)
+                end = min(end, len(body) - 1)
+                headers["Content-Range"] = f"bytes {start}-{end}/{len(body)}"
+                self.__send(206, body[start : end + 1], head, headers, asset=True)
+
+            def __send(
+                self, status: int, body: bytes, head: bool, headers=None, asset=False
+            ):
+                self.send_response(status)
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                if asset and fake.chunked:
+                    self.send_header("Transfer-Encoding", "chunked")
+                    self.end_headers()
+                    if not head:
+                        for start in range(0, len(body), 8192):
+                            chunk = body[start : start + 8192]
+                            self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                        self.wfile.write(b"0\r\n\r\n")
+                    return
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if head:
+                    return
+                if asset and fake.drop_after is not None:
+                    body = body[: fake.drop_after]
+                    fake.drop_after = None
+                    self.close_connection = True
+                self.wfile.write(body)
+
+        return Handler
@@ -0,0 +1,105 @@
+import asyncio
+import os
+import threading
+
+from get_gecko_driver import AsyncGetGeckoDriver
+from get_gecko_driver import GetGeckoDriver
+from get_gecko_driver import downloader
+from get_gecko_driver import store
+from get_gecko_driver.enums import OsPlatform
+from tests.server import VERSIONS
+
+
+class TestAsyncGetGeckoDriver:
+    def test_latest_version_url(self, github, cache_dir):
+        async def run():
+            async with AsyncGetGeckoDriver(OsPlatform.win) as get_driver:
+                return await get_driver.latest_version_url()
+
+        url = asyncio.run(run())
+
+        assert url == GetGeckoDriver(OsPlatform.win).latest_version_url()
+
+    def test_concurrent_downloads(self, github, cache_dir):
+        versions = ["0.33.0", "0.34.0", "0.35.0"]
+
+        async def run():
+            async with AsyncGetGeckoDriver(OsPlatform.linux) as get_driver:
+                return await asyncio.gather(
+                    *[get_driver.download_version(v, extract=True) for v in versions]
+                )
+
+        output_paths = asyncio.run(run())
+
+        for version, output_path in zip(versions, output_paths):
+            with open(os.path.join(output_path, "geckodriver"), "rb") as file:
+                assert file.read().endswith(version.encode())
+
+    def test_install(self, github, cache_dir):
+        async def run():
+            async with AsyncGetGeckoDriver(OsPlatform.win) as get_driver:
+                return await get_driver.install()
+
+        output_path = asyncio.run(run())
+
+        assert os.listdir(output_path).count("geckodriver.exe") == 1
+
+    def test_disk_io_runs_in_threads(self, github, cache_dir, monkeypatch):
+        threads = []
+
+        def record(func):
+            def wrapper(*args, **kwargs):
+                threads.append(threading.current_thread())
+                return func(*args, **kwargs)
+
+            return wrapper
+
+        monkeypatch.setattr(
+            downloader, "extract_member", record(downloader.extract_member)
+        )
+        monkeypatch.setattr(store, "commit_install", record(store.commit_install))
+        monkeypatch.setattr(store, "verify_driver", record(store.verify_driver))
+
+        async def run():
+            async with AsyncGetGeckoDriver(OsPlatform.linux) as get_driver:
+                await get_driver.install(version="0.35.0")
+                await get_driver.install(version="0.35.0")
+                return await get_driver.download_version("0.34.0")
+
+        output_path = asyncio.run(run())
+
+        assert len(threads) >= 3
+        assert threading.main_thread() not in threads
+        assert os.listdir(output_path) == ["geckodriver-v0.34.0-linux64.tar.gz"]
+
+    def test_version_specifiers(self, github, cache_dir):
+        async def run():
+            async with AsyncGetGeckoDriver(OsPlatform.linux) as get_driver:
+                download_path = await get_driver.download_version("~=0.34.0")
+                install_path = await get_driver.install(version=">=0.33,<0.35")
+                return download_path, install_path, await get_driver.resolve("latest")
+
+        download_path, install_path, latest = asyncio.run(run())
+
+        assert download_path == "geckodriver/0.34.0/bin"
+        assert install_path == os.path.abspath("geckodriver/0.34.0/bin")
+        assert latest == "0.36.0"
+        assert GetGeckoDriver(OsPlatform.linux).resolve("~=0.33.0") == "0.33.0"
+        assert github.count("/tags") == 4
+
+    def test_versions_without_blocking_requests(self, github, cache_dir, monkeypatch):
+        def create_session(**kwargs):
+            raise AssertionError("blocking session used")
+
+        monkeypatch.setattr(downloader, "create_session", create_session)
+
+        async def run():
+            async with AsyncGetGeckoDriver(OsPlatform.linux) as get_driver:
+                versions = await get_driver.versions()
+                return versions, await get_driver.resolve("~=0.32.0")
+
+        versions, version = asyncio.run(run())
+
+        assert versions == VERSIONS
+        assert version == "0.32.2"
+        assert github.count("/tags") == 4
@@ -0,0 +1,84 @@
+import time
+
+from get_gecko_driver import GetGeckoDriver
+from get_gecko_driver.cache import MetadataCache
+from get_gecko_driver.enums import OsPlatform
+
+
+class TestMetadataCache:
+    def test_set_get(self, tmp_path):
+        cache = MetadataCache(str(tmp_path))
+        cache.set("latest_version", "0.36.0")
+
+        assert cache.get("latest_version") == "0.36.0"
+        assert MetadataCache(str(tmp_path)).get("latest_version") == "0.36.0"
+
+    def test_ttl(self, tmp_path):
+        cache = MetadataCache(str(tmp_path), ttl=0.05)
+        cache.set("latest_version", "0.36.0")
+        time.sleep(0.1)
+
+        assert cache.get("latest_version") is None
+
+    def test_clear(self, tmp_path):
+        cache = MetadataCache(str(tmp_path))
+        cache.set("a", 1)
+        cache.clear()
+
+        assert cache.get("a") is None
+
+    def test_unwritable(self, tmp_path):
+        file_path = tmp_path / "file"
+        file_path.write_text("")
+        cache = MetadataCache(str(file_path))
+        cache.set("a", 1)
+
+        assert cache.get("a") is None
+
+
+class TestGetGeckoDriverCache:
+    def test_warm_calls_make_no_requests(self, github, cache_dir):
+        get_driver = GetGeckoDriver(OsPlatform.linux)
+        url = get_driver.latest_version_url()
+        github.reset()
+
+        assert GetGeckoDriver(OsPlatform.linux).latest_version_url() == url
+        assert github.count() == 0
+
+    def test_cache_keyed_by_platform(self, github, cache_dir):
+        linux_url = GetGeckoDriver(OsPlatform.linux).version_url("0.34.0")
+        win_url = GetGeckoDriver(OsPlatform.win).version_url("0.34.0")
+
+        assert linux_url.endswith("linux64.tar.gz")
+        assert win_url.endswith("win64.zip")
+
+    def test_refresh(self, github, cache_dir):
+        get_driver = GetGeckoDriver(OsPlatform.linux)
+        get_driver.latest_version()
+        github.reset()
+        get_driver.latest_version(refresh=True)
+
+        assert github.count("/releases/latest$") == 1
+
+    def test_no_cache(self, github, cache_dir):
+        get_driver = GetGeckoDriver(OsPlatform.linux, use_cache=False)
+        get_driver.latest_version()
+        get_driver.latest_version()
+
+        assert github.count("/releases/latest$") == 2
+
+
+class TestLatestVersion:
+    def test_redirect(self, github, cache_dir):
+        version = GetGeckoDriver(use_cache=False).latest_version()
+
+        assert version == "0.36.0"
+        assert github.count("/releases/latest$") == 1
+        assert github.count("/releases$") == 0
+
+    def test_scrape_fallback(self, github, cache_dir):
+        github.redirect_latest = False
+        version = GetGeckoDriver(use_cache=False).latest_version()
+
+        assert version == "0.36.0"
+        assert github.count("/releases$") == 1
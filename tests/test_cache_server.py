@@ -0,0 +1,76 @@
+import os
+import threading
+
+import pytest
+
+from get_gecko_driver import GetGeckoDriver
+from get_gecko_driver import constants
+from get_gecko_driver.cache_server import CacheServer
+from get_gecko_driver.enums import OsPlatform
+from get_gecko_driver.enums import Platform
+from get_gecko_driver.mirror import mirror
+
+
+@pytest.fixture
+def cache_server(github, cache_dir):
+    server = CacheServer(host="127.0.0.1", port=0, root="store", upstream=github.url)
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class TestCacheServer:
+    def test_install_through_cache(self, github, cache_server):
+        for output_path in ["a", "b"]:
+            get_driver = GetGeckoDriver(
+                OsPlatform.linux, use_cache=False, base_url=cache_server.url
+            )
+            get_driver.install(output_path)
+
+            assert os.path.isfile(os.path.join(output_path, "geckodriver"))
+
+        assert github.count("^/assets/geckodriver-v0.36.0-linux64", "GET") == 1
+        assert os.path.isfile("store/v0.36.0/geckodriver-v0.36.0-linux64.tar.gz")
+
+    def test_missing_asset(self, github, cache_server):
+        get_driver = GetGeckoDriver(base_url=cache_server.url)
+        url = get_driver.platform_url("0.36.0", Platform.win32)
+
+        assert get_driver.session.head(url).status_code == 404
+        assert get_driver.session.get(url).status_code == 404
+        assert not os.listdir("store/v0.36.0")
+
+    def test_serve_mirror(self, github, cache_server):
+        mirror(["0.35.0"], [Platform.win64], "store")
+        github.reset()
+        get_driver = GetGeckoDriver(
+            OsPlatform.win, use_cache=False, base_url=cache_server.url
+        )
+        get_driver.download_version("0.35.0", extract=True, stream=True)
+
+        assert github.count("/download/") == 0
+
+    def test_ranges(self, github, cache_server):
+        get_driver = GetGeckoDriver(
+            OsPlatform.win, use_cache=False, base_url=cache_server.url
+        )
+        get_driver.download_version("0.34.0", "out", connections=3)
+
+        with open("out/geckodriver-v0.34.0-win64.zip", "rb") as file:
+            assert file.read() == github.assets["geckodriver-v0.34.0-win64.zip"]
+
+    def test_conditional_metadata(self, github, cache_server):
+        github.redirect_latest = False
+        get_driver = GetGeckoDriver(OsPlatform.linux, base_url=cache_server.url)
+        get_driver.latest_version()
+        github.reset()
+
+        url = cache_server.url + constants.GECKODRIVER_RELEASES_PATH
+        etag = get_driver.session.get(url).headers["ETag"]
+        response = get_driver.session.get(url, headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert github.count() == 0
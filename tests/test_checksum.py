@@ -0,0 +1,124 @@
+import hashlib
+import os
+
+import pytest
+
+from get_gecko_driver import GetGeckoDriver
+from get_gecko_driver import constants
+from get_gecko_driver import downloader
+from get_gecko_driver import store
+from get_gecko_driver.enums import OsPlatform
+from get_gecko_driver.exceptions import ChecksumError
+from tests.server import DRIVER_CONTENT
+from tests.server import build_asset
+
+ASSET_SHA256 = hashlib.sha256(build_asset("0.34.0", "linux64")).hexdigest()
+
+
+class TestStreamingChecksum:
+    @pytest.mark.parametrize("connections", [1, 4])
+    def test_download_digest(self, github, cache_dir, connections):
+        url = GetGeckoDriver(OsPlatform.linux).version_url("0.34.0")
+        digests = {}
+        downloader.download(url, "out", connections=connections, digests=digests)
+
+        assert digests["archive"] == ASSET_SHA256
+
+    def test_resumed_download_digest(self, github, cache_dir):
+        url = GetGeckoDriver(OsPlatform.linux).version_url("0.34.0")
+        github.drop_after = 1000
+        digests = {}
+        downloader.download(url, "out", sha256=ASSET_SHA256, digests=digests)
+
+        assert digests["archive"] == ASSET_SHA256
+
+    def test_mismatch_removes_file(self, github, cache_dir):
+        url = GetGeckoDriver(OsPlatform.linux).version_url("0.34.0")
+        with pytest.raises(ChecksumError):
+            downloader.download(url, "out", sha256="0" * 64)
+
+        assert os.listdir("out") == []
+
+    def test_download_member_digests(self, github, cache_dir):
+        url = GetGeckoDriver(OsPlatform.linux).version_url("0.34.0")
+        digests = {}
+        downloader.download_member(url, "geckodriver", "out", digests=digests)
+
+        assert digests["archive"] == ASSET_SHA256
+        assert (
+            digests["member"] == hashlib.sha256(DRIVER_CONTENT + b"0.34.0").hexdigest()
+        )
+
+    def test_download_member_mismatch(self, github, cache_dir):
+        url = GetGeckoDriver(OsPlatform.linux).version_url("0.34.0")
+        with pytest.raises(ChecksumError):
+            downloader.download_member(url, "geckodriver", "out", sha256="0" * 64)
+
+        assert os.listdir("out") == []
+
+
+class TestChecksumManifest:
+    def test_recorded_digest_is_checked(self, github, cache_dir):
+        get_driver = GetGeckoDriver(OsPlatform.linux)
+        get_driver.download_version("0.34.0", output_path="first")
+        github.assets["geckodriver-v0.34.0-linux64.tar.gz"] = build_asset(
+            "0.35.0", "linux64"
+        )
+
+        with pytest.raises(ChecksumError):
+            get_driver.download_version("0.34.0", output_path="second")
+
+    def test_user_supplied_digest(self, github, cache_dir):
+        get_driver = GetGeckoDriver(OsPlatform.linux, use_cache=False)
+        get_driver.download_version("0.34.0", extract=True, sha256=ASSET_SHA256)
+
+        with pytest.raises(ChecksumError):
+            get_driver.download_version("0.34.0", extract=True, sha256="0" * 64)
+
+
+class TestDriverRecord:
+    def test_install_trusts_unchanged_driver(self, github, cache_dir, monkeypatch):
+        get_driver = GetGeckoDriver(OsPlatform.linux)
+        output_path = get_driver.install(version="0.34.0", sha256=ASSET_SHA256)
+        record = store.read_record(output_path, "geckodriver")
+
+        assert record["archive_sha256"] == ASSET_SHA256
+        monkeypatch.setattr(downloader, "file_hash", None)
+        github.reset()
+        get_driver.install(version="0.34.0", sha256=ASSET_SHA256)
+        assert github.count() == 0
+
+    def test_touched_driver_is_rehashed(self, github, cache_dir):
+        get_driver = GetGeckoDriver(OsPlatform.linux)
+        output_path = get_driver.install(version="0.34.0")
+        driver_path = os.path.join(output_path, "geckodriver")
+        os.utime(driver_path, ns=(0, 0))
+        github.reset()
+
+        get_driver.install(version="0.34.0")
+        assert github.count() == 0
+        assert store.read_record(output_path, "geckodriver")["mtime_ns"] == 0
+
+    def test_modified_driver_is_replaced(self, github, cache_dir):
+        get_driver = GetGeckoDriver(OsPlatform.linux)
+        output_path = get_driver.install(version="0.34.0")
+        driver_path = os.path.join(output_path, "geckodriver")
+        with open(driver_path, "r+b") as file:
+            file.write(b"corrupt")
+        github.reset()
+
+        get_driver.install(version="0.34.0")
+        assert github.count("/assets/") == 1
+        with open(driver_path, "rb") as file:
+            assert file.read() == DRIVER_CONTENT + b"0.34.0"
+
+    def test_other_archive_digest_reinstalls(self, github, cache_dir):
+        get_driver = GetGeckoDriver(OsPlatform.linux)
+        get_driver.install(version="0.34.0")
+        github.reset()
+
+        with pytest.raises(ChecksumError):
+            get_driver.install(version="0.34.0", sha256="0" * 64)
+        assert os.path.isfile(
+            os.path.join(constants.STORE_DIR, "0.34.0", "bin", "geckodriver")
+        )
@@ -0,0 +1,59 @@
+import os
+
+from typer.testing import CliRunner
+
+from get_gecko_driver.app import app
+from get_gecko_driver.app import get_driver
+
+runner = CliRunner()
+
+
+class TestCli:
+    def test_latest_urls(self, github, cache_dir):
+        get_driver.cache_clear()
+        result = runner.invoke(app, ["--latest-urls"])
+        lines = result.stdout.splitlines()
+
+        assert lines[0].endswith("geckodriver-v0.36.0-win64.zip")
+        assert lines[1].endswith("geckodriver-v0.36.0-linux64.tar.gz")
+        assert lines[2].endswith("geckodriver-v0.36.0-macos-aarch64.tar.gz")
+        assert github.count("/releases/latest$") == 1
+
+    def test_all_versions(self, github, cache_dir):
+        get_driver.cache_clear()
+        result = runner.invoke(app, ["--all-versions"])
+
+        assert result.stdout.splitlines()[:2] == ["0.36.0", "0.35.0"]
+
+    def test_resolve(self, github, cache_dir):
+        get_driver.cache_clear()
+        result = runner.invoke(app, ["--resolve", ">=0.33,<0.35"])
+
+        assert result.stdout.strip() == "0.34.0"
+
+    def test_mirror(self, github, cache_dir):
+        result = runner.invoke(
+            app,
+            ["mirror", "--versions", "0.34.0,0.35.0", "--platforms", "linux64"],
+        )
+
+        assert "Downloaded 2, skipped 0, failed 0" in result.stdout
+        assert os.path.isfile("geckodriver-mirror/manifest.json")
+
+    def test_download_progress(self, github, cache_dir):
+        get_driver.cache_clear()
+        result = runner.invoke(
+            app,
+            ["--download-version", "0.34.0", "--progress", "--rate-limit", "10M"],
+        )
+
+        assert "100%" in result.output
+        assert os.listdir("geckodriver/0.34.0/bin")
+
+    def test_invalid_rate_limit(self, github, cache_dir):
+        result = runner.invoke(
+            app, ["--download-version", "0.34.0", "--rate-limit", "fast"]
+        )
+
+        assert result.exit_code == 1
+        assert "Invalid rate" in result.stdout
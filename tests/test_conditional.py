@@ -0,0 +1,89 @@
+import asyncio
+
+from get_gecko_driver import AsyncGetGeckoDriver
+from get_gecko_driver import GetGeckoDriver
+from get_gecko_driver.enums import OsPlatform
+from tests.server import VERSIONS
+from tests.test_observer import RecordingObserver
+
+
+def responses(recorder: RecordingObserver, path: str) -> list:
+    return [
+        (event["status"], event["bytes"])
+        for event in recorder.events
+        if event["event"] == "request_end" and event["url"].split("?")[0].endswith(path)
+    ]
+
+
+class TestConditionalRequests:
+    def test_releases_page_not_modified(self, github, cache_dir):
+        github.redirect_latest = False
+        recorder = RecordingObserver()
+        get_driver = GetGeckoDriver(OsPlatform.linux, observer=recorder)
+
+        assert get_driver.latest_version() == "0.36.0"
+        assert get_driver.latest_version(refresh=True) == "0.36.0"
+        assert responses(recorder, "/releases")[-1] == (304, 0)
+
+    def test_releases_page_modified(self, github, cache_dir):
+        github.redirect_latest = False
+        get_driver = GetGeckoDriver(OsPlatform.linux)
+        get_driver.latest_version()
+        github.versions.insert(0, "0.37.0")
+
+        assert get_driver.latest_version(refresh=True) == "0.37.0"
+
+    def test_tags_page_not_modified(self, github, cache_dir):
+        recorder = RecordingObserver()
+        get_driver = GetGeckoDriver(OsPlatform.linux, observer=recorder)
+        get_driver.versions()
+        github.reset()
+
+        assert get_driver.versions(refresh=True) == VERSIONS
+        assert github.count("/tags") == 1
+        assert responses(recorder, "/tags")[-1] == (304, 0)
+
+    def test_last_modified(self, github, cache_dir):
+        github.redirect_latest = False
+        github.etags = False
+        github.last_modified = "Tue, 04 Feb 2025 12:00:00 GMT"
+        recorder = RecordingObserver()
+        get_driver = GetGeckoDriver(OsPlatform.linux, observer=recorder)
+        get_driver.latest_version()
+
+        assert get_driver.latest_version(refresh=True) == "0.36.0"
+        assert responses(recorder, "/releases")[-1] == (304, 0)
+
+    def test_no_validators_without_cache(self, github, cache_dir):
+        github.redirect_latest = False
+        recorder = RecordingObserver()
+        get_driver = GetGeckoDriver(
+            OsPlatform.linux, use_cache=False, observer=recorder
+        )
+        get_driver.latest_version()
+        get_driver.latest_version()
+
+        assert [status for status, _ in responses(recorder, "/releases")] == [200, 200]
+
+    def test_async_releases_page_not_modified(self, github, cache_dir):
+        github.redirect_latest = False
+        GetGeckoDriver(OsPlatform.linux).latest_version()
+        github.reset()
+
+        async def run():
+            async with AsyncGetGeckoDriver(OsPlatform.linux) as get_driver:
+                return await get_driver.latest_version(refresh=True)
+
+        assert asyncio.run(run()) == "0.36.0"
+        assert github.count("/releases$") == 1
+
+    def test_async_fallback_twice(self, github, cache_dir):
+        github.redirect_latest = False
+
+        async def run():
+            async with AsyncGetGeckoDriver(OsPlatform.linux) as get_driver:
+                return [await get_driver.latest_version() for _ in range(2)]
+
+        assert asyncio.run(run()) == ["0.36.0", "0.36.0"]
+        assert GetGeckoDriver(OsPlatform.linux).latest_version(refresh=True) == "0.36.0"
+        assert github.count("/releases$") == 2
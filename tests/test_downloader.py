@@ -0,0 +1,242 @@
+import io
+import os
+import tarfile
+import time
+import zipfile
+
+import pytest
+from requests.exceptions import RequestException
+
+from get_gecko_driver import GetGeckoDriver
+from get_gecko_driver import constants
+from get_gecko_driver import downloader
+from get_gecko_driver.enums import OsPlatform
+from tests.server import DRIVER_CONTENT
+
+
+class TestDownloader:
+    def test_download_member_tar_gz(self, github, cache_dir):
+        url = GetGeckoDriver(OsPlatform.linux).version_url("0.34.0")
+        file_path, _ = downloader.download_member(url, "geckodriver", "out")
+
+        assert os.listdir("out") == ["geckodriver"]
+        with open(file_path, "rb") as file:
+            assert file.read() == DRIVER_CONTENT + b"0.34.0"
+        if os.name == "posix":
+            assert os.access(file_path, os.X_OK)
+
+    def test_download_member_zip(self, github, cache_dir):
+        url = GetGeckoDriver(OsPlatform.win).version_url("0.34.0")
+        downloader.download_member(url, "geckodriver.exe", "out")
+
+        assert os.listdir("out") == ["geckodriver.exe"]
+
+    def test_download_version_stream(self, github, cache_dir):
+        get_driver = GetGeckoDriver(OsPlatform.linux)
+        output_path = get_driver.download_version("0.34.0", extract=True, stream=True)
+
+        assert os.listdir(output_path) == ["geckodriver"]
+
+
+class TestRangedDownload:
+    def test_resume_after_dropped_connection(self, github, cache_dir):
+        url = GetGeckoDriver(OsPlatform.linux).version_url("0.34.0")
+        github.drop_after = 1000
+        file_path, _ = downloader.download(url, "out")
+
+        with open(file_path, "rb") as file:
+            assert file.read() == github.assets["geckodriver-v0.34.0-linux64.tar.gz"]
+        assert os.listdir("out") == ["geckodriver-v0.34.0-linux64.tar.gz"]
+
+    def test_chunked_response(self, github, cache_dir):
+        url = GetGeckoDriver(OsPlatform.linux).version_url("0.34.0")
+        github.chunked = True
+        file_path, _ = downloader.download(url, "out")
+
+        with open(file_path, "rb") as file:
+            assert file.read() == github.assets["geckodriver-v0.34.0-linux64.tar.gz"]
+
+    def test_chunked_response_zip_member(self, github, cache_dir):
+        url = GetGeckoDriver(OsPlatform.win).version_url("0.34.0")
+        github.chunked = True
+        file_path, _ = downloader.download_member(url, "geckodriver.exe", "out")
+
+        with open(file_path, "rb") as file:
+            assert file.read() == DRIVER_CONTENT + b"0.34.0"
+
+    def test_resume_existing_part_file(self, github, cache_dir):
+        url = GetGeckoDriver(OsPlatform.linux).version_url("0.34.0")
+        asset = github.assets["geckodriver-v0.34.0-linux64.tar.gz"]
+        os.makedirs("out")
+        with open("out/geckodriver-v0.34.0-linux64.tar.gz.part", "wb") as file:
+            file.write(asset[:100])
+        file_path, _ = downloader.download(url, "out")
+
+        with open(file_path, "rb") as file:
+            assert file.read() == asset
+
+    def test_resume_after_failed_ranges(self, github, cache_dir, monkeypatch):
+        monkeypatch.setattr(constants, "MIN_RANGE_SIZE", 512)
+        url = GetGeckoDriver(OsPlatform.linux).version_url("0.34.0")
+        github.drop_after = 1000
+        with monkeypatch.context() as context:
+            context.setattr(constants, "RESUME_ATTEMPTS", 0)
+            with pytest.raises(RequestException):
+                downloader.download(url, "out", connections=4)
+
+        assert os.listdir("out") == []
+        file_path, _ = downloader.download(url, "out")
+
+        with open(file_path, "rb") as file:
+            assert file.read() == github.assets["geckodriver-v0.34.0-linux64.tar.gz"]
+
+    def test_connections(self, github, cache_dir, monkeypatch):
+        monkeypatch.setattr(constants, "MIN_RANGE_SIZE", 512)
+        url = GetGeckoDriver(OsPlatform.win).version_url("0.34.0")
+        github.reset()
+        file_path, _ = downloader.download(url, "out", connections=4)
+
+        with open(file_path, "rb") as file:
+            assert file.read() == github.assets["geckodriver-v0.34.0-win64.zip"]
+        assert github.count("^/assets/") == 5
+
+
+class TestTransfer:
+    def test_progress(self, github, cache_dir):
+        url = GetGeckoDriver(OsPlatform.linux).version_url("0.34.0")
+        size = len(github.assets["geckodriver-v0.34.0-linux64.tar.gz"])
+        calls = []
+        downloader.download(url, "out", progress=lambda *args: calls.append(args))
+
+        assert calls[-1][:2] == (size, size)
+        assert [done for done, _, _ in calls] == sorted(done for done, _, _ in calls)
+        assert calls[-1][2] > 0
+
+    def test_progress_stream(self, github, cache_dir):
+        calls = []
+        get_driver = GetGeckoDriver(OsPlatform.win)
+        get_driver.download_version(
+            "0.34.0",
+            extract=True,
+            stream=True,
+            progress=lambda *args: calls.append(args),
+        )
+
+        size = len(github.assets["geckodriver-v0.34.0-win64.zip"])
+        assert calls[-1][:2] == (size, size)
+
+    def test_chunk_size_follows_throughput(self, monkeypatch):
+        times = iter([0.0, 0.0, 1.0, 1.001, 1.002])
+        monkeypatch.setattr(downloader.time, "perf_counter", lambda: next(times))
+        transfer = downloader._Transfer()
+        transfer.start(0)
+        # 64 KiB in one second
+        transfer.update(65536)
+        assert transfer.chunk_size == constants.MIN_CHUNK_SIZE
+
+        # 64 KiB in a millisecond, smoothed
+        transfer.update(65536)
+        assert transfer.chunk_size > constants.CHUNK_SIZE
+
+    def test_rate_limit(self, github, cache_dir):
+        get_driver = GetGeckoDriver(OsPlatform.linux, rate_limit="1M")
+        get_driver.version_url("0.34.0")
+        size = len(github.assets["geckodriver-v0.34.0-linux64.tar.gz"])
+
+        start = time.perf_counter()
+        get_driver.download_version("0.34.0")
+
+        assert time.perf_counter() - start >= size / 1048576 * 0.9
+
+    def test_rate_limiter_is_shared(self, monkeypatch):
+        monkeypatch.setattr(downloader.time, "monotonic", lambda: 10.0)
+        limiter = downloader.RateLimiter(1000)
+
+        assert limiter.reserve(500) == 0.5
+        assert limiter.reserve(500) == 1.0
+
+    def test_parse_rate(self):
+        assert downloader.parse_rate("500K") == 500 * 1024
+        assert downloader.parse_rate("2M") == 2 * 1048576
+        assert downloader.parse_rate(1000) == 1000
+        with pytest.raises(ValueError):
+            downloader.parse_rate("fast")
+
+
+def tar_gz(entries: list) -> io.BytesIO:
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as tar_gz_ref:
+        for name, content in entries:
+            info = tarfile.TarInfo(name)
+            if content is None:
+                info.type = tarfile.SYMTYPE
+                info.linkname = "/etc/passwd"
+            else:
+                info.size = len(content)
+            tar_gz_ref.addfile(info, io.BytesIO(content or b""))
+    buffer.seek(0)
+    return buffer
+
+
+class TestExtractMember:
+    def test_only_the_member_is_written(self, tmp_path):
+        archive = tar_gz(
+            [("README", b"readme"), ("geckodriver", b"driver"), ("extra", b"x")]
+        )
+        downloader.extract_member(
+            archive, "a.tar.gz", "geckodriver", str(tmp_path / "geckodriver")
+        )
+
+        assert os.listdir(tmp_path) == ["geckodriver"]
+
+    def test_symlink_is_skipped(self, tmp_path):
+        archive = tar_gz([("geckodriver", None), ("bin/geckodriver", b"driver")])
+        downloader.extract_member(
+            archive, "a.tar.gz", "geckodriver", str(tmp_path / "geckodriver")
+        )
+
+        assert (tmp_path / "geckodriver").read_bytes() == b"driver"
+
+    def test_path_traversal_is_rejected(self, tmp_path):
+        for name in ["../geckodriver", "/tmp/geckodriver"]:
+            with pytest.raises(OSError):
+                downloader.extract_member(
+                    tar_gz([(name, b"driver")]),
+                    "a.tar.gz",
+                    "geckodriver",
+                    str(tmp_path / "geckodriver"),
+                )
+
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as zip_ref:
+            zip_ref.writestr("../../geckodriver.exe", b"driver")
+        with pytest.raises(OSError):
+            downloader.extract_member(
+                buffer, "a.zip", "geckodriver.exe", str(tmp_path / "geckodriver.exe")
+            )
+
+        assert not os.listdir(tmp_path)
+
+    @pytest.mark.skipif(os.name != "posix", reason="file modes are posix only")
+    def test_mode_is_set_at_write_time(self, tmp_path):
+        umask = os.umask(0o077)
+        try:
+            downloader.extract_member(
+                tar_gz([("geckodriver", b"driver")]),
+                "a.tar.gz",
+                "geckodriver",
+                str(tmp_path / "geckodriver"),
+            )
+        finally:
+            os.umask(umask)
+
+        assert os.stat(tmp_path / "geckodriver").st_mode & 0o777 == 0o755
+
+    def test_download_version_extracts_only_the_driver(self, github, cache_dir):
+        output_path = GetGeckoDriver(OsPlatform.linux).download_version(
+            "0.34.0", extract=True
+        )
+
+        assert os.listdir(output_path) == ["geckodriver"]
+        if os.name == "posix":
+            assert os.access(os.path.join(output_path, "geckodriver"), os.X_OK)
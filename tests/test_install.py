@@ -0,0 +1,110 @@
+import os
+
+import pytest
+
+from get_gecko_driver import GetGeckoDriver
+from get_gecko_driver import constants
+from get_gecko_driver import store
+from get_gecko_driver.enums import OsPlatform
+from get_gecko_driver.exceptions import ChecksumError
+
+
+class TestInstall:
+    def test_second_install_makes_no_requests(self, github, cache_dir):
+        output_path = GetGeckoDriver(OsPlatform.linux).install()
+        github.reset()
+
+        assert GetGeckoDriver(OsPlatform.linux).install() == output_path
+        assert github.count() == 0
+
+    def test_pinned_version(self, github, cache_dir):
+        get_driver = GetGeckoDriver(OsPlatform.linux, use_cache=False)
+        output_path = get_driver.install(version="0.34.0")
+        github.reset()
+        get_driver.install(version="0.34.0")
+
+        assert output_path.endswith("geckodriver/0.34.0/bin")
+        assert github.count() == 0
+
+    def test_no_check_latest_uses_installed(self, github, cache_dir):
+        get_driver = GetGeckoDriver(OsPlatform.linux, use_cache=False)
+        get_driver.install(version="0.33.0")
+        github.reset()
+        output_path = get_driver.install(check_latest=False)
+
+        assert output_path.endswith("geckodriver/0.33.0/bin")
+        assert github.count() == 0
+
+    def test_custom_path_other_version(self, github, cache_dir):
+        get_driver = GetGeckoDriver(OsPlatform.linux, use_cache=False)
+        get_driver.install("drivers", version="0.33.0")
+        get_driver.install("drivers", version="0.34.0")
+
+        with open(os.path.join("drivers", "geckodriver"), "rb") as file:
+            assert file.read().endswith(b"0.34.0")
+
+    def test_invalid_driver_is_downloaded_again(self, github, cache_dir):
+        get_driver = GetGeckoDriver(OsPlatform.linux)
+        output_path = get_driver.install()
+        open(os.path.join(output_path, "geckodriver"), "w").close()
+        get_driver.install()
+
+        assert os.path.getsize(os.path.join(output_path, "geckodriver")) > 0
+
+    def test_failed_install_keeps_installed_driver(self, github, cache_dir):
+        get_driver = GetGeckoDriver(OsPlatform.linux, use_cache=False)
+        get_driver.install("drivers", version="0.33.0")
+
+        with pytest.raises(ChecksumError):
+            get_driver.install("drivers", version="0.34.0", sha256="0" * 64)
+
+        assert sorted(os.listdir("drivers")) == [
+            constants.DRIVER_RECORD_FILE_NAME,
+            constants.VERSION_FILE_NAME,
+            "geckodriver",
+        ]
+        assert store.read_version("drivers") == "0.33.0"
+        assert store.verify_driver("drivers", "geckodriver")
+
+    def test_leftover_stages_are_removed(self, github, cache_dir):
+        for _ in range(2):
+            stage_path = store.create_stage("drivers")
+            with open(os.path.join(stage_path, "geckodriver"), "wb") as file:
+                file.write(b"partial")
+
+        GetGeckoDriver(OsPlatform.linux).install("drivers", version="0.34.0")
+
+        assert not any(
+            name.startswith(constants.INSTALL_STAGE_PREFIX)
+            for name in os.listdir("drivers")
+        )
+        assert store.read_version("drivers") == "0.34.0"
+
+
+class TestRegisterPath:
+    def test_install_adds_path_once(self, github, cache_dir):
+        get_driver = GetGeckoDriver(OsPlatform.linux)
+        for _ in range(3):
+            output_path = get_driver.install()
+
+        entries = os.environ["PATH"].split(os.pathsep)
+        assert entries.count(os.path.abspath(output_path)) == 1
+        assert entries[-1] == os.path.abspath(output_path)
+
+    def test_prepend(self, cache_dir):
+        os.environ["PATH"] = os.pathsep.join(["/usr/bin", "drivers", "/bin"])
+
+        assert store.register_path("drivers", prepend=True)
+        assert not store.register_path("drivers", prepend=True)
+        assert os.environ["PATH"].split(os.pathsep) == [
+            os.path.abspath("drivers"),
+            "/usr/bin",
+            "/bin",
+        ]
+
+    def test_append_keeps_position_and_removes_duplicates(self, cache_dir):
+        path = os.path.abspath("drivers")
+        os.environ["PATH"] = os.pathsep.join(["/usr/bin", path, "/bin", path + "/"])
+
+        store.register_path("drivers")
+        assert os.environ["PATH"].split(os.pathsep) == ["/usr/bin", path, "/bin"]
@@ -0,0 +1,86 @@
+import os
+import socket
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from get_gecko_driver import GetGeckoDriver
+from get_gecko_driver import constants
+from get_gecko_driver.enums import OsPlatform
+from get_gecko_driver.exceptions import LockTimeoutError
+from get_gecko_driver.lock import FileLock
+
+
+class TestFileLock:
+    def test_timeout(self, tmp_path):
+        path = str(tmp_path / "lock")
+        with FileLock(path):
+            with pytest.raises(LockTimeoutError):
+                FileLock(path, timeout=0.2).acquire()
+
+        assert not os.path.exists(path)
+
+    def test_non_blocking(self, tmp_path):
+        path = str(tmp_path / "lock")
+        with FileLock(path):
+            lock = FileLock(path)
+            assert not lock.acquire(blocking=False)
+            assert lock.waited
+
+    def test_stale_dead_process(self, tmp_path):
+        path = str(tmp_path / "lock")
+        process = subprocess.Popen([sys.executable, "-c", "pass"])
+        process.wait()
+        with open(path, "w") as file:
+            file.write(f"{socket.gethostname()} {process.pid} token")
+
+        with FileLock(path, timeout=1):
+            assert os.path.exists(path)
+
+    def test_stale_untouched(self, tmp_path):
+        path = str(tmp_path / "lock")
+        with open(path, "w") as file:
+            file.write(f"other-host {os.getpid()} token")
+        os.utime(path, (time.time() - 120, time.time() - 120))
+
+        with FileLock(path, timeout=1, stale_after=60):
+            pass
+
+    def test_heartbeat_keeps_lock_fresh(self, tmp_path):
+        path = str(tmp_path / "lock")
+        with FileLock(path, stale_after=0.3):
+            time.sleep(0.6)
+            with pytest.raises(LockTimeoutError):
+                FileLock(path, timeout=0.2, stale_after=0.3).acquire()
+
+
+class TestSingleFlight:
+    def test_concurrent_installs_download_once(self, github, cache_dir):
+        output_path = GetGeckoDriver(OsPlatform.linux)._output_path("0.34.0")
+        lock_path = os.path.join(output_path, constants.LOCK_FILE_NAME)
+
+        def install(_):
+            get_driver = GetGeckoDriver(OsPlatform.linux, use_cache=False)
+            return get_driver.install(version="0.34.0")
+
+        # Hold the lock until all installers wait for it
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            with FileLock(lock_path):
+                futures = [executor.submit(install, i) for i in range(4)]
+                time.sleep(0.5)
+            results = [future.result() for future in futures]
+
+        assert len(set(results)) == 1
+        assert github.count("/assets/", "GET") == 1
+        assert not os.path.exists(lock_path)
+        assert os.access(os.path.join(output_path, "geckodriver"), os.X_OK)
+
+    def test_download_version_downloads_again(self, github, cache_dir):
+        get_driver = GetGeckoDriver(OsPlatform.linux, use_cache=False)
+        get_driver.download_version("0.34.0", extract=True)
+        get_driver.download_version("0.34.0", extract=True)
+
+        assert github.count("/assets/", "GET") == 2
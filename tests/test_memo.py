@@ -0,0 +1,108 @@
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from get_gecko_driver import GetGeckoDriver
+from get_gecko_driver.enums import OsPlatform
+from get_gecko_driver.memo import Memo
+
+WORKERS = 8
+
+
+class TestMemo:
+    def test_ttl(self):
+        memo = Memo()
+        memo.set("key", "value", ttl=0.05)
+
+        assert memo.get("key") == "value"
+        time.sleep(0.1)
+        assert memo.get("key") is None
+
+    def test_least_recently_used_is_evicted(self):
+        memo = Memo(max_size=2)
+        memo.set("a", 1, ttl=60)
+        memo.set("b", 2, ttl=60)
+        memo.get("a")
+        memo.set("c", 3, ttl=60)
+
+        assert len(memo) == 2
+        assert memo.get("b") is None
+        assert memo.get("a") == 1
+
+    def test_concurrent_calls_are_coalesced(self):
+        memo = Memo()
+        calls = []
+        barrier = threading.Barrier(WORKERS)
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.2)
+            return "value"
+
+        def call():
+            barrier.wait()
+            return memo.call("key", compute, ttl=60)
+
+        with ThreadPoolExecutor(WORKERS) as executor:
+            results = list(executor.map(lambda _: call(), range(WORKERS)))
+
+        assert results == ["value"] * WORKERS
+        assert len(calls) == 1
+        assert memo.call("key", compute, ttl=60) == "value"
+        assert len(calls) == 1
+
+    def test_error_is_shared_and_not_memoized(self):
+        memo = Memo()
+        started = threading.Event()
+
+        def fail():
+            started.set()
+            time.sleep(0.2)
+            raise ValueError("failed")
+
+        with ThreadPoolExecutor(2) as executor:
+            first = executor.submit(memo.call, "key", fail, 60)
+            started.wait()
+            second = executor.submit(memo.call, "key", lambda: "value", 60)
+            for future in (first, second):
+                with pytest.raises(ValueError):
+                    future.result()
+
+        assert memo.call("key", lambda: "value", ttl=60) == "value"
+
+
+class TestProcessWideMemo:
+    def test_instances_share_lookups(self, github, cache_dir):
+        GetGeckoDriver(OsPlatform.linux).version_url("0.35.0")
+        # The memo answers without the metadata cache files
+        shutil.rmtree(cache_dir)
+        github.reset()
+
+        get_driver = GetGeckoDriver(OsPlatform.linux)
+        assert get_driver.version_url("0.35.0").endswith("linux64.tar.gz")
+        assert github.count() == 0
+
+    def test_concurrent_instances_send_one_request(self, github, cache_dir):
+        github.delay = 0.2
+        barrier = threading.Barrier(WORKERS)
+
+        def latest_version():
+            get_driver = GetGeckoDriver(OsPlatform.linux, use_cache=False)
+            barrier.wait()
+            return get_driver.latest_version()
+
+        with ThreadPoolExecutor(WORKERS) as executor:
+            versions = list(executor.map(lambda _: latest_version(), range(WORKERS)))
+
+        assert versions == ["0.36.0"] * WORKERS
+        assert github.count("/releases/latest") == 1
+
+    def test_cache_ttl_is_respected(self, github, cache_dir):
+        GetGeckoDriver(OsPlatform.linux).latest_version()
+        github.reset()
+
+        GetGeckoDriver(OsPlatform.linux, cache_ttl=0).latest_version()
+        assert github.count("/releases/latest") == 1
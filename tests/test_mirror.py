@@ -0,0 +1,38 @@
+import hashlib
+import os
+
+from get_gecko_driver.enums import Platform
+from get_gecko_driver.mirror import mirror
+from get_gecko_driver.mirror import read_manifest
+
+
+class TestMirror:
+    def test_mirror(self, github, cache_dir):
+        result = mirror(
+            ["0.35.0", "0.36.0"], [Platform.linux32, Platform.win64], "mirror"
+        )
+        manifest = read_manifest("mirror")
+
+        assert sorted(result["downloaded"]) == [
+            "0.35.0/linux32",
+            "0.35.0/win64",
+            "0.36.0/win64",
+        ]
+        assert list(result["errors"]) == ["0.36.0/linux32"]
+
+        entry = manifest["assets"]["0.35.0/win64"]
+        with open(os.path.join("mirror", entry["path"]), "rb") as file:
+            content = file.read()
+        assert entry["path"] == "v0.35.0/geckodriver-v0.35.0-win64.zip"
+        assert entry["size"] == len(content)
+        assert entry["sha256"] == hashlib.sha256(content).hexdigest()
+        assert entry["url"].endswith(entry["path"])
+
+    def test_skip_mirrored(self, github, cache_dir):
+        mirror(["0.35.0"], [Platform.linux64], "mirror")
+        github.reset()
+        result = mirror(["0.35.0"], [Platform.linux64, Platform.macos], "mirror")
+
+        assert result["skipped"] == ["0.35.0/linux64"]
+        assert result["downloaded"] == ["0.35.0/macos"]
+        assert github.count("linux64") == 0
@@ -0,0 +1,103 @@
+import json
+
+from get_gecko_driver import GetGeckoDriver
+from get_gecko_driver import constants
+from get_gecko_driver import observer
+from get_gecko_driver.enums import OsPlatform
+from get_gecko_driver.observer import JsonLinesExporter
+from get_gecko_driver.observer import Observer
+from get_gecko_driver.observer import PrometheusExporter
+
+
+class RecordingObserver(Observer):
+    def __init__(self):
+        self.events = []
+
+    def on_event(self, event: dict):
+        self.events.append(event)
+
+    def names(self) -> list:
+        return [event["event"] for event in self.events]
+
+
+class TestEvents:
+    def test_install(self, github, cache_dir):
+        recorder = RecordingObserver()
+        GetGeckoDriver(OsPlatform.linux, observer=recorder).install()
+        names = recorder.names()
+
+        assert names.count("request_start") == names.count("request_end")
+        assert {"cache", "download", "extract"} <= set(names)
+        download = [e for e in recorder.events if e["event"] == "download"][0]
+        assert download["bytes"] == len(github.assets[download["url"].split("/")[-1]])
+        assert download["bytes_per_second"] > 0
+        head = [e for e in recorder.events if e["event"] == "request_end"][0]
+        assert head["status"] == 302 and head["seconds"] >= 0
+
+    def test_cache_hits(self, github, cache_dir):
+        GetGeckoDriver(OsPlatform.linux).latest_version()
+        recorder = RecordingObserver()
+        GetGeckoDriver(OsPlatform.linux, observer=recorder).latest_version()
+
+        assert recorder.events[0]["event"] == "cache"
+        assert recorder.events[0]["hit"]
+        assert "request_start" not in recorder.names()
+
+    def test_status_retry(self, github, cache_dir):
+        recorder = RecordingObserver()
+        github.fail_next = 1
+        get_driver = GetGeckoDriver(OsPlatform.linux, observer=recorder)
+
+        assert get_driver.latest_version() == "0.36.0"
+        retry = [e for e in recorder.events if e["event"] == "retry"][0]
+        assert retry["status"] == 503
+        assert retry["attempt"] == 1
+
+    def test_resume_retry(self, github, cache_dir):
+        recorder = RecordingObserver()
+        github.drop_after = 1000
+        get_driver = GetGeckoDriver(OsPlatform.linux, observer=recorder)
+        get_driver.download_version("0.34.0")
+
+        assert "retry" in recorder.names()
+
+    def test_extract(self, github, cache_dir):
+        recorder = RecordingObserver()
+        get_driver = GetGeckoDriver(OsPlatform.win, observer=recorder)
+        get_driver.download_version("0.34.0", extract=True)
+
+        extract = [e for e in recorder.events if e["event"] == "extract"][0]
+        assert extract["member"] == "geckodriver.exe"
+        assert extract["seconds"] >= 0
+
+
+class TestExporters:
+    def test_json_lines(self, github, cache_dir):
+        exporter = JsonLinesExporter("events.jsonl")
+        GetGeckoDriver(OsPlatform.linux, observer=exporter).latest_version()
+
+        with open("events.jsonl") as file:
+            events = [json.loads(line) for line in file]
+        assert [e["event"] for e in events][:2] == ["cache", "request_start"]
+
+    def test_prometheus(self, github, cache_dir):
+        exporter = PrometheusExporter("metrics.prom")
+        GetGeckoDriver(OsPlatform.linux, observer=exporter).install()
+
+        with open("metrics.prom") as file:
+            text = file.read()
+        assert text == exporter.render()
+        assert "# TYPE get_gecko_driver_download_seconds summary" in text
+        assert "get_gecko_driver_download_seconds_count 1" in text
+        assert 'get_gecko_driver_cache_lookups_total{result="miss"}' in text
+        assert 'get_gecko_driver_request_seconds_count{method="HEAD",status="302"}' in (
+            text
+        )
+
+    def test_from_env(self, monkeypatch):
+        monkeypatch.setenv(constants.METRICS_ENV, "metrics.prom")
+        assert isinstance(observer.from_env(), PrometheusExporter)
+        monkeypatch.setenv(constants.METRICS_ENV, "events.jsonl")
+        assert isinstance(observer.from_env(), JsonLinesExporter)
+        monkeypatch.delenv(constants.METRICS_ENV)
+        assert observer.from_env() is None
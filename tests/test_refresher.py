@@ -0,0 +1,94 @@
+import os
+import time
+
+from typer.testing import CliRunner
+
+from get_gecko_driver import GetGeckoDriver
+from get_gecko_driver.observer import Observer
+from get_gecko_driver.app import app
+from get_gecko_driver.app import get_driver
+from get_gecko_driver.enums import OsPlatform
+from get_gecko_driver.refresher import Refresher
+from tests.server import asset_name
+from tests.server import build_asset
+
+runner = CliRunner()
+
+
+class Recorder(Observer):
+    def __init__(self):
+        self.events = []
+
+    def on_event(self, event: dict):
+        if event["event"] == "refresh":
+            self.events.append(event)
+
+
+class TestRefresher:
+    def test_refresh(self, github, cache_dir):
+        refresher = Refresher(GetGeckoDriver(OsPlatform.linux))
+
+        assert refresher.refresh() == "0.36.0"
+        assert os.path.isfile("geckodriver/0.36.0/bin/geckodriver")
+        assert refresher.refresh() is None
+        assert github.count("/download/.*" + asset_name("0.36.0", "linux64")) == 1
+
+    def test_new_release(self, github, cache_dir):
+        refresher = Refresher(GetGeckoDriver(OsPlatform.linux))
+        refresher.refresh()
+
+        github.versions.insert(0, "0.37.0")
+        github.assets[asset_name("0.37.0", "linux64")] = build_asset(
+            "0.37.0", "linux64"
+        )
+
+        assert refresher.refresh() == "0.37.0"
+        assert os.path.isfile("geckodriver/0.37.0/bin/geckodriver")
+
+    def test_prefetch_does_not_change_path(self, github, cache_dir):
+        path = os.environ["PATH"]
+
+        assert GetGeckoDriver(OsPlatform.linux).prefetch("0.35.0")
+        assert os.environ["PATH"] == path
+        github.reset()
+        output_path = GetGeckoDriver(OsPlatform.linux).install(version="0.35.0")
+
+        assert output_path == os.path.abspath("geckodriver/0.35.0/bin")
+        assert github.count("/download/") == 0
+
+    def test_thread(self, github, cache_dir):
+        observer = Recorder()
+        refresher = Refresher(
+            GetGeckoDriver(OsPlatform.linux), interval=0.01, observer=observer
+        )
+
+        with refresher:
+            deadline = time.monotonic() + 10
+            while len(observer.events) < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+        assert observer.events[0]["downloaded"]
+        assert not observer.events[1]["downloaded"]
+
+    def test_failed_refresh(self, github, cache_dir):
+        github.stop()
+        observer = Recorder()
+        errors = []
+        Refresher(GetGeckoDriver(OsPlatform.linux), observer=observer).run(
+            once=True, on_error=errors.append
+        )
+
+        assert len(errors) == 1
+        assert observer.events[0]["error"]
+
+    def test_jitter(self):
+        refresher = Refresher(GetGeckoDriver(OsPlatform.linux), interval=100)
+
+        for _ in range(100):
+            assert 90 <= refresher.next_delay() <= 110
+
+    def test_watch_once(self, github, cache_dir):
+        get_driver.cache_clear()
+        result = runner.invoke(app, ["watch", "--once"])
+
+        assert result.stdout.strip() == "Prefetched 0.36.0"
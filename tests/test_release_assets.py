@@ -0,0 +1,88 @@
+import asyncio
+import struct
+
+import pytest
+
+from get_gecko_driver import AsyncGetGeckoDriver
+from get_gecko_driver import GetGeckoDriver
+from get_gecko_driver.enums import OsPlatform
+from get_gecko_driver.exceptions import VersionUrlError
+from tests.server import asset_name
+
+
+class TestReleaseAssets:
+    def test_version_url_makes_no_head_requests(self, github, cache_dir):
+        url = GetGeckoDriver(OsPlatform.linux).version_url("0.36.0")
+
+        assert url.endswith("/v0.36.0/" + asset_name("0.36.0", "linux64"))
+        assert github.count(method="HEAD") == 0
+        assert github.count("/expanded_assets/v0.36.0") == 1
+
+    def test_one_request_per_release(self, github, cache_dir):
+        for os_platform in (OsPlatform.linux, OsPlatform.win, OsPlatform.mac):
+            GetGeckoDriver(os_platform).version_url("0.35.0")
+
+        # The table is shared through the metadata cache of the working directory
+        assert github.count() == 1
+
+    def test_release_assets(self, github, cache_dir):
+        assets = GetGeckoDriver(OsPlatform.linux).release_assets("0.36.0")
+
+        assert asset_name("0.36.0", "win64") in assets
+        assert asset_name("0.36.0", "win32") not in assets
+        assert not any(name.startswith("v0.36.0") for name in assets)
+
+    def test_missing_platform_is_cached(self, github, cache_dir, monkeypatch):
+        monkeypatch.setattr(struct, "calcsize", lambda fmt: 4)
+        get_driver = GetGeckoDriver(OsPlatform.win)
+        monkeypatch.undo()
+
+        for _ in range(2):
+            with pytest.raises(VersionUrlError):
+                get_driver.version_url("0.36.0")
+
+        assert github.count() == 1
+        assert get_driver.version_url("0.35.0").endswith(asset_name("0.35.0", "win32"))
+
+    def test_unknown_release(self, github, cache_dir):
+        get_driver = GetGeckoDriver(OsPlatform.linux)
+
+        assert get_driver.release_assets("0.1.0") is None
+        with pytest.raises(VersionUrlError):
+            get_driver.version_url("0.1.0")
+
+    def test_falls_back_to_head(self, github, cache_dir):
+        github.expanded_assets = False
+        get_driver = GetGeckoDriver(OsPlatform.win)
+
+        assert get_driver.release_assets("0.36.0") is None
+        assert get_driver.version_url("0.36.0").endswith(asset_name("0.36.0", "win64"))
+        assert github.count(method="HEAD") == 1
+
+    def test_empty_assets_page_falls_back_to_head(self, github, cache_dir, monkeypatch):
+        monkeypatch.setattr(github, "assets_html", lambda version: b"<div>markup</div>")
+        get_driver = GetGeckoDriver(OsPlatform.linux)
+
+        assert get_driver.release_assets("0.36.0") is None
+        assert get_driver.version_url("0.36.0").endswith(
+            asset_name("0.36.0", "linux64")
+        )
+        assert github.count(method="HEAD") == 1
+        # Nothing was cached, the page is fetched again
+        assert github.count("/expanded_assets/v0.36.0") == 2
+
+        async def run():
+            async with AsyncGetGeckoDriver(OsPlatform.win) as async_get_driver:
+                return await async_get_driver.version_url("0.35.0")
+
+        assert asyncio.run(run()).endswith(asset_name("0.35.0", "win64"))
+
+    def test_async_version_url(self, github, cache_dir):
+        async def run():
+            async with AsyncGetGeckoDriver(OsPlatform.win) as get_driver:
+                return await get_driver.version_url("0.36.0")
+
+        url = asyncio.run(run())
+
+        assert url.endswith(asset_name("0.36.0", "win64"))
+        assert github.count(method="HEAD") == 0
@@ -0,0 +1,66 @@
+from typer.testing import CliRunner
+
+from get_gecko_driver import GetGeckoDriver
+from get_gecko_driver.app import app
+from get_gecko_driver.app import get_driver
+from get_gecko_driver.enums import OsPlatform
+from get_gecko_driver.enums import Platform
+from tests.server import asset_name
+
+runner = CliRunner()
+
+PLATFORMS = [Platform.linux64, Platform.linux32, Platform.win64]
+
+
+class TestResolveMany:
+    def test_one_request_per_release(self, github, cache_dir):
+        result = GetGeckoDriver(OsPlatform.linux).resolve_many(
+            ["0.36.0", "0.35.0", "0.36.0"], PLATFORMS + [Platform.win64]
+        )
+
+        assert len(result["urls"]) == 5
+        assert result["urls"]["0.35.0/win64"].endswith(asset_name("0.35.0", "win64"))
+        assert github.count("/expanded_assets/") == 2
+        assert github.count(method="HEAD") == 0
+
+    def test_errors_per_item(self, github, cache_dir):
+        result = GetGeckoDriver(OsPlatform.linux).resolve_many(
+            ["0.36.0", "0.1.0"], PLATFORMS, workers=2
+        )
+
+        assert set(result["urls"]) == {"0.36.0/linux64", "0.36.0/win64"}
+        assert set(result["errors"]) == {
+            "0.36.0/linux32",
+            "0.1.0/linux64",
+            "0.1.0/linux32",
+            "0.1.0/win64",
+        }
+
+    def test_specifiers(self, github, cache_dir):
+        result = GetGeckoDriver(OsPlatform.linux).resolve_many(
+            ["~=0.34.0", "0.34.0", ">=1.0"], [Platform.linux64]
+        )
+
+        assert result["versions"] == {"~=0.34.0": "0.34.0", "0.34.0": "0.34.0"}
+        assert result["urls"]["~=0.34.0/linux64"] == result["urls"]["0.34.0/linux64"]
+        assert ">=1.0/linux64" in result["errors"]
+        assert github.count("/expanded_assets/") == 1
+
+    def test_falls_back_to_head(self, github, cache_dir):
+        github.expanded_assets = False
+        result = GetGeckoDriver(OsPlatform.linux).resolve_many(["0.36.0"], PLATFORMS)
+
+        assert set(result["urls"]) == {"0.36.0/linux64", "0.36.0/win64"}
+        assert "0.36.0/linux32" in result["errors"]
+        assert github.count(method="HEAD") == 3
+
+    def test_cli(self, github, cache_dir):
+        get_driver.cache_clear()
+        result = runner.invoke(
+            app, ["urls", "--versions", "0.35.0", "--platforms", "linux64,win64"]
+        )
+        lines = result.stdout.splitlines()
+
+        assert result.exit_code == 0
+        assert lines[0].startswith("0.35.0/linux64 ")
+        assert lines[1].endswith(asset_name("0.35.0", "win64"))
@@ -0,0 +1,36 @@
+import pytest
+
+from get_gecko_driver import GetGeckoDriver
+from get_gecko_driver import downloader
+from get_gecko_driver.enums import OsPlatform
+from get_gecko_driver.exceptions import GetGeckoDriverError
+from get_gecko_driver.exceptions import VersionUrlError
+
+
+class TestSession:
+    def test_install_reuses_one_connection(self, github, cache_dir):
+        with GetGeckoDriver(OsPlatform.linux, use_cache=False) as get_driver:
+            get_driver.install()
+
+        assert github.count() >= 3
+        assert github.connections == 1
+
+    def test_injected_session_is_not_closed(self, github, cache_dir):
+        session = downloader.create_session(pool_size=2)
+        with GetGeckoDriver(OsPlatform.linux, session=session) as get_driver:
+            assert get_driver.session is session
+            get_driver.latest_version()
+        GetGeckoDriver(OsPlatform.win, session=session).latest_version_url()
+
+        assert github.connections == 1
+        session.close()
+
+    def test_exhausted_retries_raise_library_errors(self, github, cache_dir):
+        github.fail_next = 100
+        get_driver = GetGeckoDriver(OsPlatform.linux, use_cache=False)
+
+        with pytest.raises(GetGeckoDriverError):
+            get_driver.latest_version()
+        with pytest.raises(VersionUrlError):
+            get_driver.version_url("0.36.0")
+        assert github.count(method="HEAD") >= 4
@@ -0,0 +1,98 @@
+import pytest
+
+from get_gecko_driver import GetGeckoDriver
+from get_gecko_driver import store
+from get_gecko_driver.enums import OsPlatform
+from get_gecko_driver.exceptions import InvalidSpecifierError
+from get_gecko_driver.exceptions import UnknownVersionError
+from get_gecko_driver.specifier import VersionIndex
+from get_gecko_driver.specifier import VersionSpecifier
+from get_gecko_driver.specifier import version_key
+from tests.server import VERSIONS
+
+
+class TestVersionSpecifier:
+    @pytest.mark.parametrize(
+        "spec, expected",
+        [
+            (">=0.33,<0.35", "0.34.0"),
+            ("~=0.32.0", "0.32.2"),
+            ("~=0.34", "0.36.0"),
+            ("==0.32.*", "0.32.2"),
+            ("==0.32.*,!=0.32.2", "0.32.1"),
+            ("0.33", "0.33.0"),
+            ("<=0.32.1", "0.32.1"),
+            (">0.35.0", "0.36.0"),
+            ("latest-patch-of 0.32", "0.32.2"),
+            ("latest-patch-of 0.32.1", "0.32.2"),
+            ("*", "0.36.0"),
+            (">=0.37", None),
+        ],
+    )
+    def test_select(self, spec, expected):
+        specifier = VersionSpecifier(spec)
+
+        assert VersionIndex(VERSIONS).select(specifier) == expected
+        assert [v for v in VERSIONS if specifier.contains(v)][:1] == (
+            [expected] if expected else []
+        )
+
+    @pytest.mark.parametrize("spec", ["", "0.x", ">=0.3*", "~=1", "latest-patch-of"])
+    def test_invalid(self, spec):
+        with pytest.raises(InvalidSpecifierError):
+            VersionSpecifier(spec)
+
+
+class TestResolve:
+    def test_version_key(self):
+        assert version_key("0.34") == version_key("0.34.0")
+        assert store.version_key is version_key
+        assert sorted(["0.34.1", "0.34", "0.4.0"], key=version_key) == [
+            "0.4.0",
+            "0.34",
+            "0.34.1",
+        ]
+
+    def test_warm_index_makes_no_requests(self, github, cache_dir):
+        get_driver = GetGeckoDriver(OsPlatform.linux)
+        assert get_driver.resolve("~=0.34.0") == "0.34.0"
+        github.reset()
+
+        assert get_driver.resolve(">=0.32,<0.33") == "0.32.2"
+        assert github.count() == 0
+
+    def test_no_match_refreshes_once(self, github, cache_dir):
+        get_driver = GetGeckoDriver(OsPlatform.linux)
+        get_driver.versions()
+        github.versions.insert(0, "0.37.0")
+        github.reset()
+
+        assert get_driver.resolve(">=0.37") == "0.37.0"
+        with pytest.raises(UnknownVersionError):
+            get_driver.resolve(">=0.38")
+
+    def test_latest(self, github, cache_dir):
+        assert GetGeckoDriver(OsPlatform.linux).resolve("latest") == "0.36.0"
+        assert github.count("/tags") == 0
+
+    def test_install_specifier(self, github, cache_dir):
+        get_driver = GetGeckoDriver(OsPlatform.linux)
+        output_path = get_driver.install(version="latest-patch-of 0.32")
+
+        assert output_path.endswith("geckodriver/0.32.2/bin")
+
+    def test_install_specifier_uses_installed(self, github, cache_dir):
+        get_driver = GetGeckoDriver(OsPlatform.linux)
+        get_driver.install(version="0.33.0")
+        github.reset()
+        output_path = get_driver.install(version=">=0.33,<0.35", check_latest=False)
+
+        assert output_path.endswith("geckodriver/0.33.0/bin")
+        assert github.count() == 0
+
+    def test_download_version_specifier(self, github, cache_dir):
+        output_path = GetGeckoDriver(OsPlatform.linux).download_version(
+            "==0.35.*", extract=True
+        )
+
+        assert output_path == "geckodriver/0.35.0/bin"
@@ -0,0 +1,49 @@
+import subprocess
+import sys
+
+# Modules that are only needed once a network command runs
+HEAVY_MODULES = ["requests", "urllib3", "bs4", "aiohttp"]
+# Cumulative import time budget of the package itself, in microseconds
+PACKAGE_IMPORT_BUDGET = 50_000
+
+
+def import_times(code: str) -> dict:
+    """
+    Run code with python -X importtime and return the cumulative import time per module.
+    """
+
+    out = subprocess.run(
+        args=[sys.executable, "-X", "importtime", "-c", code],
+        universal_newlines=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    times = {}
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line[len("import time:") :].split("|")
+        times[module.strip()] = int(cumulative)
+    return times
+
+
+class TestStartup:
+    def test_package_import(self):
+        times = import_times("import get_gecko_driver")
+
+        assert not [module for module in HEAVY_MODULES if module in times]
+        assert times["get_gecko_driver"] < PACKAGE_IMPORT_BUDGET
+
+    def test_cli_version(self):
+        times = import_times("from get_gecko_driver.app import app; app(['--version'])")
+
+        assert "get_gecko_driver.app" in times
+        assert not [module for module in HEAVY_MODULES if module in times]
+
+    def test_cli_driver_filename(self):
+        times = import_times(
+            "from get_gecko_driver.app import app; app(['--driver-filename'])"
+        )
+
+        assert "get_gecko_driver.get_driver" in times
+        assert not [module for module in HEAVY_MODULES if module in times]
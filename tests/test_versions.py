@@ -0,0 +1,49 @@
+from get_gecko_driver import GetGeckoDriver
+from get_gecko_driver.enums import OsPlatform
+from tests.server import VERSIONS
+
+
+class TestVersions:
+    def test_all_versions(self, github, cache_dir):
+        versions = GetGeckoDriver(OsPlatform.linux).versions()
+
+        assert versions == VERSIONS
+        # 7 tags on pages of 3, and an empty last page
+        assert github.count("/tags") == 4
+
+    def test_mirror_that_ignores_after(self, github, cache_dir, monkeypatch):
+        tags_html = github.tags_html
+        monkeypatch.setattr(github, "tags_html", lambda after=None: tags_html())
+
+        assert GetGeckoDriver(OsPlatform.linux).versions() == VERSIONS[:3]
+        assert github.count("/tags") == 2
+
+    def test_warm_index_makes_no_requests(self, github, cache_dir):
+        GetGeckoDriver(OsPlatform.linux).versions()
+        github.reset()
+
+        assert GetGeckoDriver(OsPlatform.linux).versions() == VERSIONS
+        assert github.count() == 0
+
+    def test_refresh_fetches_new_tags_only(self, github, cache_dir):
+        get_driver = GetGeckoDriver(OsPlatform.linux)
+        get_driver.versions()
+        github.versions.insert(0, "0.37.0")
+        github.reset()
+
+        assert get_driver.versions(refresh=True) == ["0.37.0"] + VERSIONS
+        assert github.count("/tags") == 1
+
+    def test_stale_index_is_extended(self, github, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        cache_dir = str(tmp_path / "cache")
+        GetGeckoDriver(OsPlatform.linux, cache_dir=cache_dir).versions()
+        github.versions[:0] = ["0.39.0", "0.38.0", "0.37.0", "0.36.1"]
+        github.reset()
+
+        get_driver = GetGeckoDriver(OsPlatform.linux, cache_dir=cache_dir, cache_ttl=0)
+        versions = get_driver.versions()
+
+        assert versions[:5] == ["0.39.0", "0.38.0", "0.37.0", "0.36.1", "0.36.0"]
+        assert len(versions) == len(VERSIONS) + 4
+        assert github.count("/tags") == 2